@@ -23,16 +23,301 @@
      "casks": ["visual-studio-code", "chrome"]
    }
 
-🚀 Usage: ./brew_manager.py
+🚀 Usage: ./brew.py [install | upgrade | reconcile | prefetch] [--jobs N] [--bulk]
+                   [--keep-extras] [--cache-dir DIR] [--mirror URL]
+                   [--update-ttl MINUTES] [--quiet | --json]
+                   [--report FILE] [--slowest N]
+   --jobs N downloads bottles and casks with N parallel workers before the
+   (serial) installation phase - a huge time saver on a fresh machine!
+   --bulk installs all missing formulae (and casks) with ONE brew call each,
+   retrying only the packages that failed one by one.
+   --quiet only reports problems; --json streams one JSON event per package
+   (with timings) for tooling that aggregates many machines.
+   --report FILE saves per-phase, per-package and per-command timings, exit
+   codes and output sizes as JSON (or CSV for a .csv FILE); every run ends
+   with the phase timings and the --slowest N (default 5) packages.
+   --update-ttl MINUTES skips 'brew update' when it ran less than MINUTES
+   (default 60) ago and no tap changed since - see .brew-state.json.
+
+⬆️  ./brew.py upgrade asks brew once for outdated packages and upgrades only
+   the ones listed in brew.json (one brew call per type, old → new versions
+   reported). --jobs N downloads the new versions in parallel first.
+
+🔁 ./brew.py reconcile makes the Mac match brew.json in one pass: one
+   snapshot, then a plan of missing, outdated and extra packages (installed
+   on request but no longer listed) that runs with one bulk brew call per
+   step once confirmed. --keep-extras never removes anything.
+
+💾 Provisioning many machines? Download everything once and share it:
+   ./brew.py prefetch --jobs 8 --cache-dir /Volumes/nas/brew-cache
+   ./brew.py --cache-dir /Volumes/nas/brew-cache      (on every other Mac)
+   --cache-dir sets HOMEBREW_CACHE, so packages found there are never
+   downloaded again (hits and misses are counted). --mirror URL sets
+   HOMEBREW_ARTIFACT_DOMAIN to a local HTTP mirror of the upstream
+   download URLs; brew falls back to upstream for anything it lacks.
 """
 
+import argparse
+import contextlib
+import csv
 import json
 import os
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+# 🚨 Output lines that are problems (kept by --quiet, "message" events with --json)
+PROBLEM_MARKERS = ("❌", "💥", "⚠️")
+
+
+class Reporter:
+    """
+    📣 Output Switchboard - Pretty, Quiet or Machine-Readable!
+
+    🎯 Every line the script prints goes through line(), every package
+       outcome through event(), and the mode decides where they end up:
+       • pretty - the usual emoji-rich output
+       • quiet  - only errors and warnings, on stderr
+       • json   - one JSON object per event (NDJSON) on stdout, with timings;
+                  errors and warnings become "message" events
+
+    💡 Brew's own output is only streamed in pretty mode
+    """
+
+    def __init__(self, mode: str = "pretty") -> None:
+        self.mode = mode
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def configure(self, mode: str) -> None:
+        """🔧 Switch output mode and restart the clock"""
+        self.mode = mode
+        self.started = time.perf_counter()
+
+    def line(self, text: str = "", flush: bool = False) -> None:
+        """🖨️  A line of human readable output"""
+        if self.mode == "pretty":
+            print(text, flush=flush)
+        elif text.lstrip().startswith(PROBLEM_MARKERS):
+            if self.mode == "quiet":
+                print(text.strip(), file=sys.stderr)
+            else:
+                level = "warning" if text.lstrip().startswith("⚠️") else "error"
+                self.event("message", level=level, text=text.strip())
+
+    def event(self, event_type: str, **fields: Any) -> None:
+        """📊 A structured event (NDJSON in json mode, silent otherwise)"""
+        if self.mode != "json":
+            return
+        record = {
+            "event": event_type,
+            "elapsed": round(time.perf_counter() - self.started, 6),
+            **fields,
+        }
+        with self.lock:
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+
+    def ask(self, prompt: str) -> str:
+        """🤔 Ask a question - the prompt goes to stderr outside pretty mode"""
+        if self.mode == "pretty":
+            return input(prompt)
+        print(prompt, end="", file=sys.stderr, flush=True)
+        return input()
+
+
+# 📣 The reporter everything prints through (configured by main)
+REPORTER = Reporter()
+
+# 🕰️ Freshness cache for 'brew update', kept next to brew.json
+BREW_STATE_FILE = ".brew-state.json"
+BREW_STATE_VERSION = 1
+
+
+# 📊 Columns of the CSV run report (one row per phase, package step or command)
+REPORT_CSV_FIELDS = [
+    "record",
+    "name",
+    "kind",
+    "action",
+    "status",
+    "seconds",
+    "exit_code",
+    "output_bytes",
+]
+
+
+class RunReport:
+    """
+    ⏱️  Flight Recorder - Where Did The Time Go?
+
+    🎯 Records everything a run does, with wall times:
+       • phases  - update, snapshot, installs, upgrade, cleanup, ...
+       • commands - every brew call with its exit code and output size
+       • packages - every fetch/install step per package
+
+    📄 write() saves it all as JSON (or CSV for spreadsheets) and
+       print_slowest() shows which packages are worth parallelizing or
+       pre-caching. Safe to use from the parallel fetch workers.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.clock = time.perf_counter()
+        self.lock = threading.Lock()
+        self.phases: List[Dict[str, Any]] = []
+        self.commands: List[Dict[str, Any]] = []
+        self.packages: List[Dict[str, Any]] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """🏁 Time a phase of the run (also a "phase" event with --json)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = round(time.perf_counter() - started, 6)
+            with self.lock:
+                self.phases.append({"name": name, "seconds": seconds})
+            REPORTER.event("phase", name=name, seconds=seconds)
+
+    def command(
+        self,
+        cmd: Union[str, List[str]],
+        seconds: float,
+        exit_code: Optional[int],
+        output_bytes: Optional[int],
+    ) -> None:
+        """💻 Record one external command (output_bytes is None if not captured)"""
+        with self.lock:
+            self.commands.append(
+                {
+                    "command": cmd if isinstance(cmd, str) else " ".join(cmd),
+                    "seconds": round(seconds, 6),
+                    "exit_code": exit_code,
+                    "output_bytes": output_bytes,
+                }
+            )
+
+    def package(
+        self,
+        kind: str,
+        name: str,
+        status: str,
+        seconds: float,
+        action: str = "install",
+        result: Optional[subprocess.CompletedProcess] = None,
+        **fields: Any,
+    ) -> None:
+        """📦 Record one package step (installs and upgrades become "package" events)"""
+        record: Dict[str, Any] = {
+            "kind": kind,
+            "name": name,
+            "action": action,
+            "status": status,
+            "seconds": round(seconds, 6),
+            "exit_code": result.returncode if result else None,
+            "output_bytes": get_output_bytes(result),
+            **fields,
+        }
+        with self.lock:
+            self.packages.append(record)
+        if action != "fetch":
+            REPORTER.event("package", **record)
+
+    def slowest(self, count: int) -> List[Dict[str, Any]]:
+        """🐢 Packages by total time spent on them (bulk installs excluded)"""
+        totals: Dict[tuple, Dict[str, Any]] = {}
+        for record in self.packages:
+            if record.get("bulk") or record["status"] == "present":
+                continue
+            key = (record["kind"], record["name"])
+            total = totals.setdefault(
+                key,
+                {"kind": key[0], "name": key[1], "seconds": 0.0, "steps": {}},
+            )
+            total["seconds"] += record["seconds"]
+            steps = total["steps"]
+            steps[record["action"]] = (
+                steps.get(record["action"], 0.0) + record["seconds"]
+            )
+        ranked = sorted(totals.values(), key=lambda total: -total["seconds"])
+        return ranked[:count]
+
+    def print_slowest(self, count: int) -> None:
+        """🏆 Print the phase timings and the slowest packages"""
+        if count <= 0 or not (self.phases or self.packages):
+            return
+        REPORTER.line("\n⏱️  Time spent per phase:")
+        for phase in self.phases:
+            REPORTER.line(f"   {phase['name']:<20} {phase['seconds']:>8.1f}s")
+
+        ranked = self.slowest(count)
+        if ranked:
+            REPORTER.line(f"\n🐢 Slowest {len(ranked)} packages:")
+        for i, total in enumerate(ranked, 1):
+            steps = ", ".join(
+                f"{action} {seconds:.1f}s" for action, seconds in total["steps"].items()
+            )
+            REPORTER.line(
+                f"   {i}. {total['name']} ({total['kind']}) "
+                f"{total['seconds']:.1f}s - {steps}"
+            )
+
+    def write(self, path: Path) -> bool:
+        """💾 Save the report - CSV if the file name ends in .csv, JSON otherwise"""
+        try:
+            with open(path, "w", newline="") as f:
+                if path.suffix.lower() == ".csv":
+                    writer = csv.DictWriter(
+                        f, fieldnames=REPORT_CSV_FIELDS, extrasaction="ignore"
+                    )
+                    writer.writeheader()
+                    for phase in self.phases:
+                        writer.writerow({"record": "phase", **phase})
+                    for record in self.packages:
+                        writer.writerow({"record": "package", **record})
+                    for command in self.commands:
+                        writer.writerow(
+                            {"record": "command", "name": command["command"], **command}
+                        )
+                else:
+                    json.dump(
+                        {
+                            "started": time.strftime(
+                                "%Y-%m-%dT%H:%M:%S", time.localtime(self.started)
+                            ),
+                            "seconds": round(time.perf_counter() - self.clock, 6),
+                            "phases": self.phases,
+                            "packages": self.packages,
+                            "commands": self.commands,
+                        },
+                        f,
+                        indent=2,
+                    )
+                    f.write("\n")
+        except OSError as e:
+            REPORTER.line(f"⚠️  Could not write run report {path}: {e}")
+            return False
+        REPORTER.line(f"📄 Run report written to {path}")
+        return True
+
+
+# ⏱️ The run report every command and package step is recorded in
+RUN_REPORT = RunReport()
+
+
+def get_output_bytes(result: Optional[subprocess.CompletedProcess]) -> Optional[int]:
+    """📏 Size of a command's captured output (None if it went to the terminal)"""
+    if result is None or (result.stdout is None and result.stderr is None):
+        return None
+    return len((result.stdout or "").encode()) + len((result.stderr or "").encode())
 
 
 def run_command(
@@ -58,6 +343,11 @@ def run_command(
 
     ✨ Returns: CompletedProcess object or None if failed
     """
+    # Live output would garble quiet/json output - capture it there instead
+    show_output = show_output and REPORTER.mode == "pretty"
+    started = time.perf_counter()
+    result = None
+    exit_code = None
     try:
         if show_output:
             # Show real-time output for package installations
@@ -75,11 +365,50 @@ def run_command(
                 result = subprocess.run(
                     cmd, capture_output=True, text=True, check=check
                 )
+        exit_code = result.returncode
         return result
     except subprocess.CalledProcessError as e:
-        print(f"💥 Command execution failed: {e}")
+        exit_code = e.returncode
+        REPORTER.line(f"💥 Command execution failed: {e}")
+        return None
+    finally:
+        RUN_REPORT.command(
+            cmd, time.perf_counter() - started, exit_code, get_output_bytes(result)
+        )
+
+
+def stream_command(cmd: List[str]) -> Optional[subprocess.CompletedProcess]:
+    """
+    📡 Live Output Broadcaster with a Memory!
+
+    ⚡ What it does:
+       • Streams the command's output to the terminal line by line
+       • Keeps a copy of everything printed (stdout and stderr combined)
+       • Lets callers inspect the output after watching it live
+
+    ✨ Returns CompletedProcess with the captured text in .stdout, or None
+    """
+    started = time.perf_counter()
+    try:
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+    except OSError as e:
+        REPORTER.line(f"💥 Command execution failed: {e}")
+        RUN_REPORT.command(cmd, time.perf_counter() - started, None, None)
         return None
 
+    lines: List[str] = []
+    for line in process.stdout or []:
+        REPORTER.line(line.rstrip("\n"), flush=True)
+        lines.append(line)
+    process.wait()
+    result = subprocess.CompletedProcess(cmd, process.returncode, "".join(lines), "")
+    RUN_REPORT.command(
+        cmd, time.perf_counter() - started, result.returncode, get_output_bytes(result)
+    )
+    return result
+
 
 def is_brew_installed() -> bool:
     """
@@ -105,19 +434,23 @@ def install_brew() -> bool:
     ⚠️  Requires internet connection and may prompt for password!
     🎉 Returns True if installation succeeded, False otherwise
     """
-    print("🚀 Homebrew not found - installing now...")
+    REPORTER.line("🚀 Homebrew not found - installing now...")
     install_cmd = '/bin/bash -c "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"'
     result = run_command(install_cmd, shell=True, check=False)
 
     if result and result.returncode == 0:
-        print("🎉 Homebrew installation completed successfully!")
+        REPORTER.line("🎉 Homebrew installation completed successfully!")
         return True
     else:
-        print("💥 Homebrew installation failed - please check your internet connection")
+        REPORTER.line(
+            "💥 Homebrew installation failed - please check your internet connection"
+        )
         return False
 
 
-def setup_brew_environment() -> None:
+def setup_brew_environment(
+    cache_dir: Optional[Path] = None, mirror: Optional[str] = None
+) -> None:
     """
     🔧 Environment Setup Wizard - Making Homebrew Feel at Home!
 
@@ -126,6 +459,8 @@ def setup_brew_environment() -> None:
        • Disables analytics (keeps your privacy intact!)
        • Sets cask options to skip quarantine dialogs
        • Supports both Intel (/usr/local) and Apple Silicon (/opt/homebrew)
+       • Points brew at a shared download cache (HOMEBREW_CACHE)
+       • Routes downloads through a local mirror (HOMEBREW_ARTIFACT_DOMAIN)
 
     🎯 Perfect for scripts that need immediate Homebrew access!
     """
@@ -142,6 +477,18 @@ def setup_brew_environment() -> None:
     os.environ["HOMEBREW_NO_ANALYTICS"] = "1"
     os.environ["HOMEBREW_CASK_OPTS"] = "--no-quarantine"
 
+    # Share downloads between machines (e.g. a directory on a NAS)
+    if cache_dir:
+        cache_dir = cache_dir.expanduser().resolve()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        os.environ["HOMEBREW_CACHE"] = str(cache_dir)
+        REPORTER.line(f"💾 Using shared download cache {cache_dir}")
+
+    # brew falls back to the upstream URL when the mirror lacks a file
+    if mirror:
+        os.environ["HOMEBREW_ARTIFACT_DOMAIN"] = mirror.rstrip("/")
+        REPORTER.line(f"🪞 Downloading through mirror {mirror}")
+
 
 def update_brew() -> bool:
     """
@@ -156,15 +503,150 @@ def update_brew() -> bool:
     💡 Like 'apt update' but for macOS - essential before installing!
     ✨ Returns True if successful, False if network/server issues
     """
-    print("🔄 Refreshing Homebrew package lists...")
+    REPORTER.line("🔄 Refreshing Homebrew package lists...")
     result = run_command(["brew", "update"], check=False)
     if result and result.returncode == 0:
-        print("✨ Package lists updated successfully")
+        REPORTER.line("✨ Package lists updated successfully")
         return True
     else:
-        print("⚠️  Package list update failed, but continuing...")
+        REPORTER.line("⚠️  Package list update failed, but continuing...")
+        return False
+
+
+def get_brew_repository() -> Optional[Path]:
+    """
+    🏠 Homebrew Home Finder!
+
+    🎯 Works out Homebrew's git repository from the brew executable
+       (<repository>/bin/brew) - no slow 'brew --repository' call needed.
+    """
+    brew = shutil.which("brew")
+    if not brew:
+        return None
+    return Path(brew).resolve().parent.parent
+
+
+def read_git_revision(repo: Path) -> Optional[str]:
+    """
+    🔖 Reads the commit a git checkout is at straight from .git (HEAD, the
+       loose ref or packed-refs) instead of spawning 'git rev-parse'.
+    """
+    git_dir = repo / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head
+        ref = head[len("ref: ") :]
+        ref_path = git_dir / ref
+        if ref_path.exists():
+            return ref_path.read_text().strip()
+        for line in (git_dir / "packed-refs").read_text().splitlines():
+            if line.endswith(f" {ref}"):
+                return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    return None
+
+
+def get_tap_revisions() -> Dict[str, str]:
+    """
+    🏷️  Revision Snapshot of Homebrew and Every Tap!
+
+    🎯 Maps Homebrew's own repository and each tap (user/repo) to the git
+       commit it is at. Any change - a new tap, an untap or an update run
+       by someone else - means the recorded update is no longer current.
+    """
+    repository = get_brew_repository()
+    if repository is None:
+        return {}
+
+    revisions: Dict[str, str] = {}
+    revision = read_git_revision(repository)
+    if revision:
+        revisions["homebrew"] = revision
+
+    taps_dir = repository / "Library" / "Taps"
+    try:
+        users = sorted(taps_dir.iterdir())
+    except OSError:
+        users = []
+    for user in users:
+        if not user.is_dir():
+            continue
+        for tap in sorted(user.iterdir()):
+            revision = read_git_revision(tap)
+            if revision:
+                revisions[f"{user.name}/{tap.name}"] = revision
+    return revisions
+
+
+def read_brew_state(state_path: Path) -> Dict[str, Any]:
+    """📖 Load the freshness cache (empty if missing, unreadable or outdated)"""
+    try:
+        with open(state_path, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != BREW_STATE_VERSION:
+        return {}
+    return state
+
+
+def write_brew_state(state_path: Path, state: Dict[str, Any]) -> None:
+    """💾 Save the freshness cache atomically (a failure only costs an update)"""
+    temp_path = state_path.with_name(f"{state_path.name}.tmp")
+    try:
+        with open(temp_path, "w") as f:
+            json.dump(state, f, indent=2)
+            f.write("\n")
+        os.replace(temp_path, state_path)
+    except OSError as e:
+        REPORTER.line(f"⚠️  Could not save {state_path}: {e}")
+
+
+def update_brew_if_stale(state_path: Path, ttl_minutes: float) -> bool:
+    """
+    🕰️  Smart Refresh - Only Update When It's Actually Needed!
+
+    ⚡ Skips the slow 'brew update' (git fetches of every tap) when:
+       • HOMEBREW_NO_AUTO_UPDATE is already set - the policy says no
+       • The last successful update is younger than ttl_minutes AND
+         Homebrew and every tap are still at the recorded revisions
+
+    🔒 Afterwards HOMEBREW_NO_AUTO_UPDATE=1 is set for this run, so the
+       following brew install calls don't each start their own update.
+
+    💡 ttl_minutes = 0 always updates
+    ✨ Returns True if the metadata is fresh (updated now or recently)
+    """
+    if os.environ.get("HOMEBREW_NO_AUTO_UPDATE"):
+        REPORTER.line("⏭️  HOMEBREW_NO_AUTO_UPDATE is set - skipping update")
+        return True
+
+    state = read_brew_state(state_path)
+    age = time.time() - state.get("updated_at", 0)
+    if ttl_minutes > 0 and 0 <= age < ttl_minutes * 60:
+        if state.get("revisions") == get_tap_revisions():
+            REPORTER.line(
+                f"⏭️  Package lists updated {age / 60:.0f} minutes ago - skipping update"
+            )
+            os.environ["HOMEBREW_NO_AUTO_UPDATE"] = "1"
+            return True
+
+    if not update_brew():
         return False
 
+    write_brew_state(
+        state_path,
+        {
+            "version": BREW_STATE_VERSION,
+            "updated_at": time.time(),
+            "revisions": get_tap_revisions(),
+        },
+    )
+    os.environ["HOMEBREW_NO_AUTO_UPDATE"] = "1"
+    return True
+
 
 def upgrade_brew() -> bool:
     """
@@ -179,28 +661,28 @@ def upgrade_brew() -> bool:
     ⚡ Two-phase operation for maximum compatibility
     🎉 Your packages get the VIP treatment they deserve!
     """
-    print("⬆️  Upgrading all installed packages...")
+    REPORTER.line("⬆️  Upgrading all installed packages...")
 
     # Upgrade formulae
-    print("   📦 Upgrading formulae...")
+    REPORTER.line("   📦 Upgrading formulae...")
     result1 = run_command(["brew", "upgrade"], check=False)
 
     # Upgrade casks
-    print("   📱 Upgrading casks...")
+    REPORTER.line("   📱 Upgrading casks...")
     result2 = run_command(["brew", "upgrade", "--cask"], check=False)
 
     success = (result1 and result1.returncode == 0) and (
         result2 and result2.returncode == 0
     )
     if success:
-        print("✨ All packages upgraded successfully")
+        REPORTER.line("✨ All packages upgraded successfully")
     else:
-        print("⚠️  Some packages may have failed to upgrade")
+        REPORTER.line("⚠️  Some packages may have failed to upgrade")
 
     return bool(success)
 
 
-def cleanup_brew() -> bool:
+def cleanup_brew(keep_cache: bool = False) -> bool:
     """
     🧹 The Great Homebrew Cleanup Service!
 
@@ -211,15 +693,18 @@ def cleanup_brew() -> bool:
        • Keeps only the latest versions you actually use
 
     💾 Can free hundreds of MB or even GB of space!
+    🤝 keep_cache skips --prune=all, so a download cache shared with
+       other machines (--cache-dir/--mirror) keeps its current downloads
     ✨ Your Mac will thank you with faster performance
     """
-    print("🧹 Cleaning up old package versions and cache...")
-    result = run_command(["brew", "cleanup", "--prune=all"], check=False)
+    REPORTER.line("🧹 Cleaning up old package versions and cache...")
+    cmd = ["brew", "cleanup"] if keep_cache else ["brew", "cleanup", "--prune=all"]
+    result = run_command(cmd, check=False)
     if result and result.returncode == 0:
-        print("✨ Cleanup completed successfully")
+        REPORTER.line("✨ Cleanup completed successfully")
         return True
     else:
-        print("⚠️  Cleanup completed with some warnings")
+        REPORTER.line("⚠️  Cleanup completed with some warnings")
         return False
 
 
@@ -243,18 +728,264 @@ def read_brew_json(file_path: str = "brew.json") -> Optional[Dict[str, Any]]:
     except FileNotFoundError:
         return None
     except json.JSONDecodeError as e:
-        print(f"💥 Invalid JSON format in {file_path}: {e}")
+        REPORTER.line(f"💥 Invalid JSON format in {file_path}: {e}")
         return None
     except Exception as e:
-        print(f"💥 Unexpected error reading {file_path}: {e}")
+        REPORTER.line(f"💥 Unexpected error reading {file_path}: {e}")
+        return None
+
+
+def get_installed_info() -> Optional[Dict[str, Any]]:
+    """
+    📸 One-Shot Snapshot of Everything Already Installed!
+
+    🎯 What it does:
+       • Asks brew about ALL installed formulae and casks in a single call
+       • Parses the JSON answer ('brew info --json=v2 --installed')
+       • Saves dozens of slow brew startups on provisioned machines
+
+    💡 Returns None when brew can't answer - callers then install everything
+    ✨ Returns the raw brew info dict with "formulae" and "casks" lists
+    """
+    result = run_command(["brew", "info", "--json=v2", "--installed"], check=False)
+    if not result or result.returncode != 0:
+        return None
+
+    try:
+        return json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return None
+
+
+def build_installed_index(info: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """
+    🗂️  Installed Package Index Builder!
+
+    🎯 Turns brew's JSON snapshot into instant lookups:
+       • Maps every name, full name, alias and old name to its version
+       • Handles tapped names like 'homebrew/cask/kitty' transparently
+       • Keeps formulae and casks in separate namespaces
+
+    📋 Shape: {"formulae": {name: version}, "casks": {token: version}}
+    """
+    index: Dict[str, Dict[str, str]] = {"formulae": {}, "casks": {}}
+
+    for formula in info.get("formulae", []):
+        installed = formula.get("installed") or []
+        if not installed:
+            continue
+        version = installed[-1].get("version") or "installed"
+        names = [formula.get("name"), formula.get("full_name")]
+        names += formula.get("aliases") or []
+        names += formula.get("oldnames") or []
+        for name in names:
+            if name:
+                index["formulae"][name] = version
+
+    for cask in info.get("casks", []):
+        version = cask.get("installed")
+        if not version:
+            continue
+        names = [cask.get("token"), cask.get("full_token")]
+        names += cask.get("old_tokens") or []
+        for name in names:
+            if name:
+                index["casks"][name] = version
+
+    return index
+
+
+def get_installed_index() -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    🔍 Pre-Flight Check - What's Already On This Mac?
+
+    ⚡ One brew invocation instead of one per package
+    💡 Returns None if the snapshot failed (every package gets installed)
+    """
+    REPORTER.line("🔍 Checking which packages are already installed...")
+    info = get_installed_info()
+    if info is None:
+        REPORTER.line("⚠️  Could not query installed packages - installing everything")
         return None
 
+    index = build_installed_index(info)
+    REPORTER.line(
+        f"✅ Found {len(info.get('formulae', []))} formulae and "
+        f"{len(info.get('casks', []))} applications already installed"
+    )
+    return index
+
+
+def fetch_package(
+    package: str, cask: bool = False
+) -> Optional[subprocess.CompletedProcess]:
+    """
+    📥 Single Package Download Courier!
+
+    🎯 What it does:
+       • Downloads a bottle (plus its dependencies) or a cask archive
+       • Stores it in Homebrew's download cache for the install phase
+       • Captures all output so parallel downloads never interleave
+
+    💡 Fetching does not hold Homebrew's install lock - safe to run in parallel!
+    ✨ Returns CompletedProcess object or None if the command failed to run
+    """
+    if cask:
+        cmd = ["brew", "fetch", "--cask", package]
+    else:
+        cmd = ["brew", "fetch", "--deps", package]
+    return run_command(cmd, check=False)
+
+
+def get_cached_downloads(
+    packages: List[str], cask: bool = False
+) -> Optional[Dict[str, bool]]:
+    """
+    💾 Download Cache Inspector!
+
+    🎯 Asks brew ONCE where every package's bottle or cask archive lives in
+       the download cache ('brew --cache a b c ...') and checks which of
+       those files are already there.
+
+    ✨ Returns package -> already cached, or None if brew could not tell
+    """
+    cmd = ["brew", "--cache", "--cask"] if cask else ["brew", "--cache"]
+    result = run_command(cmd + packages, check=False)
+    if not result or result.returncode != 0:
+        return None
+    paths = result.stdout.splitlines()
+    if len(paths) != len(packages):
+        return None
+    return {package: Path(path).exists() for package, path in zip(packages, paths)}
+
+
+def fetch_packages(packages: List[str], cask: bool = False, jobs: int = 1) -> bool:
+    """
+    🚚 Parallel Download Fleet Commander!
+
+    ⚡ What makes this fast:
+       • Fans out 'brew fetch' calls across a bounded pool of workers
+       • Buffers each package's output while its download runs
+       • Replays the buffered output in package order once all are done
+       • Times every download for the run report
+       • Counts download cache hits and misses, and skips cached casks
+         (formulae are still fetched: their dependencies may be missing)
+       • Leaves the lock-holding 'brew install' step to run serially
+
+    💡 Download failures are not fatal - brew install retries them anyway
+    🎯 Returns True only if ALL downloads succeeded
+    """
+    if not packages:
+        return True
+
+    kind = "applications" if cask else "formulae"
+    cached = get_cached_downloads(packages, cask)
+    if cached is not None:
+        hits = [package for package in packages if cached[package]]
+        REPORTER.line(
+            f"💾 Download cache: {len(hits)} hits, {len(packages) - len(hits)} misses"
+        )
+        REPORTER.event(
+            "cache",
+            kind="cask" if cask else "formula",
+            hits=len(hits),
+            misses=len(packages) - len(hits),
+        )
+
+    # A cask is a single archive; a cached bottle says nothing about the
+    # bottles of its dependencies, which 'brew fetch --deps' still needs
+    if cached is not None and cask:
+        for package in hits:
+            RUN_REPORT.package("cask", package, "cached", 0.0, action="fetch")
+        total = len(packages)
+        packages = [package for package in packages if not cached[package]]
+        if not packages:
+            REPORTER.line(f"📥 All {total} {kind} already downloaded")
+            return True
+
+    workers = max(1, min(jobs, len(packages)))
+    REPORTER.line(
+        f"📥 Downloading {len(packages)} {kind} with {workers} parallel workers..."
+    )
+
+    def timed_fetch(package: str) -> tuple:
+        started = time.perf_counter()
+        result = fetch_package(package, cask)
+        return result, time.perf_counter() - started
 
-def install_formulae(formulae: List[str]) -> bool:
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(timed_fetch, packages))
+
+    success_count = 0
+    for package, (result, seconds) in zip(packages, results):
+        RUN_REPORT.package(
+            "cask" if cask else "formula",
+            package,
+            "fetched" if result and result.returncode == 0 else "failed",
+            seconds,
+            action="fetch",
+            result=result,
+        )
+        if result and result.returncode == 0:
+            REPORTER.line(f"   📥 {package} downloaded")
+            success_count += 1
+        else:
+            REPORTER.line(
+                f"   ⚠️  {package} download failed - will retry during install"
+            )
+
+        if result:
+            for line in (result.stdout + result.stderr).splitlines():
+                REPORTER.line(f"      │ {line}")
+
+    REPORTER.line(f"📥 Downloads complete: {success_count}/{len(packages)} successful")
+    return success_count == len(packages)
+
+
+def install_bulk(packages: List[str], cask: bool = False) -> List[str]:
+    """
+    🚀 One Brew To Install Them All!
+
+    ⚡ Why it's fast:
+       • Passes the whole list to a single 'brew install a b c ...' call
+       • Pays Homebrew's (slow) startup cost once instead of per package
+       • Streams the output live and keeps a copy for failure analysis
+
+    🎯 Failure attribution:
+       • Exit code 0 means every package made it
+       • Otherwise a fresh installed-package snapshot decides - brew may
+         abort the whole batch after an error about just one package
+       • Without a snapshot, every package is retried
+
+    ✨ Returns the packages that still need a (per-package) retry
+    """
+    cmd = ["brew", "install", "--cask"] if cask else ["brew", "install"]
+    REPORTER.line(f"\n⚡ Installing {len(packages)} packages in one go...")
+    REPORTER.line("─" * 30)
+    result = stream_command(cmd + packages)
+    if result and result.returncode == 0:
+        return []
+
+    info = get_installed_info()
+    if info is None:
+        return list(packages)
+    present = build_installed_index(info)["casks" if cask else "formulae"]
+    return [package for package in packages if package not in present]
+
+
+def install_formulae(
+    formulae: List[str],
+    jobs: int = 1,
+    installed: Optional[Dict[str, str]] = None,
+    bulk: bool = False,
+) -> bool:
     """
     📦 Command-Line Tools Installation Specialist!
 
     ⚡ What makes this special:
+       • Skips formulae that are already installed (no brew call at all!)
+       • Downloads everything in parallel first when jobs > 1
+       • Bulk mode installs all of them with a single brew call
        • Installs each formula with live progress tracking
        • Shows real-time Homebrew output and download progress
        • Handles dependencies automatically
@@ -265,37 +996,86 @@ def install_formulae(formulae: List[str]) -> bool:
     🎯 Returns True only if ALL installations succeeded
     """
     if not formulae:
-        print("📦 No formulae to install")
+        REPORTER.line("📦 No formulae to install")
         return True
 
-    print(f"📦 Installing {len(formulae)} command-line tools...")
-    print("-" * 50)
+    REPORTER.line(f"📦 Installing {len(formulae)} command-line tools...")
+    REPORTER.line("-" * 50)
     success_count = 0
 
-    for i, formula in enumerate(formulae, 1):
-        print(f"\n⚡ [{i}/{len(formulae)}] Installing {formula}...")
-        print("─" * 30)
+    missing = formulae
+    if installed is not None:
+        missing = [formula for formula in formulae if formula not in installed]
+        for formula in formulae:
+            if formula in installed:
+                REPORTER.line(f"✅ {formula} already present ({installed[formula]})")
+                RUN_REPORT.package(
+                    "formula", formula, "present", 0.0, version=installed[formula]
+                )
+                success_count += 1
+
+    if jobs > 1:
+        fetch_packages(missing, jobs=jobs)
+
+    if bulk and len(missing) > 1:
+        started = time.perf_counter()
+        failed = install_bulk(missing)
+        seconds = time.perf_counter() - started
+        success_count += len(missing) - len(failed)
+        for formula in missing:
+            if formula not in failed:
+                RUN_REPORT.package("formula", formula, "installed", seconds, bulk=True)
+        if failed:
+            REPORTER.line(f"\n🔁 Retrying {len(failed)} failed formulae one by one...")
+        missing = failed
+
+    for i, formula in enumerate(missing, 1):
+        REPORTER.line(f"\n⚡ [{i}/{len(missing)}] Installing {formula}...")
+        REPORTER.line("─" * 30)
+        started = time.perf_counter()
         result = run_command(
             ["brew", "install", formula], check=False, show_output=True
         )
         if result and result.returncode == 0:
-            print(f"✅ {formula} installed successfully\n")
+            REPORTER.line(f"✅ {formula} installed successfully\n")
             success_count += 1
         else:
-            print(f"❌ {formula} installation failed\n")
+            REPORTER.line(f"❌ {formula} installation failed\n")
+        RUN_REPORT.package(
+            "formula",
+            formula,
+            "installed" if result and result.returncode == 0 else "failed",
+            time.perf_counter() - started,
+            result=result,
+        )
 
-    print("=" * 50)
-    print(
+    REPORTER.line("=" * 50)
+    REPORTER.line(
         f"📦 Formula installation complete: {success_count}/{len(formulae)} successful"
     )
+    REPORTER.event(
+        "summary",
+        kind="formula",
+        total=len(formulae),
+        succeeded=success_count,
+        failed=len(formulae) - success_count,
+    )
     return success_count == len(formulae)
 
 
-def install_casks(casks: List[str]) -> bool:
+def install_casks(
+    casks: List[str],
+    jobs: int = 1,
+    installed: Optional[Dict[str, str]] = None,
+    bulk: bool = False,
+) -> bool:
     """
     📱 GUI Applications Installation Maestro!
 
     🎨 The premium app installer experience:
+       • Skips applications that are already installed instantly
+       • Downloads every app in parallel first when jobs > 1
+       • Bulk mode installs every app with a single brew call
        • Downloads and installs macOS applications seamlessly
        • Shows real-time progress for large app downloads
        • Handles app signatures and permissions automatically
@@ -306,33 +1086,458 @@ def install_casks(casks: List[str]) -> bool:
     ✨ Returns True only if ALL applications installed successfully
     """
     if not casks:
-        print("📱 No applications to install")
+        REPORTER.line("📱 No applications to install")
         return True
 
-    print(f"📱 Installing {len(casks)} applications...")
-    print("-" * 50)
+    REPORTER.line(f"📱 Installing {len(casks)} applications...")
+    REPORTER.line("-" * 50)
     success_count = 0
 
-    for i, cask in enumerate(casks, 1):
-        print(f"\n⚡ [{i}/{len(casks)}] Installing {cask}...")
-        print("─" * 30)
+    missing = casks
+    if installed is not None:
+        missing = [cask for cask in casks if cask not in installed]
+        for cask in casks:
+            if cask in installed:
+                REPORTER.line(f"✅ {cask} already present ({installed[cask]})")
+                RUN_REPORT.package(
+                    "cask", cask, "present", 0.0, version=installed[cask]
+                )
+                success_count += 1
+
+    if jobs > 1:
+        fetch_packages(missing, cask=True, jobs=jobs)
+
+    if bulk and len(missing) > 1:
+        started = time.perf_counter()
+        failed = install_bulk(missing, cask=True)
+        seconds = time.perf_counter() - started
+        success_count += len(missing) - len(failed)
+        for cask in missing:
+            if cask not in failed:
+                RUN_REPORT.package("cask", cask, "installed", seconds, bulk=True)
+        if failed:
+            REPORTER.line(
+                f"\n🔁 Retrying {len(failed)} failed applications one by one..."
+            )
+        missing = failed
+
+    for i, cask in enumerate(missing, 1):
+        REPORTER.line(f"\n⚡ [{i}/{len(missing)}] Installing {cask}...")
+        REPORTER.line("─" * 30)
+        started = time.perf_counter()
         result = run_command(
             ["brew", "install", "--cask", cask], check=False, show_output=True
         )
         if result and result.returncode == 0:
-            print(f"✅ {cask} installed successfully\n")
+            REPORTER.line(f"✅ {cask} installed successfully\n")
             success_count += 1
         else:
-            print(f"❌ {cask} installation failed\n")
+            REPORTER.line(f"❌ {cask} installation failed\n")
+        RUN_REPORT.package(
+            "cask",
+            cask,
+            "installed" if result and result.returncode == 0 else "failed",
+            time.perf_counter() - started,
+            result=result,
+        )
 
-    print("=" * 50)
-    print(
+    REPORTER.line("=" * 50)
+    REPORTER.line(
         f"📱 Application installation complete: {success_count}/{len(casks)} successful"
     )
+    REPORTER.event(
+        "summary",
+        kind="cask",
+        total=len(casks),
+        succeeded=success_count,
+        failed=len(casks) - success_count,
+    )
     return success_count == len(casks)
 
 
-def get_user_confirmation() -> bool:
+def get_outdated_packages() -> Optional[Dict[str, Dict[str, Dict[str, Any]]]]:
+    """
+    🕵️ Outdated Package Detective - One Question, Every Answer!
+
+    🎯 Asks Homebrew ONCE which installed formulae and casks have newer
+       versions ('brew outdated --json=v2') instead of checking each one.
+
+    ✨ Returns {"formulae": {name: ...}, "casks": {name: ...}} where every
+       package maps to {"installed": ..., "current": ..., "pinned": ...},
+       or None if brew could not tell
+    """
+    REPORTER.line("🔍 Checking which packages are outdated...")
+    result = run_command(["brew", "outdated", "--json=v2"], check=False)
+    try:
+        info = json.loads(result.stdout) if result else None
+    except json.JSONDecodeError:
+        info = None
+    if not isinstance(info, dict):
+        REPORTER.line("⚠️  Could not list outdated packages")
+        return None
+
+    outdated: Dict[str, Dict[str, Dict[str, Any]]] = {"formulae": {}, "casks": {}}
+    for key in outdated:
+        for package in info.get(key, []):
+            installed = package.get("installed_versions") or []
+            if isinstance(installed, str):
+                installed = [installed]
+            details = {
+                "installed": ", ".join(installed) or "?",
+                "current": package.get("current_version") or "?",
+                "pinned": bool(package.get("pinned")),
+            }
+            # Tap packages may be reported as user/tap/name
+            name = package.get("name") or ""
+            for alias in {name, name.rsplit("/", 1)[-1]}:
+                if alias:
+                    outdated[key][alias] = details
+    return outdated
+
+
+def select_outdated(
+    packages: List[str], outdated: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    🎯 The outdated packages brew.json manages - everything else installed
+       on the machine is left alone. Pinned formulae are reported and skipped.
+    """
+    selected: Dict[str, Dict[str, Any]] = {}
+    for package in packages:
+        details = outdated.get(package)
+        if details is None:
+            continue
+        if details["pinned"]:
+            REPORTER.line(
+                f"📌 {package} is pinned at {details['installed']} - skipping"
+            )
+            continue
+        selected[package] = details
+    return selected
+
+
+def upgrade_packages(
+    outdated: Dict[str, Dict[str, Any]], cask: bool = False, jobs: int = 1
+) -> bool:
+    """
+    ⬆️  Targeted Upgrade Specialist - Only What's Outdated, Only What's Ours!
+
+    ⚡ What makes this fast:
+       • Downloads the new versions in parallel first when jobs > 1
+       • Upgrades the whole set with ONE 'brew upgrade a b c ...' call
+       • Retries only the packages still outdated afterwards, one by one
+       • Reports the version delta of every package (old → new)
+
+    💡 The upgrades themselves stay serial - concurrent brew processes
+       fight over Homebrew's locks and shared dependencies
+    🎯 Returns True only if ALL upgrades succeeded
+    """
+    if not outdated:
+        return True
+
+    kind = "cask" if cask else "formula"
+    packages = list(outdated)
+    if jobs > 1:
+        fetch_packages(packages, cask=cask, jobs=jobs)
+
+    cmd = ["brew", "upgrade", "--cask"] if cask else ["brew", "upgrade"]
+    REPORTER.line(f"\n⬆️  Upgrading {len(packages)} packages in one go...")
+    REPORTER.line("─" * 30)
+    started = time.perf_counter()
+    result = stream_command(cmd + packages)
+    seconds = time.perf_counter() - started
+
+    # brew may abort the whole batch over one package - ask again what is
+    # still outdated instead of trusting its 'Error:' lines
+    failed: List[str] = []
+    if not result or result.returncode != 0:
+        remaining = get_outdated_packages()
+        still_outdated = remaining["casks" if cask else "formulae"] if remaining else {}
+        failed = [
+            package
+            for package in packages
+            if remaining is None or package in still_outdated
+        ]
+
+    results: Dict[str, Optional[subprocess.CompletedProcess]] = {}
+    for package in failed:
+        REPORTER.line(f"\n🔁 Retrying {package} on its own...")
+        retry_started = time.perf_counter()
+        results[package] = stream_command(cmd + [package])
+        retried = results[package]
+        RUN_REPORT.package(
+            kind,
+            package,
+            "upgraded" if retried and retried.returncode == 0 else "failed",
+            time.perf_counter() - retry_started,
+            action="upgrade",
+            result=retried,
+            from_version=outdated[package]["installed"],
+            to_version=outdated[package]["current"],
+        )
+
+    success_count = 0
+    REPORTER.line("")
+    for package, details in outdated.items():
+        retried = results.get(package)
+        if package in failed and not (retried and retried.returncode == 0):
+            REPORTER.line(f"❌ {package} {details['installed']} upgrade failed")
+            continue
+        success_count += 1
+        REPORTER.line(f"✅ {package} {details['installed']} → {details['current']}")
+        if package not in failed:
+            RUN_REPORT.package(
+                kind,
+                package,
+                "upgraded",
+                seconds,
+                action="upgrade",
+                bulk=True,
+                from_version=details["installed"],
+                to_version=details["current"],
+            )
+
+    REPORTER.event(
+        "summary",
+        kind=kind,
+        action="upgrade",
+        total=len(packages),
+        succeeded=success_count,
+        failed=len(packages) - success_count,
+    )
+    return success_count == len(packages)
+
+
+def plan_reconcile(
+    info: Dict[str, Any], formulae: List[str], casks: List[str]
+) -> Dict[str, Any]:
+    """
+    🧭 Drift Detector - What Separates This Mac From brew.json?
+
+    🎯 Compares ONE installed-package snapshot against brew.json:
+       • missing  - listed in brew.json but not installed
+       • outdated - listed, installed and behind (pinned formulae excluded)
+       • extra    - installed on request but not in brew.json, and nothing
+                    installed (formula or cask) depends on it
+
+    📋 Shape: {"missing": {"formulae": [...], "casks": [...]},
+               "outdated": {"formulae": {name: versions}, "casks": {...}},
+               "extra": {"formulae": [...], "casks": [...]}}
+    """
+    wanted = {"formulae": set(formulae), "casks": set(casks)}
+    index = build_installed_index(info)
+    plan: Dict[str, Any] = {
+        "missing": {
+            "formulae": [name for name in formulae if name not in index["formulae"]],
+            "casks": [name for name in casks if name not in index["casks"]],
+        },
+        "outdated": {"formulae": {}, "casks": {}},
+        "extra": {"formulae": [], "casks": []},
+    }
+
+    # Dependencies may be tap-qualified (user/tap/name); casks can need
+    # formulae and other casks through depends_on
+    dependencies = set()
+    for formula in info.get("formulae", []):
+        if formula.get("installed"):
+            dependencies.update(formula.get("dependencies") or [])
+            for version in formula["installed"]:
+                for dependency in version.get("runtime_dependencies") or []:
+                    dependencies.add(dependency.get("full_name"))
+    for cask in info.get("casks", []):
+        if cask.get("installed"):
+            depends_on = cask.get("depends_on") or {}
+            dependencies.update(depends_on.get("formula") or [])
+            dependencies.update(depends_on.get("cask") or [])
+
+    for formula in info.get("formulae", []):
+        installed = formula.get("installed") or []
+        if not installed:
+            continue
+        names = [formula.get("name"), formula.get("full_name")]
+        names += formula.get("aliases") or []
+        names += formula.get("oldnames") or []
+        managed = [name for name in names if name in wanted["formulae"]]
+        if managed:
+            if formula.get("outdated") and not formula.get("pinned"):
+                versions = formula.get("versions") or {}
+                plan["outdated"]["formulae"][managed[0]] = {
+                    "installed": installed[-1].get("version") or "?",
+                    "current": versions.get("stable") or "?",
+                    "pinned": False,
+                }
+        elif dependencies.isdisjoint(names) and any(
+            version.get("installed_on_request") for version in installed
+        ):
+            plan["extra"]["formulae"].append(formula.get("full_name"))
+
+    for cask in info.get("casks", []):
+        if not cask.get("installed"):
+            continue
+        names = [cask.get("token"), cask.get("full_token")]
+        names += cask.get("old_tokens") or []
+        managed = [name for name in names if name in wanted["casks"]]
+        if not managed and dependencies.isdisjoint(names):
+            plan["extra"]["casks"].append(cask.get("full_token"))
+        elif managed and cask.get("outdated"):
+            plan["outdated"]["casks"][managed[0]] = {
+                "installed": cask.get("installed"),
+                "current": cask.get("version") or "?",
+                "pinned": False,
+            }
+
+    return plan
+
+
+def display_reconcile_plan(plan: Dict[str, Any], keep_extras: bool) -> int:
+    """
+    📋 Reconcile Plan Preview - Every Change Before It Happens!
+
+    🎯 Lists what will be installed, upgraded (old → new) and removed
+    ✨ Returns the number of changes that will actually be made
+    """
+    REPORTER.line("\n🧭 Reconcile plan:")
+    changes = 0
+    for label, kind in (("📦", "formulae"), ("📱", "casks")):
+        missing = plan["missing"][kind]
+        if missing:
+            REPORTER.line(f"   {label} Install ({len(missing)}): {', '.join(missing)}")
+            changes += len(missing)
+
+        outdated = plan["outdated"][kind]
+        if outdated:
+            deltas = ", ".join(
+                f"{name} {details['installed']} → {details['current']}"
+                for name, details in outdated.items()
+            )
+            REPORTER.line(f"   ⬆️  Upgrade ({len(outdated)}): {deltas}")
+            changes += len(outdated)
+
+        extra = plan["extra"][kind]
+        if extra and keep_extras:
+            REPORTER.line(
+                f"   📌 Not in brew.json, kept ({len(extra)}): {', '.join(extra)}"
+            )
+        elif extra:
+            REPORTER.line(f"   🗑️  Remove ({len(extra)}): {', '.join(extra)}")
+            changes += len(extra)
+
+    if not changes:
+        REPORTER.line("   (nothing to do)")
+    return changes
+
+
+def uninstall_packages(packages: List[str], cask: bool = False) -> bool:
+    """
+    🗑️  Drift Remover - Out With What brew.json No Longer Lists!
+
+    ⚡ Removes the whole set with ONE 'brew uninstall a b c ...' call. If it
+       fails (brew aborts the whole batch when one keg is still required),
+       a fresh snapshot shows which packages are really gone.
+
+    🎯 Returns True only if ALL packages were removed
+    """
+    if not packages:
+        return True
+
+    kind = "cask" if cask else "formula"
+    cmd = ["brew", "uninstall", "--cask"] if cask else ["brew", "uninstall"]
+    REPORTER.line(f"\n🗑️  Removing {len(packages)} packages not in brew.json...")
+    REPORTER.line("─" * 30)
+    started = time.perf_counter()
+    result = stream_command(cmd + packages)
+    seconds = time.perf_counter() - started
+
+    failed: List[str] = []
+    if not result or result.returncode != 0:
+        info = get_installed_info()
+        present = (
+            build_installed_index(info)["casks" if cask else "formulae"] if info else {}
+        )
+        failed = [package for package in packages if info is None or package in present]
+
+    for package in packages:
+        status = "failed" if package in failed else "removed"
+        REPORTER.line(
+            f"❌ {package} could not be removed"
+            if package in failed
+            else f"✅ {package} removed"
+        )
+        RUN_REPORT.package(
+            kind, package, status, seconds, action="uninstall", bulk=True
+        )
+
+    REPORTER.event(
+        "summary",
+        kind=kind,
+        action="uninstall",
+        total=len(packages),
+        succeeded=len(packages) - len(failed),
+        failed=len(failed),
+    )
+    return not failed
+
+
+def reconcile(
+    formulae: List[str], casks: List[str], jobs: int = 1, keep_extras: bool = False
+) -> bool:
+    """
+    🔁 Declarative Convergence - Make This Mac Match brew.json!
+
+    ⚡ One pass, minimal brew calls:
+       • ONE snapshot of everything installed ('brew info --installed')
+       • Missing packages installed with one bulk call per type
+       • Outdated packages upgraded with one bulk call per type
+       • Extra leaves removed with one uninstall call per type
+
+    💡 Like 'brew bundle --cleanup', without a brew process per package
+    🎯 Returns True if the machine now matches brew.json
+    """
+    REPORTER.line("\n🔍 Taking a snapshot of installed packages...")
+    with RUN_REPORT.phase("snapshot"):
+        info = get_installed_info()
+    if info is None:
+        REPORTER.line("💥 Cannot reconcile without knowing what is installed")
+        return False
+
+    plan = plan_reconcile(info, formulae, casks)
+    if not display_reconcile_plan(plan, keep_extras):
+        REPORTER.line("\n✨ This Mac already matches brew.json!")
+        return True
+
+    if not get_user_confirmation(
+        "Ready to reconcile this Mac with brew.json", "Apply the plan?"
+    ):
+        REPORTER.line("\n⏭️  Leaving everything as it is")
+        return True
+
+    success = True
+    with RUN_REPORT.phase("install"):
+        if plan["missing"]["formulae"]:
+            success &= install_formulae(
+                plan["missing"]["formulae"], jobs=jobs, bulk=True
+            )
+        if plan["missing"]["casks"]:
+            success &= install_casks(plan["missing"]["casks"], jobs=jobs, bulk=True)
+    with RUN_REPORT.phase("upgrade"):
+        success &= upgrade_packages(plan["outdated"]["formulae"], jobs=jobs)
+        success &= upgrade_packages(plan["outdated"]["casks"], cask=True, jobs=jobs)
+    if not keep_extras:
+        with RUN_REPORT.phase("uninstall"):
+            success &= uninstall_packages(plan["extra"]["formulae"])
+            success &= uninstall_packages(plan["extra"]["casks"], cask=True)
+
+    if success:
+        REPORTER.line("\n🎉 This Mac matches brew.json!")
+    else:
+        REPORTER.line("\n⚠️  Some changes failed - check the output above")
+    return success
+
+
+def get_user_confirmation(
+    intro: str = "Ready to install packages from brew.json",
+    prompt: str = "Continue with installation?",
+) -> bool:
     """
     🤔 Interactive Decision Point - Your Choice Matters!
 
@@ -346,11 +1551,11 @@ def get_user_confirmation() -> bool:
     ✨ Returns True for 'yes', False for anything else
     """
     try:
-        print("\n🤔 Ready to install packages from brew.json")
-        answer = input("   Continue with installation? (y/N): ").strip().lower()
+        REPORTER.line(f"\n🤔 {intro}")
+        answer = REPORTER.ask(f"   {prompt} (y/N): ").strip().lower()
         return answer in ["y", "yes"]
     except KeyboardInterrupt:
-        print("\n\n🛑 Installation cancelled by user")
+        REPORTER.line("\n\n🛑 Installation cancelled by user")
         return False
 
 
@@ -368,17 +1573,19 @@ def display_package_summary(formulae: List[str], casks: List[str]) -> None:
     🎯 Perfect for reviewing large package collections at a glance
     """
     total_packages = len(formulae) + len(casks)
-    print(f"\n📋 Package Summary ({total_packages} total)")
+    REPORTER.line(f"\n📋 Package Summary ({total_packages} total)")
 
     if formulae:
-        print(f"   📦 Command-line tools ({len(formulae)}): {', '.join(formulae[:5])}")
+        REPORTER.line(
+            f"   📦 Command-line tools ({len(formulae)}): {', '.join(formulae[:5])}"
+        )
         if len(formulae) > 5:
-            print(f"      ... and {len(formulae) - 5} more")
+            REPORTER.line(f"      ... and {len(formulae) - 5} more")
 
     if casks:
-        print(f"   📱 Applications ({len(casks)}): {', '.join(casks[:5])}")
+        REPORTER.line(f"   📱 Applications ({len(casks)}): {', '.join(casks[:5])}")
         if len(casks) > 5:
-            print(f"      ... and {len(casks) - 5} more")
+            REPORTER.line(f"      ... and {len(casks) - 5} more")
 
 
 def main() -> None:
@@ -400,40 +1607,151 @@ def main() -> None:
 
     🚀 The complete Mac setup experience in one function!
     """
-    print("🍺 Homebrew Package Manager")
-    print("=" * 40)
+    parser = argparse.ArgumentParser(
+        description="🍺 Homebrew package manager driven by brew.json"
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="install",
+        choices=["install", "upgrade", "reconcile", "prefetch"],
+        help="install (default) the packages in brew.json, upgrade the outdated "
+        "ones, reconcile the machine with it (install, upgrade and remove "
+        "drift), or prefetch them into the download cache without installing",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of parallel download workers (default: 1, fully serial)",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Install all missing packages with one brew call per type",
+    )
+    parser.add_argument(
+        "--keep-extras",
+        action="store_true",
+        help="reconcile: keep installed packages that are not in brew.json",
+    )
+    parser.add_argument(
+        "--update-ttl",
+        type=float,
+        default=60,
+        metavar="MINUTES",
+        help="Skip 'brew update' if it succeeded less than MINUTES ago "
+        "(default: 60, 0 to always update)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        metavar="DIR",
+        help="Download cache shared between machines (sets HOMEBREW_CACHE)",
+    )
+    parser.add_argument(
+        "--mirror",
+        metavar="URL",
+        help="Local mirror to download bottles and casks from, e.g. an HTTP "
+        "server over a directory (sets HOMEBREW_ARTIFACT_DOMAIN)",
+    )
+    output_mode = parser.add_mutually_exclusive_group()
+    output_mode.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Only report errors and warnings (on stderr)",
+    )
+    output_mode.add_argument(
+        "--json",
+        action="store_true",
+        help="Stream NDJSON events (one per package, with timings) instead of text",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        metavar="FILE",
+        help="Write a run report with per-phase and per-package timings "
+        "(CSV if FILE ends in .csv, JSON otherwise)",
+    )
+    parser.add_argument(
+        "--slowest",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Show the N slowest packages at the end (default: 5, 0 to disable)",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.slowest < 0:
+        parser.error("--slowest must not be negative")
+    if args.update_ttl < 0:
+        parser.error("--update-ttl must not be negative")
+    if args.quiet or args.json:
+        REPORTER.configure("quiet" if args.quiet else "json")
+
+    try:
+        provision(args)
+    finally:
+        RUN_REPORT.print_slowest(args.slowest)
+        if args.report:
+            RUN_REPORT.write(args.report)
+
+
+def provision(args: argparse.Namespace) -> None:
+    """
+    🛠️  The Setup Run Itself - Homebrew, brew.json, Install, Cleanup!
+
+    🎯 Runs every step of a provisioning run in order, each one timed as a
+       phase of the run report. Exits early (sys.exit) when it cannot go on -
+       main() still prints the timings and writes the report afterwards.
+    """
+    REPORTER.line("🍺 Homebrew Package Manager")
+    REPORTER.line("=" * 40)
 
     # Check if Homebrew is installed
-    print("\n🔍 Checking Homebrew installation...")
+    REPORTER.line("\n🔍 Checking Homebrew installation...")
     if is_brew_installed():
-        print("✅ Homebrew is already installed")
-        update_brew()
+        REPORTER.line("✅ Homebrew is already installed")
+        with RUN_REPORT.phase("update"):
+            update_brew_if_stale(Path(BREW_STATE_FILE), args.update_ttl)
     else:
         # Install Homebrew
-        if not install_brew():
-            print("💥 Cannot continue without Homebrew - exiting")
+        with RUN_REPORT.phase("install homebrew"):
+            brew_ready = install_brew()
+        if not brew_ready:
+            REPORTER.line("💥 Cannot continue without Homebrew - exiting")
             sys.exit(1)
 
     # Setup environment
-    setup_brew_environment()
+    setup_brew_environment(args.cache_dir, args.mirror)
+    keep_cache = bool(args.cache_dir or args.mirror)
 
     # Check if brew.json exists
-    print("\n📄 Looking for brew.json configuration...")
+    REPORTER.line("\n📄 Looking for brew.json configuration...")
     json_path = Path("brew.json")
 
     if not json_path.exists():
-        print("❌ brew.json not found in current directory")
-        print("🔄 Falling back to package upgrades...")
-        upgrade_brew()
-        cleanup_brew()
-        print("\n💡 Tip: Create a brew.json file to manage your packages!")
+        REPORTER.line("❌ brew.json not found in current directory")
+        if args.command != "install":
+            # Only plain installs fall back to a blanket upgrade
+            REPORTER.line(f"💥 Nothing to {args.command} without brew.json")
+            sys.exit(1)
+        REPORTER.line("🔄 Falling back to package upgrades...")
+        with RUN_REPORT.phase("upgrade"):
+            upgrade_brew()
+        with RUN_REPORT.phase("cleanup"):
+            cleanup_brew(keep_cache)
+        REPORTER.line("\n💡 Tip: Create a brew.json file to manage your packages!")
         sys.exit(1)
 
     # Read brew.json
-    print("✅ Found brew.json - reading configuration...")
+    REPORTER.line("✅ Found brew.json - reading configuration...")
     brew_config = read_brew_json()
     if not brew_config:
-        print("💥 Could not read brew.json - please check the file format")
+        REPORTER.line("💥 Could not read brew.json - please check the file format")
         sys.exit(1)
 
     # Extract packages from JSON
@@ -442,42 +1760,134 @@ def main() -> None:
 
     # Validate package lists
     if not isinstance(formulae, list):
-        print("⚠️  'formulae' should be a list - treating as empty")
+        REPORTER.line("⚠️  'formulae' should be a list - treating as empty")
         formulae = []
     if not isinstance(casks, list):
-        print("⚠️  'casks' should be a list - treating as empty")
+        REPORTER.line("⚠️  'casks' should be a list - treating as empty")
         casks = []
 
     if not formulae and not casks:
-        print("❌ No packages found in brew.json")
-        upgrade_brew()
-        cleanup_brew()
+        REPORTER.line("❌ No packages found in brew.json")
+        if args.command != "install":
+            REPORTER.line(f"💥 Nothing to {args.command} - brew.json lists no packages")
+            sys.exit(1)
+        with RUN_REPORT.phase("upgrade"):
+            upgrade_brew()
+        with RUN_REPORT.phase("cleanup"):
+            cleanup_brew(keep_cache)
         sys.exit(1)
 
     # Display package summary
     display_package_summary(formulae, casks)
 
+    # Fill the (shared) download cache for the next machines - nothing installed
+    if args.command == "prefetch":
+        REPORTER.line("\n📥 Prefetching every package into the download cache...")
+        with RUN_REPORT.phase("prefetch"):
+            formulae_fetched = fetch_packages(formulae, jobs=args.jobs)
+            casks_fetched = fetch_packages(casks, cask=True, jobs=args.jobs)
+        if not (formulae_fetched and casks_fetched):
+            REPORTER.line("\n⚠️  Some downloads failed - check the output above")
+            sys.exit(1)
+        REPORTER.line("\n✨ Download cache is ready!")
+        return
+
+    # Install, upgrade and remove drift in one pass
+    if args.command == "reconcile":
+        reconciled = reconcile(
+            formulae, casks, jobs=args.jobs, keep_extras=args.keep_extras
+        )
+
+        REPORTER.line("\n🧹 Final cleanup...")
+        with RUN_REPORT.phase("cleanup"):
+            cleanup_brew(keep_cache)
+        if not reconciled:
+            sys.exit(1)
+        return
+
+    # Upgrade only the outdated packages brew.json manages
+    if args.command == "upgrade":
+        with RUN_REPORT.phase("outdated"):
+            outdated = get_outdated_packages()
+        if outdated is None:
+            REPORTER.line("💥 Cannot upgrade without knowing what is outdated")
+            sys.exit(1)
+        formulae_outdated = select_outdated(formulae, outdated["formulae"])
+        casks_outdated = select_outdated(casks, outdated["casks"])
+        if not formulae_outdated and not casks_outdated:
+            REPORTER.line("\n✨ Every package in brew.json is up to date!")
+            return
+
+        REPORTER.line(
+            f"\n⬆️  {len(formulae_outdated) + len(casks_outdated)} outdated packages:"
+        )
+        for package, details in {**formulae_outdated, **casks_outdated}.items():
+            REPORTER.line(
+                f"   • {package} {details['installed']} → {details['current']}"
+            )
+        if not get_user_confirmation(
+            "Ready to upgrade outdated packages from brew.json",
+            "Continue with the upgrade?",
+        ):
+            REPORTER.line("\n⏭️  Skipping package upgrades")
+            return
+
+        with RUN_REPORT.phase("upgrade"):
+            formulae_success = upgrade_packages(formulae_outdated, jobs=args.jobs)
+            casks_success = upgrade_packages(casks_outdated, cask=True, jobs=args.jobs)
+        if formulae_success and casks_success:
+            REPORTER.line("\n🎉 All outdated packages upgraded successfully!")
+        else:
+            REPORTER.line("\n⚠️  Some upgrades failed - check the output above")
+
+        REPORTER.line("\n🧹 Final cleanup...")
+        with RUN_REPORT.phase("cleanup"):
+            cleanup_brew(keep_cache)
+        if not (formulae_success and casks_success):
+            sys.exit(1)
+        return
+
     # Get user confirmation
     if get_user_confirmation():
-        print("\n🚀 Starting package installation...")
+        REPORTER.line("\n🚀 Starting package installation...")
+
+        # Query installed packages once so only the missing delta hits brew
+        with RUN_REPORT.phase("snapshot"):
+            index = get_installed_index()
 
         # Install packages
-        formulae_success = install_formulae(formulae)
-        casks_success = install_casks(casks)
+        with RUN_REPORT.phase("formulae"):
+            formulae_success = install_formulae(
+                formulae,
+                jobs=args.jobs,
+                installed=index["formulae"] if index else None,
+                bulk=args.bulk,
+            )
+        with RUN_REPORT.phase("casks"):
+            casks_success = install_casks(
+                casks,
+                jobs=args.jobs,
+                installed=index["casks"] if index else None,
+                bulk=args.bulk,
+            )
 
         if formulae_success and casks_success:
-            print("\n🎉 All packages installed successfully!")
+            REPORTER.line("\n🎉 All packages installed successfully!")
         else:
-            print("\n⚠️  Some packages failed to install - check the output above")
+            REPORTER.line(
+                "\n⚠️  Some packages failed to install - check the output above"
+            )
     else:
-        print("\n⏭️  Skipping package installation")
-        print("🔄 Upgrading existing packages instead...")
-        upgrade_brew()
+        REPORTER.line("\n⏭️  Skipping package installation")
+        REPORTER.line("🔄 Upgrading existing packages instead...")
+        with RUN_REPORT.phase("upgrade"):
+            upgrade_brew()
 
     # Cleanup
-    print("\n🧹 Final cleanup...")
-    cleanup_brew()
-    print("\n✨ All done! Your system is ready to go!")
+    REPORTER.line("\n🧹 Final cleanup...")
+    with RUN_REPORT.phase("cleanup"):
+        cleanup_brew(keep_cache)
+    REPORTER.line("\n✨ All done! Your system is ready to go!")
 
 
 if __name__ == "__main__":
@@ -12,21 +12,38 @@
    • 💾 Automatic backup creation for safety
    • 🎨 Beautiful, colorful output with emoji indicators
    • ⚡ Fast and reliable symlink management
+   • 🗃️  Incremental state cache for near-instant reruns
+   • 👀 Watch mode that repairs links as soon as something breaks them
 
 💡 Usage:
-   /usr/bin/python3 linker.py [install|status|clean]
+   /usr/bin/python3 linker.py [install|status|clean|plan|apply|backups|watch]
    you can pass on alternate config file with option -c | --config
+   bypass the incremental state cache with option --no-cache
 
 🎉 Made with ❤️ for developers who love organized configs! 🎉
 """
 
 import argparse
+import contextlib
+import fnmatch
+import functools
+import hashlib
 import json
+import os
+import platform
+import re
+import select
 import shutil
+import stat
+import struct
 import sys
-from datetime import datetime
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Set, TypedDict
+from typing import Any, Callable, Dict, List, Optional, Set, TypedDict
 
 # 🛡️ SAFETY CONFIGURATION 🛡️
 # Critical paths that should never be symlinked to prevent catastrophic damage
@@ -60,12 +77,114 @@ RISKY_PATHS = {
 }
 
 
+# Directories that are never descended into while looking for managed symlinks
+PRUNED_DIRECTORIES = {
+    ".cache",  # Application caches
+    ".git",  # Repository internals
+    ".npm",  # npm package cache
+    ".cargo",  # Rust toolchain and registry
+    ".rustup",  # Rust toolchains
+    ".Trash",  # macOS trash
+    ".venv",  # Python virtual environments
+    "node_modules",  # JavaScript dependencies
+    "__pycache__",  # Python bytecode
+    "Library",  # macOS Library folder
+}
+
+# Classic dotfile locations (relative to home) always checked by clean
+DEFAULT_SEARCH_LOCATIONS = [
+    ".config",  # Config directory
+    "temp",  # temp directory
+    ".local/share",  # Local share
+    ".local/bin",  # Local binaries
+]
+
+# How deep clean's rescan walks into the target of a "tree" entry
+TREE_SEARCH_DEPTH = 32
+
+# Manifest of every symlink the linker created, kept in the repository
+MANIFEST_FILE_NAME = ".linker-manifest.json"
+MANIFEST_VERSION = 1
+
+# Content-addressed backup store layout (inside each backup directory)
+BACKUP_VERSION = 1
+BACKUP_OBJECTS_DIR = "objects"
+BACKUP_MANIFESTS_DIR = "manifests"
+BACKUP_STAGING_DIR = "staging"  # Replaced directories moved here to be backed up
+BACKUP_ARCHIVES_DIR = "archives"  # Compressed tarballs of old backups
+BACKUP_INDEX_FILE_NAME = "index.jsonl"
+LEGACY_BACKUP_PATTERN = re.compile(r"(.+)_(\d{8}_\d{6})")  # <name>_<timestamp> copies
+BACKUP_INDEX_LOCK = threading.Lock()
+# Compression for archived backups (zstd where tarfile supports it, Python 3.14+)
+ARCHIVE_COMPRESSION = "zst" if "zst" in tarfile.TarFile.OPEN_METH else "gz"
+FICLONE = 0x40049409  # Linux ioctl for copy-on-write file clones
+
+# Watch mode: event coalescing window and polling fallback interval
+WATCH_DEBOUNCE_SECONDS = 0.5
+WATCH_POLL_SECONDS = 2.0
+# inotify event flags (linux/inotify.h)
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+INOTIFY_WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+# Output lines that are problems (kept by --quiet, "message" events with --json)
+PROBLEM_MARKERS = ("❌", "🚫", "🚨", "⚠️")
+# Entry statuses --quiet still reports
+ATTENTION_STATUSES = {"no-source", "missing", "not-a-link", "wrong-link"}
+
+# Fleet status: matrix cell per status, and default workers
+FLEET_STATUS_ICONS = {
+    "linked": "✅",
+    "missing": "❌",
+    "wrong-link": "🔀",
+    "not-a-link": "📄",
+    "no-source": "💀",
+}
+FLEET_DEFAULT_JOBS = 8
+
+# Version of the machine-readable plan written by 'plan'
+PLAN_VERSION = 1
+PLAN_ACTIONS = ["create", "replace", "fix-link", "sync", "skip", "error"]
+
+# State cache written next to the config file
+STATE_FILE_NAME = ".linker-state.json"
+STATE_VERSION = 1
+
+# Compiled config cache written next to the config file
+CONFIG_CACHE_SUFFIX = ".linker-compiled.json"
+CONFIG_CACHE_VERSION = 2
+CONFIG_CACHE_MIN_AGE_NS = 2_000_000_000  # Younger configs are re-hashed
+
+# Config entry templates: ${name} variables and {n} wildcard captures
+CONFIG_VARIABLE_PATTERN = re.compile(r"\$\{(\w+)\}")
+CONFIG_CAPTURE_PATTERN = re.compile(r"\{(\d+)\}")
+
+
 class DotfileEntry(TypedDict):
     """Configuration entry for a dotfile/directory"""
 
     source: str  # Path relative to repo root
     target: str  # Path relative to home directory
-    type: str  # "file" or "directory"
+    type: str  # "file", "directory" or "tree" (real directories, per-file links)
 
 
 class Config(TypedDict):
@@ -74,6 +193,188 @@ class Config(TypedDict):
     dotfiles: List[DotfileEntry]
 
 
+class CompiledEntry(TypedDict):
+    """Per-entry work done once when a config is compiled"""
+
+    source: str  # Absolute source path
+    target: str  # Normalized target path relative to home directory
+    unsafe: str  # Why the target is blocked, or "" if it is safe
+    risky: bool  # Target touches RISKY_PATHS and needs confirmation
+
+
+class CompiledConfig(Config):
+    """Validated configuration with paths and safety checks precomputed"""
+
+    entries: List[CompiledEntry]  # Parallel to dotfiles
+    scanned: Dict[str, int]  # Directories patterns were expanded from -> mtime_ns
+
+
+class ConfigCache(TypedDict):
+    """Compiled config cache, valid while the config file is unchanged"""
+
+    version: int
+    script_dir: str  # Repository directory sources were resolved against
+    size: int  # Config file size when compiled
+    mtime_ns: int  # Config file modification time when compiled
+    digest: str  # SHA-256 of the config file contents
+    checked_ns: int  # When size and mtime_ns were last matched to digest
+    variables: Dict[str, str]  # Template variables the config was expanded with
+    config: CompiledConfig
+
+
+class PlanAction(TypedDict):
+    """A single planned step of an install"""
+
+    action: str  # One of PLAN_ACTIONS
+    entry: DotfileEntry  # The config entry this action belongs to
+    source: str  # Absolute source path
+    target: str  # Absolute target path
+    detail: str  # Existing target kind, link problem or error message
+    fingerprint: Optional[List[int]]  # lstat of the target when planned
+
+
+class Plan(TypedDict):
+    """A machine-readable install plan"""
+
+    version: int
+    created: str  # ISO timestamp
+    config: str  # Config file the plan was made from
+    script_dir: str  # Repository directory
+    home_dir: str  # Home directory the plan targets
+    actions: List[PlanAction]
+
+
+class BackupItem(TypedDict):
+    """A single file, directory or symlink inside a backup"""
+
+    path: str  # Path relative to the backed up root ("." for the root)
+    type: str  # "file", "directory" or "symlink"
+    mode: int  # Permission bits
+    mtime_ns: int  # Modification time
+    size: int  # File size in bytes (0 for non-files)
+    digest: str  # SHA-256 of the contents, names the object (files only)
+    link: str  # Symlink destination (symlinks only)
+
+
+class BackupManifest(TypedDict):
+    """Description of one backup in the content-addressed store"""
+
+    version: int
+    id: str  # Backup name, also the manifest file name
+    original: str  # Absolute path that was backed up (just the name if imported)
+    kind: str  # "file", "directory" or "symlink"
+    created: str  # ISO timestamp
+    size: int  # Total bytes of all files in the backup
+    items: List[BackupItem]  # Root first, parents before children
+
+
+class BackupIndexEntry(TypedDict):
+    """A backup as recorded in the backup index"""
+
+    id: str
+    original: str
+    kind: str
+    created: str
+    size: int
+    files: int  # Number of files in the backup
+    objects: Dict[str, int]  # Digest -> size of every object it uses
+    archive: str  # Tarball path relative to the store, "" if not archived
+
+
+class PendingSwap(TypedDict):
+    """A symlink prepared under a temporary name, waiting to be swapped in"""
+
+    source: str
+    target: str
+    temp: str  # The new link, next to the target
+    aside: str  # Where an existing directory is moved at commit time, or ""
+    backup_after: bool  # Back up the moved-aside directory after the swap
+
+
+class LinkState(TypedDict):
+    """Last verified state of a correctly linked entry"""
+
+    key: str  # Hash of the entry's configuration
+    source_ino: int  # Inode of the source when verified
+    source_mtime_ns: int  # Modification time of the source when verified
+    link: str  # Raw readlink() value of the target when verified
+
+
+class TreeState(LinkState):
+    """Last verified state of a correctly mirrored tree entry (link is "")"""
+
+    directories: Dict[str, List[int]]  # Relative dir -> [source, target] mtime_ns
+
+
+class TreeDiff(TypedDict):
+    """What it takes to mirror a source tree into its target"""
+
+    files: int  # Files (and symlinks) in the source tree
+    directories: Dict[str, List[int]]  # Relative dir -> [source, target] mtime_ns
+    create: List[str]  # Target directories that are missing or not directories
+    link: List[str]  # Files whose link is missing or wrong
+    stale: List[str]  # Links into the source tree whose source file is gone
+
+
+class Reporter:
+    """
+    Where command output goes
+
+    Every line a command prints goes through line(), per-entry outcomes
+    through event(). The mode picks the sink:
+      pretty - the usual emoji lines on stdout
+      quiet  - only errors and warnings (and entries that need attention), on stderr
+      json   - NDJSON on stdout: one object per event, with "elapsed" seconds;
+               errors and warnings become "message" events
+    """
+
+    def __init__(self, mode: str = "pretty") -> None:
+        self.mode: str = mode
+        self.started: float = time.perf_counter()
+        self.lock: threading.Lock = threading.Lock()
+
+    def configure(self, mode: str) -> None:
+        """Switch to another output mode and restart the clock"""
+        self.mode = mode
+        self.started = time.perf_counter()
+
+    def line(self, text: str = "") -> None:
+        """A line of human readable output"""
+        if self.mode == "pretty":
+            print(text)
+        elif text.lstrip().startswith(PROBLEM_MARKERS):
+            if self.mode == "quiet":
+                print(text.strip(), file=sys.stderr)
+            else:
+                level = "warning" if text.lstrip().startswith("⚠️") else "error"
+                self.event("message", level=level, text=text.strip())
+
+    def event(self, event_type: str, **fields: Any) -> None:
+        """A structured event, such as the outcome of one entry"""
+        if self.mode == "json":
+            record = {
+                "event": event_type,
+                "elapsed": round(time.perf_counter() - self.started, 6),
+                **fields,
+            }
+            with self.lock:
+                sys.stdout.write(json.dumps(record) + "\n")
+                sys.stdout.flush()
+        elif self.mode == "quiet" and fields.get("status") in ATTENTION_STATUSES:
+            print(f"⚠️  {fields.get('target', '')}: {fields['status']}", file=sys.stderr)
+
+    def ask(self, prompt: str) -> str:
+        """Ask the user a question, keeping stdout clean outside pretty mode"""
+        if self.mode == "pretty":
+            return input(prompt)
+        print(prompt, end="", file=sys.stderr, flush=True)
+        return input()
+
+
+# The reporter every command writes to (configured by main)
+REPORTER = Reporter()
+
+
 def is_safe_target(target_path: str) -> tuple[bool, str]:
     """
     Check if target path is safe to symlink
@@ -128,34 +429,36 @@ def confirm_risky_operation(target_path: str, source_path: str) -> bool:
             risky_found.append(part)
 
     if risky_found:
-        print("\n🚨 RISKY OPERATION DETECTED 🚨")
-        print(f"Target: {target_path}")
-        print(f"Source: {source_path}")
-        print(f"Risky components: {', '.join(risky_found)}")
-        print(
+        REPORTER.line("\n🚨 RISKY OPERATION DETECTED 🚨")
+        REPORTER.line(f"Target: {target_path}")
+        REPORTER.line(f"Source: {source_path}")
+        REPORTER.line(f"Risky components: {', '.join(risky_found)}")
+        REPORTER.line(
             "\n⚠️  This operation could affect important system/application directories!"
         )
-        print("⚠️  Make sure this is exactly what you want to do.")
-        print("\n💡 Consider using a more specific path instead.")
+        REPORTER.line("⚠️  Make sure this is exactly what you want to do.")
+        REPORTER.line("\n💡 Consider using a more specific path instead.")
 
         while True:
-            response = input(
+            response = REPORTER.ask(
                 "\n🤔 Are you absolutely sure you want to proceed? (type 'YES' in capitals): "
             ).strip()
             if response == "YES":
-                print("✅ Proceeding with risky operation...")
+                REPORTER.line("✅ Proceeding with risky operation...")
                 return True
             elif response.lower() in ["no", "n", "quit", "exit", ""]:
-                print("🛑 Operation cancelled for safety")
+                REPORTER.line("🛑 Operation cancelled for safety")
                 return False
             else:
-                print("❌ Please type 'YES' in capitals to confirm, or 'no' to cancel")
+                REPORTER.line(
+                    "❌ Please type 'YES' in capitals to confirm, or 'no' to cancel"
+                )
 
     return True
 
 
 def validate_config_safety(
-    config: Config, script_dir: Path, home_dir: Path, dry_run: bool = False
+    config: CompiledConfig, script_dir: Path, home_dir: Path, dry_run: bool = False
 ) -> bool:
     """
     Validate all entries in config for safety before processing
@@ -169,535 +472,3550 @@ def validate_config_safety(
     Returns:
         bool: True if all entries are safe or approved, False otherwise
     """
-    print("🛡️ Running safety validation on configuration...")
+    REPORTER.line("🛡️ Running safety validation on configuration...")
 
     unsafe_entries = []
     risky_entries = []
 
-    for i, entry in enumerate(config["dotfiles"]):
-        target_path = entry["target"]
-        source_path = entry["source"]
-
-        # Check if target is safe
-        is_safe, reason = is_safe_target(target_path)
-
-        if not is_safe:
-            unsafe_entries.append((i, entry, reason))
+    for i, (entry, compiled) in enumerate(zip(config["dotfiles"], config["entries"])):
+        # Target safety was classified when the config was compiled
+        if compiled["unsafe"]:
+            unsafe_entries.append((i, entry, compiled["unsafe"]))
             continue
 
         # Check if source exists and is accessible
-        full_source_path = script_dir / source_path
-        if not full_source_path.exists():
-            print(f"⚠️  Warning: Source doesn't exist: {source_path}")
+        if not os.path.exists(compiled["source"]):
+            REPORTER.line(f"⚠️  Warning: Source doesn't exist: {entry['source']}")
             continue
 
         # Check for risky operations
-        if any(risky in target_path for risky in RISKY_PATHS):
+        if compiled["risky"]:
             risky_entries.append((i, entry))
 
     # Handle unsafe entries (these are blocked completely)
     if unsafe_entries:
-        print("\n❌ UNSAFE CONFIGURATION DETECTED ❌")
-        print("The following entries are blocked for your safety:\n")
+        REPORTER.line("\n❌ UNSAFE CONFIGURATION DETECTED ❌")
+        REPORTER.line("The following entries are blocked for your safety:\n")
 
         for i, entry, reason in unsafe_entries:
-            print(f"  Entry #{i + 1}:")
-            print(f"    Source: {entry['source']}")
-            print(f"    Target: {entry['target']}")
-            print(f"    Reason: {reason}")
-            print()
+            REPORTER.line(f"  Entry #{i + 1}:")
+            REPORTER.line(f"    Source: {entry['source']}")
+            REPORTER.line(f"    Target: {entry['target']}")
+            REPORTER.line(f"    Reason: {reason}")
+            REPORTER.line()
 
-        print(
+        REPORTER.line(
             "🚫 Please fix these entries in your configuration file before proceeding."
         )
         return False
 
     # Handle risky entries (these need confirmation)
     if risky_entries and not dry_run:
-        print("\n⚠️  RISKY OPERATIONS DETECTED ⚠️")
-        print("The following entries require your confirmation:\n")
+        REPORTER.line("\n⚠️  RISKY OPERATIONS DETECTED ⚠️")
+        REPORTER.line("The following entries require your confirmation:\n")
 
         for i, entry in risky_entries:
-            print(f"  Entry #{i + 1}: {entry['source']} -> {entry['target']}")
+            REPORTER.line(f"  Entry #{i + 1}: {entry['source']} -> {entry['target']}")
 
-        print()
+        REPORTER.line()
 
         for i, entry in risky_entries:
-            print(f"🔍 Reviewing entry #{i + 1}:")
+            REPORTER.line(f"🔍 Reviewing entry #{i + 1}:")
             if not confirm_risky_operation(entry["target"], entry["source"]):
                 return False
 
     if risky_entries:
-        print(
+        REPORTER.line(
             f"✅ Safety validation completed - {len(risky_entries)} risky operations approved"
         )
     else:
-        print("✅ Safety validation completed - all entries look safe")
+        REPORTER.line("✅ Safety validation completed - all entries look safe")
 
     return True
 
 
-def create_backup(file_path: Path, backup_dir: Path) -> bool:
-    """Create a timestamped backup of a file or directory"""
+def hash_file(file_path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
+
+def clone_file(source: Path, destination: Path) -> None:
+    """
+    Copy a file's contents to a new file
+
+    Uses a copy-on-write clone (reflink) where the filesystem supports it,
+    so no data is duplicated, and falls back to a regular copy.
+    """
     try:
-        # Create backup directory if it doesn't exist
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        if sys.platform.startswith("linux"):
+            import fcntl
 
-        # Generate timestamped backup name
-        timestamp: str = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name: str = f"{file_path.name}_{timestamp}"
-        backup_path: Path = backup_dir / backup_name
+            with open(source, "rb") as src, open(destination, "xb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        if sys.platform == "darwin":
+            import ctypes
 
-        if file_path.is_file() or file_path.is_symlink():
-            shutil.copy2(file_path, backup_path, follow_symlinks=False)
-        elif file_path.is_dir():
-            shutil.copytree(file_path, backup_path, symlinks=True)
-        else:
-            print(f"  ⚠️  Warning: Cannot backup unknown file type: {file_path}")
-            return False
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.clonefile(os.fsencode(source), os.fsencode(destination), 0) == 0:
+                return
+    except (OSError, AttributeError):
+        pass
 
-        print(f"  💾 Created backup: {backup_path}")
-        return True
+    shutil.copyfile(source, destination)
 
-    except OSError as e:
-        print(f"  ❌ Error creating backup for {file_path}: {e}")
-        return False
 
+def store_object(
+    file_path: Path, backup_dir: Path, consume: bool = False
+) -> tuple[str, int]:
+    """
+    Add a file's contents to the backup object store
 
-def create_symlink(source_path: Path, target_path: Path, backup_dir: Path) -> bool:
-    """Create a symlink from source to target, backing up existing files"""
+    Returns (digest, bytes newly stored); contents already in the store
+    are not stored again. With consume=True the file itself is hard-linked
+    into the store instead of copied; only pass it for files that are
+    about to be deleted and have no other links.
+    """
+    digest: str = hash_file(file_path)
+    object_path: Path = backup_dir / BACKUP_OBJECTS_DIR / digest[:2] / digest
+    if object_path.exists():
+        return digest, 0
+
+    object_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = object_path.with_name(
+        f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
     try:
-        # Create parent directories if they don't exist
-        target_path.parent.mkdir(parents=True, exist_ok=True)
+        if consume:
+            os.link(file_path, tmp_path)
+        else:
+            clone_file(file_path, tmp_path)
+            os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, object_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return digest, object_path.stat().st_size
 
-        # Backup existing file/link if it exists
-        if target_path.exists() or target_path.is_symlink():
-            if target_path.is_symlink():
-                print(f"  🔗 Found existing symlink: {target_path}")
-            elif target_path.is_dir():
-                print(f"  📁 Found existing dir: {target_path}")
-            else:
-                print(f"  📄 Found existing file: {target_path}")
 
-            # Create backup before removing
-            if not create_backup(target_path, backup_dir):
-                print(
-                    f"  🚫 Error: Could not create backup for {target_path}, skipping symlink creation"
-                )
-                return False
+def snapshot_path(
+    file_path: Path,
+    backup_dir: Path,
+    log: Callable[[str], None] = REPORTER.line,
+    consume: bool = False,
+) -> tuple[List[BackupItem], int]:
+    """
+    Store everything at file_path in the object store
 
-            # Remove after successful backup
-            target_path.unlink() if (
-                target_path.is_file() or target_path.is_symlink()
-            ) else shutil.rmtree(target_path)
+    Returns the backup items (root first) and the number of bytes newly
+    added to the store. Symlinks are recorded, never followed. consume is
+    passed on to store_object for files without other hard links.
+    """
+    items: List[BackupItem] = []
+    stored: int = 0
+    pending: List[tuple[Path, str]] = [(file_path, ".")]
+
+    while pending:
+        path, relative = pending.pop()
+        path_stat = os.lstat(path)
+        item: BackupItem = {
+            "path": relative,
+            "type": "",
+            "mode": stat.S_IMODE(path_stat.st_mode),
+            "mtime_ns": path_stat.st_mtime_ns,
+            "size": 0,
+            "digest": "",
+            "link": "",
+        }
+
+        if stat.S_ISLNK(path_stat.st_mode):
+            item["type"] = "symlink"
+            item["link"] = os.readlink(path)
+        elif stat.S_ISREG(path_stat.st_mode):
+            item["type"] = "file"
+            item["size"] = path_stat.st_size
+            item["digest"], new_bytes = store_object(
+                path, backup_dir, consume and path_stat.st_nlink == 1
+            )
+            stored += new_bytes
+        elif stat.S_ISDIR(path_stat.st_mode):
+            item["type"] = "directory"
+            with os.scandir(path) as entries:
+                for child in sorted(
+                    entries, key=lambda child: child.name, reverse=True
+                ):
+                    child_relative = (
+                        child.name if relative == "." else f"{relative}/{child.name}"
+                    )
+                    pending.append((Path(child.path), child_relative))
+        else:
+            log(f"  ⚠️  Warning: Skipping special file in backup: {path}")
+            continue
 
-        # Create the symlink
-        target_path.symlink_to(source_path)
-        print(f"  ✅ Created symlink: {target_path} -> {source_path}")
-        return True
+        items.append(item)
 
-    except OSError as e:
-        print(f"  ❌ Error creating symlink {target_path} -> {source_path}: {e}")
-        return False
+    return items, stored
 
 
-def load_config(config_path: Path) -> Config:
-    """Load configuration from JSON file"""
+def load_backup(manifest_path: Path) -> Optional[BackupManifest]:
+    """Load a backup manifest, None if unreadable"""
     try:
-        with config_path.open("r", encoding="utf-8") as f:
-            config_data: Config = json.load(f)
+        with manifest_path.open("r", encoding="utf-8") as f:
+            backup: BackupManifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return backup if backup.get("version") == BACKUP_VERSION else None
 
-        # Validate structure
-        if "dotfiles" not in config_data:
-            raise KeyError("'dotfiles' key missing from config")
 
-        if not isinstance(config_data["dotfiles"], list):
-            raise TypeError(
-                "values for 'dotfiles' key must be a list [{source, target, type}]"
-            )
+def reserve_backup_id(backup_dir: Path, name: str) -> tuple[str, Path]:
+    """
+    Pick a backup ID no other backup uses and claim its manifest file
+
+    IDs are <name>_YYYYMMDD_HHMMSS_ffffff; the manifest is created with
+    O_EXCL, so even concurrent backups of the same name never collide.
+    """
+    manifest_dir: Path = backup_dir / BACKUP_MANIFESTS_DIR
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    timestamp: str = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    attempt: int = 0
+    while True:
+        backup_id = f"{name}_{timestamp}" + (f"_{attempt}" if attempt else "")
+        manifest_path = manifest_dir / f"{backup_id}.json"
+        archived = backup_dir / BACKUP_ARCHIVES_DIR / f"{backup_id}.json"
+        if not archived.exists():
+            try:
+                os.close(
+                    os.open(manifest_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+                )
+                return backup_id, manifest_path
+            except FileExistsError:
+                pass
+        attempt += 1
+
+
+def get_index_entry(backup: BackupManifest, archive: str = "") -> BackupIndexEntry:
+    """Summary of a backup for the backup index"""
+    objects: Dict[str, int] = {}
+    if not archive:
+        for item in backup["items"]:
+            if item["type"] == "file":
+                objects[item["digest"]] = item["size"]
+
+    return {
+        "id": backup["id"],
+        "original": backup["original"],
+        "kind": backup["kind"],
+        "created": backup["created"],
+        "size": backup["size"],
+        "files": sum(1 for item in backup["items"] if item["type"] == "file"),
+        "objects": objects,
+        "archive": archive,
+    }
+
+
+def rebuild_backup_index(backup_dir: Path) -> Dict[str, BackupIndexEntry]:
+    """Recreate the backup index from the manifests on disk"""
+    index: Dict[str, BackupIndexEntry] = {}
+    for folder, archived in [
+        (BACKUP_MANIFESTS_DIR, False),
+        (BACKUP_ARCHIVES_DIR, True),
+    ]:
+        try:
+            manifest_paths = sorted((backup_dir / folder).glob("*.json"))
+        except OSError:
+            continue
+        for manifest_path in manifest_paths:
+            backup = load_backup(manifest_path)
+            if backup is None:
+                continue
+            archive = ""
+            if archived:
+                archive = (
+                    f"{BACKUP_ARCHIVES_DIR}/{backup['id']}.tar.{ARCHIVE_COMPRESSION}"
+                )
+                for compression in ["zst", "gz"]:
+                    candidate = manifest_path.with_name(
+                        f"{backup['id']}.tar.{compression}"
+                    )
+                    if candidate.exists():
+                        archive = f"{BACKUP_ARCHIVES_DIR}/{candidate.name}"
+            index[backup["id"]] = get_index_entry(backup, archive)
+    return index
 
-        # Validate each dotfile entry
-        for i, entry in enumerate(config_data["dotfiles"]):
-            if not isinstance(entry, dict):
-                raise TypeError(f"dotfiles[{i}] must be a dictionary")
 
-            required_keys: list[str] = ["source", "target", "type"]
-            for key in required_keys:
-                if key not in entry:
-                    raise KeyError(f"dotfiles[{i}] missing required key: '{key}'")
-                if not isinstance(entry[key], str):  # type: ignore[literal-required]
-                    raise TypeError(f"dotfiles[{i}]['{key}'] must be a string")
+def save_backup_index(backup_dir: Path, index: Dict[str, BackupIndexEntry]) -> None:
+    """Rewrite the backup index with one line per backup"""
+    index_path: Path = backup_dir / BACKUP_INDEX_FILE_NAME
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            for entry in index.values():
+                f.write(json.dumps({"op": "add", **entry}) + "\n")
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        REPORTER.line(f"⚠️  Warning: Could not write {index_path}: {e}")
 
-            if entry["type"] not in ["file", "directory"]:
-                raise ValueError(
-                    f"dotfiles[{i}]['type'] must be 'file' or 'directory', got: {entry['type']}"
-                )
 
-        return config_data
+def load_backup_index(backup_dir: Path) -> Dict[str, BackupIndexEntry]:
+    """
+    Load the backup index, an append-only log of added and removed backups
 
-    except FileNotFoundError:
-        print(f"❌ Error: Config file not found: {config_path}")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"❌ Error: Invalid JSON in config file: {e}")
-        sys.exit(1)
-    except (KeyError, TypeError, ValueError) as e:
-        print(f"❌ Error: Invalid config structure: {e}")
-        sys.exit(1)
+    Replaying the log is cheap compared to reading every manifest; it is
+    rebuilt from the manifests if missing or unreadable.
+    """
+    index: Dict[str, BackupIndexEntry] = {}
+    index_path: Path = backup_dir / BACKUP_INDEX_FILE_NAME
+    if not index_path.exists():
+        return rebuild_backup_index(backup_dir) if backup_dir.exists() else index
 
+    try:
+        with index_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record.pop("op") == "add":
+                    index[record["id"]] = record
+                else:
+                    index.pop(record["id"], None)
+    except (OSError, ValueError, KeyError):
+        return rebuild_backup_index(backup_dir)
+    return index
+
+
+def record_backup(backup_dir: Path, backup: BackupManifest) -> None:
+    """Append a new backup to the backup index"""
+    index_path: Path = backup_dir / BACKUP_INDEX_FILE_NAME
+    with BACKUP_INDEX_LOCK:
+        if not index_path.exists():
+            # First indexed backup: pick up the existing manifests (incl. this one)
+            save_backup_index(backup_dir, rebuild_backup_index(backup_dir))
+            return
+        try:
+            with index_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"op": "add", **get_index_entry(backup)}) + "\n")
+        except OSError as e:
+            REPORTER.line(f"⚠️  Warning: Could not update {index_path}: {e}")
 
-def discover_managed_symlinks(script_dir: Path, home_dir: Path) -> Set[Path]:
-    """Discover all symlinks in home directory that point to files in script_dir"""
-    managed_links: Set[Path] = set()
 
-    def check_symlink(path: Path) -> None:
-        """Check if a symlink points to our managed directory"""
-        if path.is_symlink():
-            try:
-                target: Path = path.resolve()
-                # Check if the target is within our script directory
-                if script_dir in target.parents or target == script_dir:
-                    managed_links.add(path)
-            except OSError:
-                # Broken symlink, ignore
-                pass
+def import_legacy_backups(backup_dir: Path) -> int:
+    """
+    Move plain <name>_<timestamp> copies made by older versions into the store
 
-    # Check common locations for dotfiles
-    locations_to_check: List[Path] = [
-        home_dir,  # Root level dotfiles
-        home_dir / ".config",  # Config directory
-        home_dir / "temp",  # temp directory
-        home_dir / ".local" / "share",  # Local share
-        home_dir / ".local" / "bin",  # Local binaries
-    ]
+    Each becomes a regular backup (the copy is hard-linked into the store,
+    then deleted), so it is listed, restorable and counted by prune. Its
+    original location was never recorded, so only the name is known and
+    restoring it needs --to. Returns the number of copies imported.
+    """
+    try:
+        candidates = sorted(os.scandir(backup_dir), key=lambda item: item.name)
+    except OSError:
+        return 0
 
-    for location in locations_to_check:
-        if not location.exists():
+    imported: int = 0
+    for item in candidates:
+        match = LEGACY_BACKUP_PATTERN.fullmatch(item.name)
+        if match is None:
             continue
-
-        # Check direct children for symlinks
+        path = Path(item.path)
+        manifest_path = backup_dir / BACKUP_MANIFESTS_DIR / f"{item.name}.json"
         try:
-            for item in location.iterdir():
-                if item.is_symlink():
-                    check_symlink(item)
-        except PermissionError:
-            # Skip directories we can't read
+            created = datetime.strptime(match.group(2), "%Y%m%d_%H%M%S")
+            if item.is_symlink():
+                kind = "symlink"
+            elif item.is_dir():
+                kind = "directory"
+            else:
+                kind = "file"
+
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            os.close(
+                os.open(manifest_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            )
+            items, _ = snapshot_path(path, backup_dir, consume=True)
+            backup: BackupManifest = {
+                "version": BACKUP_VERSION,
+                "id": item.name,
+                "original": match.group(1),
+                "kind": kind,
+                "created": created.isoformat(),
+                "size": sum(entry["size"] for entry in items),
+                "items": items,
+            }
+            with manifest_path.open("w", encoding="utf-8") as f:
+                json.dump(backup, f, indent=2)
+        except FileExistsError:
+            REPORTER.line(f"⚠️  Warning: Backup {item.name} exists twice, left as is")
+            continue
+        except (OSError, ValueError) as e:
+            REPORTER.line(f"⚠️  Warning: Could not import old backup {path}: {e}")
+            with contextlib.suppress(OSError):
+                manifest_path.unlink()
             continue
 
-    return managed_links
+        record_backup(backup_dir, backup)
+        try:
+            remove_path(path)
+        except OSError as e:
+            REPORTER.line(f"⚠️  Warning: Could not remove imported copy {path}: {e}")
+        imported += 1
 
+    if imported:
+        REPORTER.line(f"📦 Imported {imported} old backups into {backup_dir}")
+    return imported
 
-def clean_orphaned_symlinks(config_path: Path, script_dir: Path, home_dir: Path) -> int:
-    """Remove symlinks that are no longer in the config file"""
-    print()
-    print("🧹" + "=" * 73 + "🧹")
-    print("🎯 \033[32mCLEANING ORPHANED SYMLINKS\033[0m 🎯")
-    print(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
-    print(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
-    print(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
-    print("🧹" + "=" * 73 + "🧹")
-    print()
 
-    # Load current configuration
-    config: Config = load_config(config_path)
+def list_backups(backup_dir: Path) -> List[BackupIndexEntry]:
+    """All backups in a backup store, oldest first"""
+    index = load_backup_index(backup_dir)
+    return sorted(index.values(), key=lambda entry: (entry["created"], entry["id"]))
 
-    # Get currently configured targets
-    configured_targets: Set[Path] = set()
-    for entry in config["dotfiles"]:
-        target_path: Path = home_dir / entry["target"]
-        configured_targets.add(target_path)
 
-    # Discover all managed symlinks
-    print("🔍 Discovering managed symlinks...")
-    managed_links: Set[Path] = discover_managed_symlinks(script_dir, home_dir)
+def restore_backup(backup_dir: Path, backup: BackupManifest, destination: Path) -> bool:
+    """Recreate a backup at destination (which must not exist yet)"""
+    if destination.exists() or destination.is_symlink():
+        REPORTER.line(f"❌ Error: Destination already exists: {destination}")
+        REPORTER.line(
+            "💡 Move it out of the way first, or restore somewhere else with --to"
+        )
+        return False
 
-    if not managed_links:
-        print("✨ No managed symlinks found.")
-        return 0
+    try:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        for item in backup["items"]:
+            path = destination if item["path"] == "." else destination / item["path"]
+            if item["type"] == "directory":
+                path.mkdir()
+            elif item["type"] == "symlink":
+                os.symlink(item["link"], path)
+            else:
+                object_path = backup_dir / BACKUP_OBJECTS_DIR / item["digest"][:2]
+                clone_file(object_path / item["digest"], path)
+                os.chmod(path, item["mode"])
+                os.utime(path, ns=(item["mtime_ns"], item["mtime_ns"]))
+
+        # Directory metadata last (deepest first), after their contents
+        for item in reversed(backup["items"]):
+            if item["type"] == "directory":
+                path = (
+                    destination if item["path"] == "." else destination / item["path"]
+                )
+                os.chmod(path, item["mode"])
+                os.utime(path, ns=(item["mtime_ns"], item["mtime_ns"]))
 
-    print(f"📊 Found {len(managed_links)} managed symlinks")
-    print()
+    except OSError as e:
+        REPORTER.line(f"❌ Error restoring {backup['id']} to {destination}: {e}")
+        return False
 
-    # Find orphaned symlinks (managed but not in config)
-    orphaned_links: Set[Path] = managed_links - configured_targets
+    REPORTER.line(f"✅ Restored {backup['id']} to {destination}")
+    return True
 
-    if not orphaned_links:
-        print(
-            "🎉 No orphaned symlinks found. All managed symlinks are in the configuration!"
-        )
-        return 0
 
-    print(f"🗑️  Found {len(orphaned_links)} orphaned symlinks:")
-    for link in sorted(orphaned_links):
-        try:
-            target = link.resolve()
-            relative_target = target.relative_to(script_dir)
-            print(f"  🔗 {link} -> {relative_target}")
-        except (OSError, ValueError):
-            print(f"  💀 {link} -> <broken link>")
+def restore_archive(archive_path: Path, backup_id: str, destination: Path) -> bool:
+    """Recreate an archived (compressed) backup at destination"""
+    if destination.exists() or destination.is_symlink():
+        REPORTER.line(f"❌ Error: Destination already exists: {destination}")
+        REPORTER.line(
+            "💡 Move it out of the way first, or restore somewhere else with --to"
+        )
+        return False
 
-    print()
+    # Extract next to the destination, then move the root into place
+    extract_dir = destination.parent / f".{backup_id}.restore"
+    try:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with tarfile.open(archive_path, "r:*") as archive:
+            if hasattr(tarfile, "tar_filter"):
+                archive.extractall(extract_dir, filter="tar")
+            else:
+                archive.extractall(extract_dir)
+        os.rename(extract_dir / backup_id, destination)
+        extract_dir.rmdir()
+    except (OSError, tarfile.TarError) as e:
+        REPORTER.line(f"❌ Error restoring {backup_id} to {destination}: {e}")
+        shutil.rmtree(extract_dir, ignore_errors=True)
+        return False
 
-    # Setup backup directory
-    backup_dir: Path = script_dir / "backups" / "removed_symlinks"
+    REPORTER.line(f"✅ Restored {backup_id} to {destination}")
+    return True
 
-    # Remove orphaned symlinks
-    removed_count: int = 0
-    for link_path in sorted(orphaned_links):
-        print(f"🗑️  Removing orphaned symlink: {link_path}")
 
-        # Create backup first
-        if create_backup(link_path, backup_dir):
-            try:
-                link_path.unlink()
-                print(f"  ✅ Removed: {link_path}")
-                removed_count += 1
-            except OSError as e:
-                print(f"  ❌ Error removing {link_path}: {e}")
-        else:
-            print(f"  ⏭️  Skipped removal due to backup failure: {link_path}")
+def archive_backup(backup_dir: Path, backup: BackupManifest) -> str:
+    """
+    Pack a backup into a compressed tarball under archives/
 
-        print()
+    The tarball holds the backed up tree itself (readable with plain tar);
+    the manifest moves next to it. Returns the archive path relative to
+    backup_dir.
+    """
+    archive_dir: Path = backup_dir / BACKUP_ARCHIVES_DIR
+    archive_dir.mkdir(exist_ok=True)
+    archive_name = f"{backup['id']}.tar.{ARCHIVE_COMPRESSION}"
+    tmp_path = archive_dir / f"{archive_name}.{os.getpid()}.tmp"
 
-    print(
-        f"📊 Summary: Removed {removed_count}/{len(orphaned_links)} orphaned symlinks"
+    try:
+        with tarfile.open(tmp_path, f"w:{ARCHIVE_COMPRESSION}") as archive:
+            for item in backup["items"]:
+                info = tarfile.TarInfo(
+                    backup["id"]
+                    if item["path"] == "."
+                    else f"{backup['id']}/{item['path']}"
+                )
+                info.mode = item["mode"]
+                info.mtime = item["mtime_ns"] // 1_000_000_000
+                if item["type"] == "directory":
+                    info.type = tarfile.DIRTYPE
+                    archive.addfile(info)
+                elif item["type"] == "symlink":
+                    info.type = tarfile.SYMTYPE
+                    info.linkname = item["link"]
+                    archive.addfile(info)
+                else:
+                    info.size = item["size"]
+                    object_path = backup_dir / BACKUP_OBJECTS_DIR / item["digest"][:2]
+                    with open(object_path / item["digest"], "rb") as f:
+                        archive.addfile(info, f)
+        os.replace(tmp_path, archive_dir / archive_name)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    os.replace(
+        backup_dir / BACKUP_MANIFESTS_DIR / f"{backup['id']}.json",
+        archive_dir / f"{backup['id']}.json",
     )
+    return f"{BACKUP_ARCHIVES_DIR}/{archive_name}"
+
+
+def get_disk_usage(
+    backup_dir: Path, index: Dict[str, BackupIndexEntry]
+) -> Dict[str, int]:
+    """Bytes each stored object or archive takes (shared objects counted once)"""
+    usage: Dict[str, int] = {}
+    for entry in index.values():
+        usage.update(entry["objects"])
+        if entry["archive"]:
+            with contextlib.suppress(OSError):
+                usage[entry["archive"]] = (backup_dir / entry["archive"]).stat().st_size
+    return usage
+
+
+def select_backups_to_prune(
+    index: Dict[str, BackupIndexEntry],
+    usage: Dict[str, int],
+    keep_last: Optional[int] = None,
+    max_age_days: Optional[float] = None,
+    max_size: Optional[int] = None,
+) -> Set[str]:
+    """
+    Backup IDs a retention policy removes
 
-    if removed_count == len(orphaned_links):
-        print("🎉 All orphaned symlinks removed successfully!")
-        return 0
-    else:
-        print("⚠️  Some orphaned symlinks could not be removed.")
-        return 1
-
+    Keeps the newest keep_last backups of every target, drops backups
+    older than max_age_days, then the oldest ones until the store fits in
+    max_size bytes. The newest backup of a target is always kept.
+    """
+    by_target: Dict[str, List[BackupIndexEntry]] = {}
+    for entry in sorted(
+        index.values(), key=lambda entry: (entry["created"], entry["id"])
+    ):
+        by_target.setdefault(entry["original"], []).append(entry)
+
+    removed: Set[str] = set()
+    newest: Set[str] = {entries[-1]["id"] for entries in by_target.values()}
+
+    if keep_last is not None:
+        for entries in by_target.values():
+            removed.update(entry["id"] for entry in entries[: -keep_last or None])
+
+    if max_age_days is not None:
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        removed.update(
+            entry["id"] for entry in index.values() if entry["created"] < cutoff
+        )
 
-def check_status(config_path: Path, script_dir: Path, home_dir: Path) -> int:
-    """Check status of all dotfile links"""
-    print()
-    print("📊" + "=" * 73 + "📊")
-    print("🎯 \033[32mDOTFILE STATUS CHECK\033[0m 🎯")
-    print(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
-    print(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
-    print(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
-    print("📊" + "=" * 73 + "📊")
-    print()
+    removed -= newest
+
+    if max_size is not None:
+        # Count references so shared objects are only freed with their last user
+        references: Dict[str, int] = {}
+        for backup_id, entry in index.items():
+            if backup_id not in removed:
+                for key in [*entry["objects"], entry["archive"]]:
+                    references[key] = references.get(key, 0) + 1
+        total = sum(usage.get(key, 0) for key in references)
+
+        for entry in sorted(
+            index.values(), key=lambda entry: (entry["created"], entry["id"])
+        ):
+            if total <= max_size:
+                break
+            if entry["id"] in removed or entry["id"] in newest:
+                continue
+            removed.add(entry["id"])
+            for key in [*entry["objects"], entry["archive"]]:
+                references[key] -= 1
+                if not references[key]:
+                    total -= usage.get(key, 0)
+
+    return removed
+
+
+def prune_backups(
+    backup_dir: Path,
+    keep_last: Optional[int] = None,
+    max_age_days: Optional[float] = None,
+    max_size: Optional[int] = None,
+    compress_after_days: Optional[float] = None,
+    dry_run: bool = False,
+) -> int:
+    """
+    Apply a retention policy to one backup store
 
-    # Load configuration
-    config: Config = load_config(config_path)
+    Works from the backup index alone (manifests are only read for the
+    backups being archived) and frees only the objects whose last backup
+    goes, so the cost follows what is pruned rather than the history.
+    """
+    index = load_backup_index(backup_dir)
+    if not index:
+        return 0
 
-    print(
-        f"{'📄 Name':<25} {'🏷️  Type':<10} {'📦 Source':<8} {'🎯 Target':<8} {'🔗 Linked':<8} {'✅ Correct':<8}"
-    )
-    print("─" * 75)
+    usage = get_disk_usage(backup_dir, index)
+    removed = select_backups_to_prune(index, usage, keep_last, max_age_days, max_size)
+
+    archived: Set[str] = set()
+    if compress_after_days is not None:
+        cutoff = (datetime.now() - timedelta(days=compress_after_days)).isoformat()
+        archived = {
+            backup_id
+            for backup_id, entry in index.items()
+            if backup_id not in removed
+            and not entry["archive"]
+            and entry["created"] < cutoff
+        }
+
+    if not removed and not archived:
+        return 0
 
-    all_correct: bool = True
+    REPORTER.line(f"\n💾 \033[32mPruning {backup_dir}\033[0m")
+    failed: int = 0
+    freed: int = 0
 
-    for entry in config["dotfiles"]:
-        source_path: Path = script_dir / entry["source"]
-        target_path: Path = home_dir / entry["target"]
+    for backup_id in sorted(archived):
+        if dry_run:
+            REPORTER.line(f"  🔍 Would archive: {backup_id}")
+            continue
+        backup = load_backup(backup_dir / BACKUP_MANIFESTS_DIR / f"{backup_id}.json")
+        try:
+            if backup is None:
+                raise OSError("manifest missing or unreadable")
+            index[backup_id] = get_index_entry(
+                backup, archive_backup(backup_dir, backup)
+            )
+            REPORTER.line(
+                f"  🗜️  Archived: {backup_id} -> {index[backup_id]['archive']}"
+            )
+        except (OSError, tarfile.TarError) as e:
+            REPORTER.line(f"  ❌ Error archiving {backup_id}: {e}")
+            archived.discard(backup_id)
+            failed += 1
 
-        # Check source exists
-        source_exists: bool = source_path.exists()
+    for backup_id in sorted(removed):
+        if dry_run:
+            REPORTER.line(f"  🔍 Would remove: {backup_id}")
+            continue
+        entry = index.pop(backup_id)
+        paths = [
+            backup_dir / BACKUP_MANIFESTS_DIR / f"{backup_id}.json",
+            backup_dir / BACKUP_ARCHIVES_DIR / f"{backup_id}.json",
+        ]
+        if entry["archive"]:
+            paths.append(backup_dir / entry["archive"])
+            freed += usage.get(entry["archive"], 0)
+        for path in paths:
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+        REPORTER.line(f"  🗑️  Removed: {backup_id}")
 
-        # Check target exists
-        target_exists: bool = target_path.exists()
+    if dry_run:
+        REPORTER.line(
+            f"📊 Summary: Would remove {len(removed)} and archive {len(archived)} backups"
+        )
+        return 0
 
-        # Check if target is a symlink
-        is_symlink: bool = target_path.is_symlink()
+    # Free objects no remaining (unarchived) backup refers to
+    live: Set[str] = set()
+    for entry in index.values():
+        live.update(entry["objects"])
+    for digest in set(usage) - live:
+        if "/" in digest:
+            continue  # Archive files, removed above
+        object_path = backup_dir / BACKUP_OBJECTS_DIR / digest[:2] / digest
+        with contextlib.suppress(FileNotFoundError):
+            object_path.unlink()
+            freed += usage[digest]
+        with contextlib.suppress(OSError):
+            object_path.parent.rmdir()  # Only succeeds once the shard is empty
+
+    with BACKUP_INDEX_LOCK:
+        save_backup_index(backup_dir, index)
+
+    REPORTER.line(
+        f"📊 Summary: Removed {len(removed)}, archived {len(archived)} backups, "
+        f"freed {format_size(freed)}"
+    )
+    return failed
 
-        # Check if symlink points to correct location
-        is_correct: bool = False
-        if is_symlink:
-            try:
-                is_correct = target_path.resolve() == source_path.resolve()
-            except OSError:
-                is_correct = False
 
-        # Determine overall status
-        if not source_exists:
-            all_correct = False
-        elif not target_exists:
-            all_correct = False
-        elif not is_symlink:
-            all_correct = False
-        elif not is_correct:
-            all_correct = False
+def parse_size(size: str) -> int:
+    """Parse a byte count like 500M or 2G"""
+    units = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+    number, unit = size.upper().rstrip("B"), ""
+    if number and number[-1] in units:
+        number, unit = number[:-1], number[-1]
+    try:
+        return int(float(number) * units[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {size!r}") from None
 
-        # Display status with colorful indicators
-        print(
-            f"{entry['source']:<25} {entry['type']:<10} "
-            f"{'✅' if source_exists else '❌':<8} "
-            f"{'✅' if target_exists else '❌':<8} "
-            f"{'✅' if is_symlink else '❌':<8} "
-            f"{'✅' if is_correct else '❌':<8}"
-        )
 
-    print()
-    if all_correct:
-        print("🎉 All dotfiles are correctly linked! You're all set! 🎉")
-        return 0
-    else:
-        print("⚠️  Some dotfiles are not correctly linked. Run 'install' to fix them!")
-        return 1
+def format_size(size: float) -> str:
+    """Human readable byte count"""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
 
 
-def install_dotfiles(
-    config_path: Path,
+def manage_backups(
     script_dir: Path,
-    home_dir: Path,
-    backup_dir: Path,
+    arguments: List[str],
+    destination: Optional[Path] = None,
+    retention: Optional[Dict[str, Any]] = None,
     dry_run: bool = False,
 ) -> int:
-    """install dotfiles"""
-    print()
-    if dry_run:
-        print("🔍" + "=" * 71 + "🔍")
-        print("🎯 \033[32mDRY RUN - PREVIEW MODE\033[0m 🎯")
-    else:
-        print("🚀" + "=" * 73 + "🚀")
-        print("⚡ \033[32mINSTALLING DOTFILES\033[0m ⚡")
-    print(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
-    print(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
-    print(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
+    """List, restore or prune backups ('backups list|restore ID|prune')"""
+    backup_dirs: List[Path] = [
+        script_dir / "backups" / "removed_entity",
+        script_dir / "backups" / "removed_symlinks",
+    ]
+    action: str = arguments[0] if arguments else "list"
+    retention = retention or {}
+
+    # Copies made before the object store become regular backups first
+    if not dry_run:
+        for backup_dir in backup_dirs:
+            import_legacy_backups(backup_dir)
+
+    if action == "list" and len(arguments) <= 1:
+        found: bool = False
+        for backup_dir in backup_dirs:
+            backups = list_backups(backup_dir)
+            if not backups:
+                continue
+            found = True
+            REPORTER.line(f"\n💾 \033[32mBackups in {backup_dir}\033[0m")
+            REPORTER.line(
+                f"{'🆔 Backup':<40} {'🏷️  Kind':<20} {'📄 Files':>8} {'📦 Size':>10}  🎯 Original"
+            )
+            REPORTER.line("─" * 110)
+            for backup in backups:
+                kind = f"{backup['kind']}{' (archived)' if backup['archive'] else ''}"
+                REPORTER.line(
+                    f"{backup['id']:<40} {kind:<20} {backup['files']:>8} "
+                    f"{format_size(backup['size']):>10}  {backup['original']}"
+                )
+        if not found:
+            REPORTER.line("✨ No backups found.")
+        return 0
+
+    if action == "restore" and len(arguments) == 2:
+        for backup_dir in backup_dirs:
+            entry = load_backup_index(backup_dir).get(arguments[1])
+            if entry is None:
+                continue
+            if destination is None and not Path(entry["original"]).is_absolute():
+                REPORTER.line(
+                    f"❌ Error: Where {arguments[1]} came from is unknown "
+                    "(made by an older version)"
+                )
+                REPORTER.line("💡 Restore it with --to PATH")
+                return 1
+            target = destination or Path(entry["original"])
+            if entry["archive"]:
+                restored = restore_archive(
+                    backup_dir / entry["archive"], entry["id"], target
+                )
+                return 0 if restored else 1
+            backup = load_backup(
+                backup_dir / BACKUP_MANIFESTS_DIR / f"{arguments[1]}.json"
+            )
+            if backup is not None:
+                return 0 if restore_backup(backup_dir, backup, target) else 1
+        REPORTER.line(f"❌ Error: Backup not found: {arguments[1]}")
+        REPORTER.line("💡 Run 'linker.py backups list' to see available backups")
+        return 1
+
+    if action == "prune" and len(arguments) == 1:
+        if not any(value is not None for value in retention.values()):
+            REPORTER.line(
+                "❌ Give a retention policy: --keep-last, --max-age, --max-size "
+                "and/or --compress-after"
+            )
+            return 1
+        failed = sum(
+            prune_backups(backup_dir, dry_run=dry_run, **retention)
+            for backup_dir in backup_dirs
+        )
+        return 1 if failed else 0
+
+    REPORTER.line(
+        "❌ Usage: linker.py backups [list | restore BACKUP_ID [--to PATH] | prune]"
+    )
+    return 1
+
+
+def create_backup(
+    file_path: Path,
+    backup_dir: Path,
+    log: Callable[[str], None] = REPORTER.line,
+    move: bool = False,
+    original: Optional[Path] = None,
+) -> bool:
+    """
+    Create a timestamped backup of a file or directory
+
+    Backups live in a content-addressed store inside backup_dir: every
+    unique file is stored once under objects/ and each backup is a
+    manifest under manifests/ describing the tree.
+
+    With move=True, files on the same filesystem as backup_dir (same
+    st_dev) are hard-linked into the store instead of copied; only use it
+    for data already moved away from its live path, since an in-place edit
+    of a hard-linked file would change the stored object. Live files are
+    cloned (reflinked where possible). original is the path recorded in
+    the manifest when file_path is a staged copy.
+    """
+    original = original or file_path
+    manifest_path: Optional[Path] = None
+
+    try:
+        if file_path.is_symlink():
+            kind = "symlink"
+        elif file_path.is_file():
+            kind = "file"
+        elif file_path.is_dir():
+            kind = "directory"
+        else:
+            log(f"  ⚠️  Warning: Cannot backup unknown file type: {file_path}")
+            return False
+
+        # Claim a unique, timestamped backup name
+        backup_id, manifest_path = reserve_backup_id(backup_dir, original.name)
+
+        consume: bool = move and (
+            os.lstat(file_path).st_dev == os.stat(backup_dir).st_dev
+        )
+        items, stored = snapshot_path(file_path, backup_dir, log, consume)
+        backup: BackupManifest = {
+            "version": BACKUP_VERSION,
+            "id": backup_id,
+            "original": str(original),
+            "kind": kind,
+            "created": datetime.now().isoformat(),
+            "size": sum(item["size"] for item in items),
+            "items": items,
+        }
+
+        with manifest_path.open("w", encoding="utf-8") as f:
+            json.dump(backup, f, indent=2)
+
+    except OSError as e:
+        log(f"  ❌ Error creating backup for {original}: {e}")
+        if manifest_path is not None:
+            with contextlib.suppress(OSError):
+                manifest_path.unlink()
+        return False
+
+    record_backup(backup_dir, backup)
+    log(
+        f"  💾 {'Moved' if consume else 'Created'} backup: {backup_id} "
+        f"({format_size(stored)} new of {format_size(backup['size'])})"
+    )
+    return True
+
+
+def remove_path(path: Path) -> None:
+    """Delete a file, symlink or directory tree"""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def prepare_symlink(
+    source_path: Path,
+    target_path: Path,
+    backup_dir: Path,
+    log: Callable[[str], None] = REPORTER.line,
+) -> Optional[PendingSwap]:
+    """
+    Get everything ready to swap a symlink in place of target_path
+
+    Creates the new link under a temporary name next to the target and
+    backs up existing files and symlinks, which stay in place until
+    commit_symlink. Existing directories are moved aside at commit time
+    (a directory can't be renamed over); on the backup's filesystem they
+    are backed up after the swap by finish_symlink, elsewhere right here.
+    Returns None (and changes nothing) if a backup fails.
+    """
+    unique: str = f"{os.getpid()}-{threading.get_ident()}"
+    swap: PendingSwap = {
+        "source": str(source_path),
+        "target": str(target_path),
+        "temp": str(target_path.with_name(f".{target_path.name}.linker-new-{unique}")),
+        "aside": "",
+        "backup_after": False,
+    }
+
+    try:
+        # Create parent directories if they don't exist
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Backup existing file/link if it exists
+        if target_path.exists() or target_path.is_symlink():
+            if target_path.is_symlink():
+                log(f"  🔗 Found existing symlink: {target_path}")
+            elif target_path.is_dir():
+                log(f"  📁 Found existing dir: {target_path}")
+            else:
+                log(f"  📄 Found existing file: {target_path}")
+
+            backup_dir.mkdir(parents=True, exist_ok=True)
+            same_device: bool = (
+                os.lstat(target_path).st_dev == os.stat(backup_dir).st_dev
+            )
+
+            if target_path.is_dir() and not target_path.is_symlink() and same_device:
+                # One rename at commit time, backed up from staging afterwards
+                staging_dir = backup_dir / BACKUP_STAGING_DIR
+                staging_dir.mkdir(exist_ok=True)
+                swap["aside"] = str(staging_dir / f"{target_path.name}.{unique}")
+                swap["backup_after"] = True
+            elif not create_backup(target_path, backup_dir, log):
+                log(
+                    f"  🚫 Error: Could not create backup for {target_path}, skipping symlink creation"
+                )
+                return None
+            elif target_path.is_dir() and not target_path.is_symlink():
+                swap["aside"] = str(
+                    target_path.with_name(f".{target_path.name}.linker-old-{unique}")
+                )
+
+        os.symlink(source_path, swap["temp"])
+        return swap
+
+    except OSError as e:
+        log(f"  ❌ Error creating symlink {target_path} -> {source_path}: {e}")
+        return None
+
+
+def commit_symlink(
+    swap: PendingSwap, log: Callable[[str], None] = REPORTER.line
+) -> bool:
+    """
+    Swap a prepared symlink into place with an atomic rename
+
+    Files and symlinks are replaced in a single os.replace, so the target
+    never goes missing; directories are renamed aside immediately before.
+    """
+    try:
+        if swap["aside"]:
+            os.rename(swap["target"], swap["aside"])
+        try:
+            os.replace(swap["temp"], swap["target"])
+        except OSError:
+            if swap["aside"]:
+                os.rename(swap["aside"], swap["target"])
+            raise
+        return True
+
+    except OSError as e:
+        log(f"  ❌ Error creating symlink {swap['target']} -> {swap['source']}: {e}")
+        with contextlib.suppress(OSError):
+            os.unlink(swap["temp"])
+        return False
+
+
+def finish_symlink(
+    swap: PendingSwap,
+    backup_dir: Path,
+    manifest: Optional[Dict[str, str]] = None,
+    log: Callable[[str], None] = REPORTER.line,
+) -> bool:
+    """
+    Back up and remove what a committed swap moved aside
+
+    If a moved-aside directory can't be backed up, the swap is rolled back
+    so nothing is ever deleted without a backup.
+    """
+    target_path: Path = Path(swap["target"])
+    aside: Optional[Path] = Path(swap["aside"]) if swap["aside"] else None
+
+    if aside is not None and swap["backup_after"]:
+        if not create_backup(aside, backup_dir, log, move=True, original=target_path):
+            log(f"  🚫 Error: Could not create backup for {target_path}, restoring it")
+            try:
+                os.rename(target_path, swap["temp"])
+                os.rename(aside, target_path)
+                os.unlink(swap["temp"])
+            except OSError as e:
+                log(f"  🚨 Could not move {aside} back to {target_path}: {e}")
+            return False
+
+    if aside is not None:
+        # Everything worth keeping is in the backup store by now
+        try:
+            remove_path(aside)
+        except OSError as e:
+            log(f"  ⚠️  Warning: Could not remove old copy {aside}: {e}")
+
+    if manifest is not None:
+        manifest[swap["target"]] = swap["source"]
+    log(f"  ✅ Created symlink: {swap['target']} -> {swap['source']}")
+    return True
+
+
+def create_symlink(
+    source_path: Path,
+    target_path: Path,
+    backup_dir: Path,
+    manifest: Optional[Dict[str, str]] = None,
+    log: Callable[[str], None] = REPORTER.line,
+) -> bool:
+    """
+    Create a symlink from source to target, backing up existing files
+
+    The link is created under a temporary name and renamed over the
+    target, so the target path is never missing. The new link is recorded
+    in manifest (if given) so clean can find it later without walking the
+    home directory.
+    """
+    swap: Optional[PendingSwap] = prepare_symlink(
+        source_path, target_path, backup_dir, log
+    )
+    if swap is None or not commit_symlink(swap, log):
+        return False
+    return finish_symlink(swap, backup_dir, manifest, log)
+
+
+def validate_config_structure(config_data: Config) -> None:
+    """Raise KeyError, TypeError or ValueError if the config is malformed"""
+    if "dotfiles" not in config_data:
+        raise KeyError("'dotfiles' key missing from config")
+
+    if not isinstance(config_data["dotfiles"], list):
+        raise TypeError(
+            "values for 'dotfiles' key must be a list [{source, target, type}]"
+        )
+
+    # Validate each dotfile entry
+    for i, entry in enumerate(config_data["dotfiles"]):
+        if not isinstance(entry, dict):
+            raise TypeError(f"dotfiles[{i}] must be a dictionary")
+
+        required_keys: list[str] = ["source", "target", "type"]
+        for key in required_keys:
+            if key not in entry:
+                raise KeyError(f"dotfiles[{i}] missing required key: '{key}'")
+            if not isinstance(entry[key], str):  # type: ignore[literal-required]
+                raise TypeError(f"dotfiles[{i}]['{key}'] must be a string")
+
+        if entry["type"] not in ["file", "directory", "tree"]:
+            raise ValueError(
+                f"dotfiles[{i}]['type'] must be 'file', 'directory' or 'tree', got: {entry['type']}"
+            )
+
+
+def get_config_variables() -> Dict[str, str]:
+    """Values for ${name} references in config entries"""
+    return {
+        "os": platform.system().lower(),  # linux, darwin, ...
+        "host": platform.node().split(".")[0],  # Short host name
+    }
+
+
+def substitute_variables(value: str, variables: Dict[str, str], where: str) -> str:
+    """Replace ${name} references, raising ValueError for unknown names"""
+
+    def replace(match: "re.Match[str]") -> str:
+        name = match.group(1)
+        if name not in variables:
+            raise ValueError(
+                f"{where} uses unknown variable '${{{name}}}' "
+                f"(known: {', '.join(sorted(variables))})"
+            )
+        return variables[name]
+
+    return CONFIG_VARIABLE_PATTERN.sub(replace, value)
+
+
+def is_glob_pattern(part: str) -> bool:
+    """Whether a path component contains glob wildcards"""
+    return any(char in part for char in "*?[")
+
+
+def expand_config(
+    config: Config, script_dir: Path, variables: Dict[str, str]
+) -> tuple[Config, Dict[str, int]]:
+    """
+    Expand ${name} variables and glob patterns into concrete entries
+
+    A source such as "tools/*/config" becomes one entry per match, with
+    {1}, {2}, ... in the target replaced by what each wildcard matched.
+    Every repository directory the patterns need is listed once with
+    os.scandir, however many patterns share it, and matches are sorted so
+    expansion is deterministic; plain entries are never checked for
+    existence.
+
+    Returns:
+        tuple: (expanded config, listed directory -> mtime_ns or -1 if missing)
+    """
+    listings: Dict[str, Dict[str, bool]] = {}
+    scanned: Dict[str, int] = {}
+
+    def list_directory(directory: Path) -> Dict[str, bool]:
+        key = str(directory)
+        if key not in listings:
+            try:
+                scanned[key] = directory.stat().st_mtime_ns
+                with os.scandir(directory) as it:
+                    listings[key] = {
+                        item.name: item.is_dir()
+                        for item in sorted(it, key=lambda item: item.name)
+                    }
+            except OSError:
+                scanned[key] = -1
+                listings[key] = {}
+        return listings[key]
+
+    dotfiles: List[DotfileEntry] = []
+    for i, entry in enumerate(config["dotfiles"]):
+        source = substitute_variables(
+            entry["source"], variables, f"dotfiles[{i}]['source']"
+        )
+        target = substitute_variables(
+            entry["target"], variables, f"dotfiles[{i}]['target']"
+        )
+        parts = Path(source).parts
+        wildcards = sum(1 for part in parts if is_glob_pattern(part))
+
+        for reference in CONFIG_CAPTURE_PATTERN.findall(target):
+            if not 1 <= int(reference) <= wildcards:
+                raise ValueError(
+                    f"dotfiles[{i}]['target'] refers to {{{reference}}} but the "
+                    f"source has {wildcards} wildcard component(s)"
+                )
+
+        if not wildcards:
+            dotfiles.append({**entry, "source": source, "target": target})
+            continue
+
+        # Walk the pattern one component at a time: (path so far, captures)
+        matches: List[tuple[Path, List[str]]] = [(Path(), [])]
+        for index, part in enumerate(parts):
+            want_dir = index < len(parts) - 1 or entry["type"] != "file"
+            next_matches: List[tuple[Path, List[str]]] = []
+
+            for relative, captures in matches:
+                if is_glob_pattern(part):
+                    for name, is_dir in list_directory(script_dir / relative).items():
+                        if (
+                            is_dir == want_dir
+                            and fnmatch.fnmatchcase(name, part)
+                            and (part.startswith(".") or not name.startswith("."))
+                        ):
+                            next_matches.append((relative / name, [*captures, name]))
+                elif not captures:
+                    # Literal prefix before the first wildcard
+                    next_matches.append((relative / part, captures))
+                elif list_directory(script_dir / relative).get(part) == want_dir:
+                    next_matches.append((relative / part, captures))
+
+            matches = next_matches
+
+        targets: Set[str] = set()
+        for relative, captures in matches:
+            expanded_target = CONFIG_CAPTURE_PATTERN.sub(
+                lambda match: captures[int(match.group(1)) - 1], target
+            )
+            if expanded_target in targets:
+                raise ValueError(
+                    f"dotfiles[{i}] links several sources to {expanded_target} - "
+                    "use {1}, {2}, ... in the target"
+                )
+            targets.add(expanded_target)
+            dotfiles.append(
+                {**entry, "source": relative.as_posix(), "target": expanded_target}
+            )
+
+    return {"dotfiles": dotfiles}, scanned
+
+
+def is_expansion_current(cache: ConfigCache, variables: Dict[str, str]) -> bool:
+    """Whether a cached expansion still matches the variables and repository"""
+    if cache["variables"] != variables:
+        return False
+
+    for directory, mtime_ns in cache["config"]["scanned"].items():
+        try:
+            current = os.stat(directory).st_mtime_ns
+        except OSError:
+            current = -1
+        if current != mtime_ns:
+            return False
+    return True
+
+
+def compile_config(
+    config: Config, script_dir: Path, scanned: Optional[Dict[str, int]] = None
+) -> CompiledConfig:
+    """Precompute absolute paths and safety classification for every entry"""
+    entries: List[CompiledEntry] = []
+    for entry in config["dotfiles"]:
+        is_safe, reason = is_safe_target(entry["target"])
+        entries.append(
+            {
+                "source": str(script_dir / entry["source"]),
+                "target": Path(entry["target"]).as_posix(),
+                "unsafe": "" if is_safe else reason,
+                "risky": any(risky in entry["target"] for risky in RISKY_PATHS),
+            }
+        )
+    return {
+        "dotfiles": config["dotfiles"],
+        "entries": entries,
+        "scanned": scanned or {},
+    }
+
+
+def get_config_cache_path(config_path: Path) -> Path:
+    """Return the compiled config cache location for a config file"""
+    return config_path.with_name(f".{config_path.stem}{CONFIG_CACHE_SUFFIX}")
+
+
+def load_config_cache(cache_path: Path, script_dir: Path) -> Optional[ConfigCache]:
+    """Load the compiled config cache, None if unusable for this repository"""
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != CONFIG_CACHE_VERSION
+        or data.get("script_dir") != str(script_dir)
+    ):
+        return None
+
+    config = data.get("config")
+    if (
+        not isinstance(config, dict)
+        or not isinstance(config.get("dotfiles"), list)
+        or not isinstance(config.get("entries"), list)
+        or not isinstance(config.get("scanned"), dict)
+        or not isinstance(data.get("variables"), dict)
+        or len(config["dotfiles"]) != len(config["entries"])
+    ):
+        return None
+    return data  # type: ignore[return-value]
+
+
+def load_config(
+    config_path: Path, script_dir: Path, use_cache: bool = True
+) -> CompiledConfig:
+    """
+    Load configuration from JSON file
+
+    Variables and glob patterns are expanded into concrete entries. The
+    validated, compiled result is cached next to the config file and
+    reused while the file's size and mtime (or, failing that, its content
+    hash) and the directories patterns were expanded from are unchanged,
+    so repeated runs skip parsing, expansion and validation.
+    """
+    cache_path: Path = get_config_cache_path(config_path)
+    variables: Dict[str, str] = get_config_variables()
+    try:
+        config_stat = config_path.stat()
+        cache: Optional[ConfigCache] = (
+            load_config_cache(cache_path, script_dir) if use_cache else None
+        )
+        if cache is not None and not is_expansion_current(cache, variables):
+            cache = None
+
+        # Fast path: same size and mtime, and the mtimes had settled when checked
+        if (
+            cache is not None
+            and cache["size"] == config_stat.st_size
+            and cache["mtime_ns"] == config_stat.st_mtime_ns
+            and cache["checked_ns"]
+            - max([cache["mtime_ns"], *cache["config"]["scanned"].values()])
+            >= CONFIG_CACHE_MIN_AGE_NS
+        ):
+            return cache["config"]
+
+        data: bytes = config_path.read_bytes()
+        digest: str = hashlib.sha256(data).hexdigest()
+
+        if cache is not None and cache["digest"] == digest:
+            compiled: CompiledConfig = cache["config"]
+        else:
+            config_data: Config = json.loads(data.decode("utf-8"))
+            validate_config_structure(config_data)
+            expanded, scanned = expand_config(config_data, script_dir, variables)
+            compiled = compile_config(expanded, script_dir, scanned)
+
+        if use_cache:
+            write_json_atomic(
+                cache_path,
+                {
+                    "version": CONFIG_CACHE_VERSION,
+                    "script_dir": str(script_dir),
+                    "size": len(data),
+                    "mtime_ns": config_stat.st_mtime_ns,
+                    "digest": digest,
+                    "checked_ns": time.time_ns(),
+                    "variables": variables,
+                    "config": compiled,
+                },
+            )
+        return compiled
+
+    except FileNotFoundError:
+        REPORTER.line(f"❌ Error: Config file not found: {config_path}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        REPORTER.line(f"❌ Error: Invalid JSON in config file: {e}")
+        sys.exit(1)
+    except (KeyError, TypeError, ValueError) as e:
+        REPORTER.line(f"❌ Error: Invalid config structure: {e}")
+        sys.exit(1)
+
+
+def get_state_path(config_path: Path) -> Path:
+    """Return the state cache location for a config file"""
+    return config_path.parent / STATE_FILE_NAME
+
+
+def load_state(state_path: Path) -> Dict[str, LinkState]:
+    """Load the link state cache, returning an empty cache if unusable"""
+    try:
+        with state_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+        return {}
+
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def write_json_atomic(path: Path, data: object) -> bool:
+    """Write JSON to a temporary file and rename it over path"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        REPORTER.line(f"⚠️  Warning: Could not write {path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def save_state(state_path: Path, state: Dict[str, LinkState]) -> None:
+    """Atomically write the link state cache"""
+    write_json_atomic(state_path, {"version": STATE_VERSION, "entries": state})
+
+
+def get_manifest_path(script_dir: Path) -> Path:
+    """Return the managed link manifest location for a repository"""
+    return script_dir / MANIFEST_FILE_NAME
+
+
+def load_manifest(manifest_path: Path) -> Optional[Dict[str, str]]:
+    """Load the managed link manifest (link path -> source), None if missing"""
+    try:
+        with manifest_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+
+    links = data.get("links")
+    return links if isinstance(links, dict) else None
+
+
+def load_scanned_homes(manifest_path: Path) -> Set[str]:
+    """Home directories whose links the manifest was seeded with by a walk"""
+    try:
+        with manifest_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return set()
+
+    scanned = data.get("scanned") if isinstance(data, dict) else None
+    return set(scanned) if isinstance(scanned, list) else set()
+
+
+def save_manifest(
+    manifest_path: Path, manifest: Dict[str, str], scanned_home: Optional[Path] = None
+) -> None:
+    """Atomically write the managed link manifest, keeping its scanned homes"""
+    scanned: Set[str] = load_scanned_homes(manifest_path)
+    if scanned_home is not None:
+        scanned.add(str(scanned_home))
+    write_json_atomic(
+        manifest_path,
+        {
+            "version": MANIFEST_VERSION,
+            "scanned": sorted(scanned),
+            "links": dict(sorted(manifest.items())),
+        },
+    )
+
+
+def get_entry_key(entry: DotfileEntry, source_path: Path) -> str:
+    """Hash the parts of an entry that determine what its link should be"""
+    payload = json.dumps([str(source_path), entry["type"]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_cached_link_valid(
+    state: Dict[str, LinkState],
+    entry: DotfileEntry,
+    source_path: Path,
+    target_path: Path,
+) -> bool:
+    """
+    Verify an entry against the state cache
+
+    Costs one stat of the source plus one lstat and one readlink of the
+    target, and never resolves either path.
+    """
+    cached = state.get(str(target_path))
+    if not cached or cached.get("key") != get_entry_key(entry, source_path):
+        return False
+
+    try:
+        source_stat = os.stat(source_path)
+        if not stat.S_ISLNK(os.lstat(target_path).st_mode):
+            return False
+        link = os.readlink(target_path)
+    except OSError:
+        return False
+
+    is_dir = stat.S_ISDIR(source_stat.st_mode)
+    return (
+        is_dir == (entry["type"] == "directory")
+        and source_stat.st_ino == cached.get("source_ino")
+        and source_stat.st_mtime_ns == cached.get("source_mtime_ns")
+        and link == cached.get("link")
+    )
+
+
+def record_link_state(
+    state: Dict[str, LinkState],
+    entry: DotfileEntry,
+    source_path: Path,
+    target_path: Path,
+) -> None:
+    """Remember an entry that was just verified as correctly linked"""
+    try:
+        source_stat = os.stat(source_path)
+        link = os.readlink(target_path)
+    except OSError:
+        state.pop(str(target_path), None)
+        return
+
+    state[str(target_path)] = {
+        "key": get_entry_key(entry, source_path),
+        "source_ino": source_stat.st_ino,
+        "source_mtime_ns": source_stat.st_mtime_ns,
+        "link": link,
+    }
+
+
+@functools.cache
+def resolve_cached(path: str) -> str:
+    """Resolve a repository path once and share the result across all entries"""
+    return os.path.realpath(path)
+
+
+def get_link_destination(link_path: Path) -> Optional[str]:
+    """
+    Read a symlink's destination with a single readlink
+
+    Returns the lexically normalized destination for absolute links, or None
+    for relative links and links containing '..', whose meaning depends on
+    the symlinks along the way and therefore needs a full resolve.
+    """
+    link = os.readlink(link_path)
+    if not os.path.isabs(link) or ".." in Path(link).parts:
+        return None
+    return os.path.normpath(link)
+
+
+def link_points_to(link_path: Path, source_path: Path) -> bool:
+    """Check if a symlink points to source_path, resolving only when unavoidable"""
+    destination = get_link_destination(link_path)
+    if destination is not None and destination == os.path.normpath(source_path):
+        return True
+
+    # Relative or chained link (or a mismatch): compare fully resolved paths
+    return os.path.realpath(link_path) == resolve_cached(str(source_path))
+
+
+def is_link_within(link_path: Path, directory: Path) -> bool:
+    """Check if a symlink points into directory, resolving only when unavoidable"""
+    root = resolve_cached(str(directory))
+    destination = get_link_destination(link_path)
+    if destination is not None and (
+        destination == root or destination.startswith(root + os.sep)
+    ):
+        return True
+
+    resolved = os.path.realpath(link_path)
+    return resolved == root or resolved.startswith(root + os.sep)
+
+
+def diff_tree(source_path: Path, target_path: Path) -> TreeDiff:
+    """
+    Compare a source tree with its mirror under target_path in one walk
+
+    Every source directory and its target counterpart is listed once with
+    os.scandir; beyond that only target symlinks cost a readlink. Symlinks
+    in the source are mirrored as files, never followed. Directory mtimes
+    are taken before listing, so a change during the walk invalidates them.
+    """
+    diff: TreeDiff = {
+        "files": 0,
+        "directories": {},
+        "create": [],
+        "link": [],
+        "stale": [],
+    }
+
+    try:
+        target_is_dir: bool = stat.S_ISDIR(os.lstat(target_path).st_mode)
+    except OSError:
+        target_is_dir = False
+
+    # (relative directory, whether its target is a real directory)
+    pending: List[tuple[str, bool]] = [("", target_is_dir)]
+    while pending:
+        relative, is_dir = pending.pop()
+        source_dir: Path = source_path / relative
+        target_dir: Path = target_path / relative
+
+        source_mtime: int = os.stat(source_dir).st_mtime_ns
+        with os.scandir(source_dir) as it:
+            source_items: Dict[str, bool] = {
+                item.name: item.is_dir(follow_symlinks=False) for item in it
+            }
+
+        target_items: Dict[str, os.DirEntry] = {}
+        target_mtime: int = -1
+        if is_dir:
+            try:
+                target_mtime = os.lstat(target_dir).st_mtime_ns
+                with os.scandir(target_dir) as it:
+                    target_items = {item.name: item for item in it}
+            except OSError:
+                is_dir = False
+        if not is_dir:
+            diff["create"].append(relative)
+        diff["directories"][relative] = [source_mtime, target_mtime]
+
+        for name in sorted(source_items, reverse=True):
+            child: str = os.path.join(relative, name) if relative else name
+            existing = target_items.get(name)
+            if source_items[name]:
+                pending.append(
+                    (
+                        child,
+                        existing is not None and existing.is_dir(follow_symlinks=False),
+                    )
+                )
+                continue
+
+            diff["files"] += 1
+            try:
+                if existing is None or not existing.is_symlink():
+                    diff["link"].append(child)
+                elif not link_points_to(Path(existing.path), source_dir / name):
+                    diff["link"].append(child)
+            except OSError:
+                diff["link"].append(child)
+
+        for name, existing in target_items.items():
+            if name in source_items or not existing.is_symlink():
+                continue
+            try:
+                if is_link_within(Path(existing.path), source_path):
+                    diff["stale"].append(
+                        os.path.join(relative, name) if relative else name
+                    )
+            except OSError:
+                pass
+
+    diff["link"].sort()
+    diff["stale"].sort()
+    return diff
+
+
+def is_tree_synced(diff: TreeDiff) -> bool:
+    """Whether a tree diff has nothing left to do"""
+    return not (diff["create"] or diff["link"] or diff["stale"])
+
+
+def is_cached_tree_valid(
+    state: Dict[str, LinkState],
+    entry: DotfileEntry,
+    source_path: Path,
+    target_path: Path,
+) -> bool:
+    """
+    Verify a tree entry against the state cache
+
+    Adding, removing or replacing anything in a directory changes its
+    mtime, so two stats per directory (none per file) prove that nothing
+    in either tree changed since the last full verification.
+    """
+    cached = state.get(str(target_path))
+    if (
+        not cached
+        or cached.get("key") != get_entry_key(entry, source_path)
+        or not isinstance(cached.get("directories"), dict)
+    ):
+        return False
+
+    try:
+        for relative, (source_mtime, target_mtime) in cached["directories"].items():  # type: ignore[typeddict-item]
+            if (
+                os.stat(source_path / relative).st_mtime_ns != source_mtime
+                or os.lstat(target_path / relative).st_mtime_ns != target_mtime
+            ):
+                return False
+    except (OSError, TypeError, ValueError):
+        return False
+    return True
+
+
+def record_tree_state(
+    state: Dict[str, LinkState],
+    entry: DotfileEntry,
+    source_path: Path,
+    target_path: Path,
+    diff: Optional[TreeDiff] = None,
+) -> None:
+    """Remember a tree entry that was just verified (walking it if diff is None)"""
+    try:
+        if diff is None:
+            diff = diff_tree(source_path, target_path)
+        source_stat = os.stat(source_path)
+    except OSError:
+        diff = None
+
+    if diff is None or not is_tree_synced(diff):
+        state.pop(str(target_path), None)
+        return
+
+    tree_state: TreeState = {
+        "key": get_entry_key(entry, source_path),
+        "source_ino": source_stat.st_ino,
+        "source_mtime_ns": source_stat.st_mtime_ns,
+        "link": "",
+        "directories": diff["directories"],
+    }
+    state[str(target_path)] = tree_state
+
+
+def describe_tree_diff(diff: TreeDiff) -> str:
+    """One-line summary of a tree diff, such as: 2 directories, 5 links"""
+    created, linked, stale = len(diff["create"]), len(diff["link"]), len(diff["stale"])
+    parts: List[str] = []
+    if created:
+        parts.append(f"{created} director{'y' if created == 1 else 'ies'}")
+    if linked:
+        parts.append(f"{linked} link{'' if linked == 1 else 's'}")
+    if stale:
+        parts.append(f"{stale} stale link{'' if stale == 1 else 's'}")
+    return ", ".join(parts) or "in sync"
+
+
+def get_tree_status_columns(
+    source_path: Path, target_path: Path
+) -> tuple[str, List[bool], Optional[TreeDiff]]:
+    """
+    Status of a tree entry plus the four check_status columns
+
+    The columns are: source is a directory, target is a real directory,
+    every file is linked, no stale links are left.
+    """
+    source_exists: bool = source_path.is_dir()
+    target_exists: bool = target_path.is_dir() and not target_path.is_symlink()
+    diff: Optional[TreeDiff] = None
+    if source_exists and target_exists:
+        with contextlib.suppress(OSError):
+            diff = diff_tree(source_path, target_path)
+
+    linked: bool = diff is not None and not (diff["create"] or diff["link"])
+    clean: bool = linked and diff is not None and not diff["stale"]
+    columns: List[bool] = [source_exists, target_exists, linked, clean]
+
+    if not source_exists:
+        return "no-source", columns, diff
+    if not os.path.lexists(target_path):
+        return "missing", columns, diff
+    if not target_exists:
+        return "not-a-link", columns, diff
+    if not linked:
+        return "missing", columns, diff
+    return ("linked" if clean else "wrong-link"), columns, diff
+
+
+def get_tree_status(source_path: Path, source_exists: bool, target_path: Path) -> str:
+    """
+    Status of a tree entry, in the terms of get_link_status
+
+    "missing" while directories or links are missing or wrong, "wrong-link"
+    if only stale links are left over, "not-a-link" if the target is not a
+    real directory.
+    """
+    if not source_exists:
+        return "no-source"
+    return get_tree_status_columns(source_path, target_path)[0]
+
+
+def sync_tree(
+    source_path: Path,
+    target_path: Path,
+    backup_dir: Path,
+    manifest: Dict[str, str],
+    dry_run: bool = False,
+    log: Callable[[str], None] = REPORTER.line,
+) -> bool:
+    """
+    Mirror a source tree into target_path, like stow folding
+
+    The trees are diffed again and only the difference is touched: missing
+    directories are created (anything in their way is backed up first),
+    missing or wrong links go through create_symlink, and links whose
+    source file is gone are backed up and removed. Never writes through a
+    symlinked directory.
+    """
+    try:
+        diff: TreeDiff = diff_tree(source_path, target_path)
+    except OSError as e:
+        log(f"  ❌ Error reading source tree {source_path}: {e}")
+        return False
+
+    if dry_run:
+        for relative in diff["create"]:
+            log(f"  📁 Would create directory: {target_path / relative}")
+        for relative in diff["link"]:
+            log(
+                f"  🔍 Would create symlink: {target_path / relative} -> "
+                f"{source_path / relative}"
+            )
+        for relative in diff["stale"]:
+            log(f"  🗑️  Would remove stale symlink: {target_path / relative}")
+        return True
+
+    success: bool = True
+    blocked: List[str] = []  # Directories that could not be created
+
+    def is_blocked(relative: str) -> bool:
+        return any(
+            not parent or relative.startswith(parent + os.sep) for parent in blocked
+        )
+
+    for relative in diff["create"]:
+        directory: Path = target_path / relative
+        if is_blocked(relative):
+            continue
+        try:
+            if os.path.lexists(directory):
+                kind = "symlink" if directory.is_symlink() else "file"
+                log(
+                    f"  📄 Found existing {kind} where a directory belongs: {directory}"
+                )
+                backup_dir.mkdir(parents=True, exist_ok=True)
+                if not create_backup(directory, backup_dir, log):
+                    log(f"  🚫 Error: Could not create backup for {directory}")
+                    blocked.append(relative)
+                    success = False
+                    continue
+                remove_path(directory)
+                manifest.pop(str(directory), None)
+            directory.mkdir(parents=True)
+            log(f"  📁 Created directory: {directory}")
+        except OSError as e:
+            log(f"  ❌ Error creating directory {directory}: {e}")
+            blocked.append(relative)
+            success = False
+
+    for relative in diff["link"]:
+        if is_blocked(relative):
+            success = False
+            continue
+        if not create_symlink(
+            source_path / relative, target_path / relative, backup_dir, manifest, log
+        ):
+            success = False
+
+    for relative in diff["stale"]:
+        link_path: Path = target_path / relative
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        if not create_backup(link_path, backup_dir, log):
+            success = False
+            continue
+        try:
+            link_path.unlink()
+            manifest.pop(str(link_path), None)
+            log(f"  🗑️  Removed stale symlink: {link_path}")
+        except OSError as e:
+            log(f"  ❌ Error removing {link_path}: {e}")
+            success = False
+
+    return success
+
+
+def get_search_roots(
+    config: Config,
+    home_dir: Path,
+    max_depth: Optional[int] = None,
+    extra_roots: Optional[List[Path]] = None,
+) -> Dict[Path, int]:
+    """
+    Work out where to look for managed symlinks and how deep
+
+    The home directory is searched as deep as the deepest configured target
+    (or max_depth), the classic dotfile locations one level deep, and any
+    extra roots (relative to home) to the same depth as the home directory.
+    """
+    depth: int = max_depth or max(
+        [len(Path(entry["target"]).parts) for entry in config["dotfiles"]] or [1]
+    )
+
+    roots: Dict[Path, int] = {home_dir: depth}
+    for location in DEFAULT_SEARCH_LOCATIONS:
+        roots.setdefault(home_dir / location, 1)
+    for root in extra_roots or []:
+        roots[home_dir / root] = depth
+    for entry in config["dotfiles"]:
+        if entry["type"] == "tree":
+            roots[home_dir / entry["target"]] = max_depth or TREE_SEARCH_DEPTH
+
+    # Drop roots that another root's walk already covers
+    covered: Dict[Path, int] = {}
+    for root, root_depth in sorted(roots.items(), key=lambda item: len(item[0].parts)):
+        is_covered = False
+        for parent, parent_depth in covered.items():
+            if root == parent or parent in root.parents:
+                distance = len(root.parts) - len(parent.parts)
+                if distance + root_depth <= parent_depth:
+                    is_covered = True
+                    break
+        if not is_covered:
+            covered[root] = root_depth
+
+    return covered
+
+
+def get_repository_stat(script_dir: Path) -> Optional[os.stat_result]:
+    """stat of script_dir, used to recognize it while walking the home directory"""
+    try:
+        return os.stat(script_dir)
+    except OSError:
+        return None
+
+
+def is_repository_entry(
+    item: os.DirEntry, repository: Optional[os.stat_result]
+) -> bool:
+    """Whether a scandir entry is the repository (inode first, rarely a stat)"""
+    if repository is None or item.inode() != repository.st_ino:
+        return False
+    try:
+        return item.stat(follow_symlinks=False).st_dev == repository.st_dev
+    except OSError:
+        return False
+
+
+def scan_for_symlinks(root: Path, max_depth: int, script_dir: Path) -> Set[Path]:
+    """
+    Walk root with os.scandir collecting symlinks that point into script_dir
+
+    Uses the cached DirEntry type information (no extra stat per entry), never
+    follows symlinked directories and skips PRUNED_DIRECTORIES entirely. The
+    repository itself (and so its backups) is never walked: links inside it
+    are part of the repository, not orphans in the home directory.
+    """
+    managed_links: Set[Path] = set()
+    repository = get_repository_stat(script_dir)
+    real_root = Path(os.path.realpath(root))
+    real_script_dir = Path(os.path.realpath(script_dir))
+    if real_root == real_script_dir or real_script_dir in real_root.parents:
+        return managed_links
+    pending: List[tuple[str, int]] = [(str(root), 1)]
+
+    while pending:
+        directory, depth = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for item in entries:
+                    if item.is_symlink():
+                        try:
+                            if is_link_within(Path(item.path), script_dir):
+                                managed_links.add(Path(item.path))
+                        except OSError:
+                            # Vanished or unreadable symlink, ignore
+                            pass
+                    elif (
+                        depth < max_depth
+                        and item.name not in PRUNED_DIRECTORIES
+                        and item.is_dir(follow_symlinks=False)
+                        and not is_repository_entry(item, repository)
+                    ):
+                        pending.append((item.path, depth + 1))
+        except OSError:
+            # Skip directories we can't read (or that don't exist)
+            continue
+
+    return managed_links
+
+
+def discover_managed_symlinks(
+    script_dir: Path,
+    home_dir: Path,
+    search_roots: Optional[Dict[Path, int]] = None,
+    jobs: int = 1,
+) -> Set[Path]:
+    """
+    Discover all symlinks in home directory that point to files in script_dir
+
+    search_roots maps each directory to walk onto its maximum depth (1 means
+    direct children only) and defaults to the classic dotfile locations.
+    With jobs > 1 the first level of every root is fanned out across a
+    thread pool.
+    """
+    if search_roots is None:
+        search_roots = {home_dir: 1}
+        for location in DEFAULT_SEARCH_LOCATIONS:
+            search_roots[home_dir / location] = 1
+
+    if jobs <= 1:
+        managed_links: Set[Path] = set()
+        for root, depth in search_roots.items():
+            managed_links |= scan_for_symlinks(root, depth, script_dir)
+        return managed_links
+
+    # Split every root into its direct children so the walk parallelizes
+    # even when there is a single (home directory) root
+    tasks: List[tuple[Path, int]] = []
+    repository = get_repository_stat(script_dir)
+    for root, depth in search_roots.items():
+        tasks.append((root, 1))
+        if depth <= 1:
+            continue
+        try:
+            with os.scandir(root) as entries:
+                for item in entries:
+                    if (
+                        not item.is_symlink()
+                        and item.name not in PRUNED_DIRECTORIES
+                        and item.is_dir(follow_symlinks=False)
+                        and not is_repository_entry(item, repository)
+                    ):
+                        tasks.append((Path(item.path), depth - 1))
+        except OSError:
+            continue
+
+    managed_links = set()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for links in pool.map(
+            lambda task: scan_for_symlinks(task[0], task[1], script_dir), tasks
+        ):
+            managed_links |= links
+    return managed_links
+
+
+def clean_orphaned_symlinks(
+    config_path: Path,
+    script_dir: Path,
+    home_dir: Path,
+    max_depth: Optional[int] = None,
+    extra_roots: Optional[List[Path]] = None,
+    jobs: int = 1,
+    rescan: bool = False,
+    use_cache: bool = True,
+) -> int:
+    """
+    Remove symlinks that are no longer in the config file
+
+    Managed symlinks come from the manifest (one lstat/readlink per entry);
+    the home directory is only walked with rescan or when the manifest was
+    never seeded by a walk of this home (links made before the manifest
+    existed would be missed), and the walk result then becomes the manifest.
+    """
+    REPORTER.line()
+    REPORTER.line("🧹" + "=" * 73 + "🧹")
+    REPORTER.line("🎯 \033[32mCLEANING ORPHANED SYMLINKS\033[0m 🎯")
+    REPORTER.line(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
+    REPORTER.line(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
+    REPORTER.line(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
+    REPORTER.line("🧹" + "=" * 73 + "🧹")
+    REPORTER.line()
+
+    # Load current configuration
+    config: CompiledConfig = load_config(config_path, script_dir, use_cache)
+
+    # Get currently configured targets
+    configured_targets: Set[Path] = set()
+    for entry in config["dotfiles"]:
+        target_path: Path = home_dir / entry["target"]
+        configured_targets.add(target_path)
+
+    manifest_path: Path = get_manifest_path(script_dir)
+    seeded: bool = str(home_dir) in load_scanned_homes(manifest_path)
+    manifest: Optional[Dict[str, str]] = (
+        load_manifest(manifest_path) if seeded and not rescan else None
+    )
+    managed_links: Set[Path] = set()
+
+    if manifest is not None:
+        # Check only the links we created under this home directory
+        REPORTER.line(f"📒 Checking {len(manifest)} symlinks from the manifest...")
+        home_prefix: str = str(home_dir) + os.sep
+        for link in list(manifest):
+            if not link.startswith(home_prefix):
+                continue
+            try:
+                if stat.S_ISLNK(os.lstat(link).st_mode) and is_link_within(
+                    Path(link), script_dir
+                ):
+                    managed_links.add(Path(link))
+                    continue
+            except OSError:
+                pass
+            # Gone, replaced or repointed elsewhere - no longer ours
+            del manifest[link]
+    else:
+        # Discover all managed symlinks and rebuild the manifest from them
+        search_roots: Dict[Path, int] = get_search_roots(
+            config, home_dir, max_depth, extra_roots
+        )
+        if not seeded and not rescan:
+            REPORTER.line(
+                "📒 First clean of this home directory - walking it once to find "
+                "links made before the manifest"
+            )
+        REPORTER.line(
+            f"🔍 Discovering managed symlinks in {len(search_roots)} locations "
+            f"(up to {max(search_roots.values())} levels deep)..."
+        )
+        managed_links = discover_managed_symlinks(
+            script_dir, home_dir, search_roots, jobs
+        )
+        manifest = load_manifest(manifest_path) or {}
+        home_prefix = str(home_dir) + os.sep
+        for link in [link for link in manifest if link.startswith(home_prefix)]:
+            del manifest[link]
+        for link_path in managed_links:
+            try:
+                manifest[str(link_path)] = os.readlink(link_path)
+            except OSError:
+                pass
+
+    save_manifest(manifest_path, manifest, home_dir)
+
+    if not managed_links:
+        REPORTER.line("✨ No managed symlinks found.")
+        REPORTER.event("summary", managed=0, orphaned=0, removed=0)
+        return 0
+
+    REPORTER.line(f"📊 Found {len(managed_links)} managed symlinks")
+    REPORTER.line()
+
+    # Links inside a tree entry's target belong to it while their source exists
+    trees: List[tuple[Path, Path]] = [
+        (home_dir / entry["target"], script_dir / entry["source"])
+        for entry in config["dotfiles"]
+        if entry["type"] == "tree"
+    ]
+
+    def is_tree_link(link_path: Path) -> bool:
+        for target_root, source_root in trees:
+            if target_root in link_path.parents:
+                source = source_root / link_path.relative_to(target_root)
+                with contextlib.suppress(OSError):
+                    if os.path.lexists(source) and link_points_to(link_path, source):
+                        return True
+        return False
+
+    # Find orphaned symlinks (managed but not in config)
+    orphaned_links: Set[Path] = {
+        link for link in managed_links - configured_targets if not is_tree_link(link)
+    }
+
+    if not orphaned_links:
+        REPORTER.line(
+            "🎉 No orphaned symlinks found. All managed symlinks are in the configuration!"
+        )
+        REPORTER.event("summary", managed=len(managed_links), orphaned=0, removed=0)
+        return 0
+
+    REPORTER.line(f"🗑️  Found {len(orphaned_links)} orphaned symlinks:")
+    for link in sorted(orphaned_links):
+        try:
+            target = link.resolve()
+            relative_target = target.relative_to(script_dir)
+            REPORTER.line(f"  🔗 {link} -> {relative_target}")
+        except (OSError, ValueError):
+            REPORTER.line(f"  💀 {link} -> <broken link>")
+
+    REPORTER.line()
+
+    # Setup backup directory
+    backup_dir: Path = script_dir / "backups" / "removed_symlinks"
+
+    # Remove orphaned symlinks
+    removed_count: int = 0
+    for link_path in sorted(orphaned_links):
+        started: float = time.perf_counter()
+        status: str = "failed"
+        REPORTER.line(f"🗑️  Removing orphaned symlink: {link_path}")
+
+        # Create backup first
+        if create_backup(link_path, backup_dir):
+            try:
+                link_path.unlink()
+                manifest.pop(str(link_path), None)
+                REPORTER.line(f"  ✅ Removed: {link_path}")
+                removed_count += 1
+                status = "removed"
+            except OSError as e:
+                REPORTER.line(f"  ❌ Error removing {link_path}: {e}")
+        else:
+            REPORTER.line(f"  ⏭️  Skipped removal due to backup failure: {link_path}")
+
+        REPORTER.event(
+            "orphan",
+            target=str(link_path),
+            status=status,
+            seconds=round(time.perf_counter() - started, 6),
+        )
+        REPORTER.line()
+
+    if removed_count:
+        save_manifest(manifest_path, manifest)
+
+    REPORTER.line(
+        f"📊 Summary: Removed {removed_count}/{len(orphaned_links)} orphaned symlinks"
+    )
+    REPORTER.event(
+        "summary",
+        managed=len(managed_links),
+        orphaned=len(orphaned_links),
+        removed=removed_count,
+    )
+
+    if removed_count == len(orphaned_links):
+        REPORTER.line("🎉 All orphaned symlinks removed successfully!")
+        return 0
+    else:
+        REPORTER.line("⚠️  Some orphaned symlinks could not be removed.")
+        return 1
+
+
+def check_status(
+    config_path: Path, script_dir: Path, home_dir: Path, use_cache: bool = True
+) -> int:
+    """Check status of all dotfile links"""
+    REPORTER.line()
+    REPORTER.line("📊" + "=" * 73 + "📊")
+    REPORTER.line("🎯 \033[32mDOTFILE STATUS CHECK\033[0m 🎯")
+    REPORTER.line(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
+    REPORTER.line(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
+    REPORTER.line(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
+    REPORTER.line("📊" + "=" * 73 + "📊")
+    REPORTER.line()
+
+    # Load configuration
+    config: CompiledConfig = load_config(config_path, script_dir, use_cache)
+
+    REPORTER.line(
+        f"{'📄 Name':<25} {'🏷️  Type':<10} {'📦 Source':<8} {'🎯 Target':<8} {'🔗 Linked':<8} {'✅ Correct':<8}"
+    )
+    REPORTER.line("─" * 75)
+
+    all_correct: bool = True
+
+    state_path: Path = get_state_path(config_path)
+    state: Dict[str, LinkState] = load_state(state_path) if use_cache else {}
+    state_changed: bool = False
+
+    counts: Dict[str, int] = {}
+
+    def report(entry: DotfileEntry, target_path: Path, status: str, started: float):
+        counts[status] = counts.get(status, 0) + 1
+        REPORTER.event(
+            "entry",
+            source=entry["source"],
+            target=str(target_path),
+            type=entry["type"],
+            status=status,
+            seconds=round(time.perf_counter() - started, 6),
+        )
+
+    for entry in config["dotfiles"]:
+        started: float = time.perf_counter()
+        source_path: Path = script_dir / entry["source"]
+        target_path: Path = home_dir / entry["target"]
+
+        # Fast path: unchanged since the last successful verification
+        is_cached_valid = (
+            is_cached_tree_valid if entry["type"] == "tree" else is_cached_link_valid
+        )
+        if use_cache and is_cached_valid(state, entry, source_path, target_path):
+            REPORTER.line(
+                f"{entry['source']:<25} {entry['type']:<10} "
+                f"{'✅':<8} {'✅':<8} {'✅':<8} {'✅':<8}"
+            )
+            report(entry, target_path, "linked", started)
+            continue
+
+        if entry["type"] == "tree":
+            # Target is a real directory, every file linked, no stale links
+            status, columns, diff = get_tree_status_columns(source_path, target_path)
+            if status != "linked":
+                all_correct = False
+            elif use_cache:
+                record_tree_state(state, entry, source_path, target_path, diff)
+                state_changed = True
+            REPORTER.line(
+                f"{entry['source']:<25} {entry['type']:<10} "
+                + " ".join(f"{'✅' if column else '❌':<8}" for column in columns)
+            )
+            report(entry, target_path, status, started)
+            continue
+
+        # Check source exists
+        source_exists: bool = source_path.exists()
+
+        # Check target exists
+        target_exists: bool = target_path.exists()
+
+        # Check if target is a symlink
+        is_symlink: bool = target_path.is_symlink()
+
+        # Check if symlink points to correct location
+        is_correct: bool = False
+        if is_symlink:
+            try:
+                is_correct = link_points_to(target_path, source_path)
+            except OSError:
+                is_correct = False
+
+        # Determine overall status
+        status: str = "linked"
+        if not source_exists:
+            status = "no-source"
+        elif not target_exists:
+            status = "missing"
+        elif not is_symlink:
+            status = "not-a-link"
+        elif not is_correct:
+            status = "wrong-link"
+        elif use_cache:
+            record_link_state(state, entry, source_path, target_path)
+            state_changed = True
+        if status != "linked":
+            all_correct = False
+
+        # Display status with colorful indicators
+        REPORTER.line(
+            f"{entry['source']:<25} {entry['type']:<10} "
+            f"{'✅' if source_exists else '❌':<8} "
+            f"{'✅' if target_exists else '❌':<8} "
+            f"{'✅' if is_symlink else '❌':<8} "
+            f"{'✅' if is_correct else '❌':<8}"
+        )
+        report(entry, target_path, status, started)
+
+    if state_changed:
+        save_state(state_path, state)
+
+    REPORTER.event("summary", total=len(config["dotfiles"]), **counts)
+
+    REPORTER.line()
+    if all_correct:
+        REPORTER.line("🎉 All dotfiles are correctly linked! You're all set! 🎉")
+        return 0
+    else:
+        REPORTER.line(
+            "⚠️  Some dotfiles are not correctly linked. Run 'install' to fix them!"
+        )
+        return 1
+
+
+def get_link_status(source_path: Path, source_exists: bool, target_path: Path) -> str:
+    """
+    Status of one entry in one home directory, with as few syscalls as possible
+
+    One of "linked", "no-source", "missing" (including broken links),
+    "not-a-link" or "wrong-link", matching check_status.
+    """
+    if not source_exists:
+        return "no-source"
+    try:
+        if not stat.S_ISLNK(os.lstat(target_path).st_mode):
+            return "not-a-link"
+    except OSError:
+        return "missing"
+    if not os.path.exists(target_path):
+        return "missing"
+    try:
+        return "linked" if link_points_to(target_path, source_path) else "wrong-link"
+    except OSError:
+        return "wrong-link"
+
+
+def load_homes_file(homes_file: Path) -> List[Path]:
+    """Home directories listed in a file, one per line ('#' starts a comment)"""
+    try:
+        with homes_file.open("r", encoding="utf-8") as f:
+            lines = [line.split("#", 1)[0].strip() for line in f]
+    except OSError as e:
+        REPORTER.line(f"❌ Error: Could not read homes file {homes_file}: {e}")
+        sys.exit(1)
+    return [Path(line).expanduser().absolute() for line in lines if line]
+
+
+def check_fleet_status(
+    config_path: Path,
+    script_dir: Path,
+    homes: List[Path],
+    jobs: int = 1,
+    use_cache: bool = True,
+) -> int:
+    """
+    Check every dotfile link in many home directories at once
+
+    The config is parsed and every source resolved once; homes are then
+    checked concurrently and reported as one entry × home matrix with
+    per-home and overall summary counts.
+    """
+    REPORTER.line()
+    REPORTER.line("📊" + "=" * 73 + "📊")
+    REPORTER.line("🎯 \033[32mFLEET STATUS CHECK\033[0m 🎯")
+    REPORTER.line(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
+    REPORTER.line(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
+    REPORTER.line(f"🏠 \033[32mHome directories: {len(homes)}\033[0m")
+    REPORTER.line("📊" + "=" * 73 + "📊")
+    REPORTER.line()
+
+    config: CompiledConfig = load_config(config_path, script_dir, use_cache)
+    entries: List[DotfileEntry] = config["dotfiles"]
+    targets: List[str] = [compiled["target"] for compiled in config["entries"]]
+    get_statuses: List[Callable[[Path, bool, Path], str]] = [
+        get_tree_status if entry["type"] == "tree" else get_link_status
+        for entry in entries
+    ]
+
+    # Shared by every home: source paths, their existence and resolution
+    sources: List[Path] = [Path(compiled["source"]) for compiled in config["entries"]]
+    sources_exist: List[bool] = [source.exists() for source in sources]
+    for source in sources:
+        resolve_cached(str(source))
+
+    def check_home(home_dir: Path) -> List[str]:
+        return [
+            get_status(source, exists, home_dir / target)
+            for get_status, target, source, exists in zip(
+                get_statuses, targets, sources, sources_exist
+            )
+        ]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(homes)))) as pool:
+        matrix: List[List[str]] = list(pool.map(check_home, homes))
+
+    # Matrix: one row per entry, one column per home
+    labels: List[str] = [f"#{index}" for index in range(1, len(homes) + 1)]
+    for label, home_dir in zip(labels, homes):
+        REPORTER.line(f"  {label:<4} {home_dir}")
+    REPORTER.line()
+    REPORTER.line(f"{'📄 Name':<25} " + " ".join(f"{label:<4}" for label in labels))
+    REPORTER.line("─" * (26 + 5 * len(homes)))
+    for row, entry in enumerate(entries):
+        cells = " ".join(
+            f"{FLEET_STATUS_ICONS[statuses[row]]:<4}" for statuses in matrix
+        )
+        REPORTER.line(f"{entry['source']:<25} {cells}")
+    REPORTER.line()
+    REPORTER.line(
+        "Legend: "
+        + "  ".join(f"{icon} {status}" for status, icon in FLEET_STATUS_ICONS.items())
+    )
+    REPORTER.line()
+
+    totals: Dict[str, int] = {}
+    healthy_homes: int = 0
+    for home_dir, statuses in zip(homes, matrix):
+        counts: Dict[str, int] = {}
+        for entry, status in zip(entries, statuses):
+            counts[status] = counts.get(status, 0) + 1
+            REPORTER.event(
+                "entry",
+                home=str(home_dir),
+                source=entry["source"],
+                target=str(home_dir / entry["target"]),
+                type=entry["type"],
+                status=status,
+            )
+        for status, count in counts.items():
+            totals[status] = totals.get(status, 0) + count
+        REPORTER.event("home", home=str(home_dir), total=len(entries), **counts)
+        if counts.get("linked", 0) == len(entries):
+            healthy_homes += 1
+        else:
+            problems = ", ".join(
+                f"{count} {status}"
+                for status, count in sorted(counts.items())
+                if status != "linked"
+            )
+            REPORTER.line(f"⚠️  {home_dir}: {problems}")
+
+    REPORTER.event(
+        "summary",
+        homes=len(homes),
+        healthy=healthy_homes,
+        entries=len(entries),
+        **totals,
+    )
+    REPORTER.line(
+        f"📊 Summary: {healthy_homes}/{len(homes)} homes fully linked, "
+        + ", ".join(f"{count} {status}" for status, count in sorted(totals.items()))
+    )
+
+    if healthy_homes == len(homes):
+        REPORTER.line("🎉 All dotfiles are correctly linked in every home! 🎉")
+        return 0
+    return 1
+
+
+def get_path_fingerprint(path: Path) -> Optional[List[int]]:
+    """Identify what is at path with a single lstat (None if nothing is)"""
+    try:
+        path_stat = os.lstat(path)
+    except OSError:
+        return None
+    return [
+        path_stat.st_dev,
+        path_stat.st_ino,
+        path_stat.st_mode,
+        path_stat.st_mtime_ns,
+    ]
+
+
+def plan_entry(
+    entry: DotfileEntry,
+    script_dir: Path,
+    home_dir: Path,
+    state: Dict[str, LinkState],
+    use_cache: bool = True,
+) -> PlanAction:
+    """
+    Inspect the filesystem for a single entry and decide what to do
+
+    Never changes anything on disk; correctly linked entries verified the
+    slow way are recorded in state.
+    """
+    source_path: Path = script_dir / entry["source"]
+    target_path: Path = home_dir / entry["target"]
+    action: PlanAction = {
+        "action": "skip",
+        "entry": entry,
+        "source": str(source_path),
+        "target": str(target_path),
+        "detail": "",
+        "fingerprint": None,
+    }
+
+    # Fast path: unchanged since the last successful verification
+    is_cached_valid = (
+        is_cached_tree_valid if entry["type"] == "tree" else is_cached_link_valid
+    )
+    if use_cache and is_cached_valid(state, entry, source_path, target_path):
+        action["detail"] = "cached"
+        return action
+
+    # Check if source exists
+    if not source_path.exists():
+        action["action"] = "error"
+        action["detail"] = f"Source does not exist: {source_path}"
+        return action
+
+    # Validate type matches reality
+    if entry["type"] == "file" and not source_path.is_file():
+        action["action"] = "error"
+        action["detail"] = f"Expected file but found directory: {source_path}"
+        return action
+    elif entry["type"] in ["directory", "tree"] and not source_path.is_dir():
+        action["action"] = "error"
+        action["detail"] = f"Expected directory but found file: {source_path}"
+        return action
+
+    if entry["type"] == "tree":
+        # Mirroring into the source itself would replace its files with links
+        source_root: str = resolve_cached(str(source_path))
+        target_parent: str = os.path.realpath(target_path.parent)
+        if target_parent == source_root or target_parent.startswith(
+            source_root + os.sep
+        ):
+            action["action"] = "error"
+            action["detail"] = f"Target lies inside the source tree: {target_path}"
+            return action
+
+        try:
+            diff: TreeDiff = diff_tree(source_path, target_path)
+        except OSError as e:
+            action["action"] = "error"
+            action["detail"] = f"Could not read source tree {source_path}: {e}"
+            return action
+
+        if is_tree_synced(diff):
+            action["detail"] = "verified"
+            if use_cache:
+                record_tree_state(state, entry, source_path, target_path, diff)
+        else:
+            action["action"] = "sync"
+            action["detail"] = describe_tree_diff(diff)
+        return action
+
+    # Check if target already exists and is a valid symlink
+    fingerprint = get_path_fingerprint(target_path)
+    action["fingerprint"] = fingerprint
+    if fingerprint is None:
+        action["action"] = "create"
+    elif stat.S_ISLNK(fingerprint[2]):
+        try:
+            if link_points_to(target_path, source_path):
+                action["detail"] = "verified"
+                if use_cache:
+                    record_link_state(state, entry, source_path, target_path)
+                return action
+            action["action"] = "fix-link"
+            action["detail"] = "wrong" if target_path.exists() else "broken"
+        except OSError:
+            action["action"] = "fix-link"
+            action["detail"] = "broken"
+    else:
+        action["action"] = "replace"
+        action["detail"] = "directory" if stat.S_ISDIR(fingerprint[2]) else "file"
+
+    return action
+
+
+def plan_install(
+    config: Config,
+    script_dir: Path,
+    home_dir: Path,
+    state: Dict[str, LinkState],
+    use_cache: bool = True,
+    jobs: int = 1,
+) -> List[PlanAction]:
+    """Plan every entry of the config, inspecting entries in parallel with jobs"""
+
+    def plan(entry: DotfileEntry) -> PlanAction:
+        return plan_entry(entry, script_dir, home_dir, state, use_cache)
+
+    if jobs <= 1:
+        return [plan(entry) for entry in config["dotfiles"]]
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(plan, config["dotfiles"]))
+
+
+def apply_action(
+    action: PlanAction,
+    script_dir: Path,
+    home_dir: Path,
+    backup_dir: Path,
+    state: Dict[str, LinkState],
+    manifest: Dict[str, str],
+    dry_run: bool = False,
+    use_cache: bool = True,
+    log: Callable[[str], None] = REPORTER.line,
+    swaps: Optional[List[PendingSwap]] = None,
+) -> str:
+    """
+    Carry out (or with dry_run, describe) a planned action
+
+    Skipped and failed entries are not inspected again. Before changing a
+    target, one lstat confirms it is still what the plan saw; if not, the
+    entry is re-planned first. Returns "linked", "skipped" or "failed".
+
+    If swaps is given the new link is only prepared and appended to it,
+    and "pending" is returned; the caller commits and finishes it.
+
+    Output goes through log so concurrent installs can buffer it per
+    entry; state and manifest are only updated with single (atomic) dict
+    operations, so workers can share them.
+    """
+    # Paths always come from the entry (the one that was safety-checked)
+    entry: DotfileEntry = action["entry"]
+    source_path: Path = script_dir / entry["source"]
+    target_path: Path = home_dir / entry["target"]
+    kind: str = action["action"]
+    detail: str = action["detail"]
+
+    if dry_run:
+        log(f"🔍 Would process: {entry['source']} ({entry['type']})")
+    else:
+        log(f"⚡ Processing: {entry['source']} ({entry['type']})")
+
+    if kind == "error":
+        log(f"  ⚠️  Warning: {detail}")
+        return "failed"
+
+    if kind == "skip":
+        log(f"  ✨ Already correctly linked: {target_path} -> {source_path}")
+        if not dry_run and entry["type"] != "tree":
+            manifest.setdefault(str(target_path), str(source_path))
+        log("")
+        return "skipped"
+
+    if kind == "sync":
+        # Trees are diffed again while syncing, so only what differs is touched
+        log(f"  🌳 Mirroring tree ({detail}): {target_path}")
+        if not sync_tree(source_path, target_path, backup_dir, manifest, dry_run, log):
+            log("")
+            return "failed"
+        if use_cache and not dry_run:
+            record_tree_state(state, entry, source_path, target_path)
+        log("")
+        return "linked"
+
+    if not dry_run and get_path_fingerprint(target_path) != action["fingerprint"]:
+        log(f"  🔁 Target changed since planning, re-inspecting: {target_path}")
+        action = plan_entry(entry, script_dir, home_dir, state, use_cache)
+        kind = action["action"]
+        detail = action["detail"]
+        if kind == "error":
+            log(f"  ⚠️  Warning: {detail}")
+            return "failed"
+        if kind == "skip":
+            log(f"  ✨ Already correctly linked: {target_path} -> {source_path}")
+            manifest.setdefault(str(target_path), str(source_path))
+            log("")
+            return "skipped"
+
+    if kind == "fix-link" and detail == "broken":
+        if dry_run:
+            log(f"  💀 Would fix broken symlink: {target_path}")
+        else:
+            log(f"  💀 Found broken symlink: {target_path}")
+    elif kind == "fix-link":
+        if dry_run:
+            log(f"  🔄 Would fix symlink pointing to wrong location: {target_path}")
+        else:
+            log(f"  🔄 Found symlink pointing to wrong location: {target_path}")
+    elif kind == "replace":
+        if dry_run:
+            log(f"  📁 Would backup and replace existing {detail}: {target_path}")
+        else:
+            log(f"  📁 Found existing {detail}: {target_path}")
+
+    # Create symlink (this will handle backup if needed)
+    if dry_run:
+        log(f"  🔍 Would create symlink: {target_path} -> {source_path}")
+        log("")
+        return "linked"
+
+    if swaps is not None:
+        swap = prepare_symlink(source_path, target_path, backup_dir, log)
+        log("")
+        if swap is None:
+            return "failed"
+        swaps.append(swap)
+        return "pending"
+
+    if create_symlink(source_path, target_path, backup_dir, manifest, log):
+        if use_cache:
+            record_link_state(state, entry, source_path, target_path)
+        log("")
+        return "linked"
+
+    log("")
+    return "failed"
+
+
+def get_nested_entry_groups(targets: List[Path]) -> List[List[int]]:
+    """
+    Group entry indexes whose targets are equal or nested inside one another
+
+    Each group keeps config order and must be processed sequentially;
+    different groups are independent and can run concurrently.
+    """
+    parent: List[int] = list(range(len(targets)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    # Sorting by path components puts every target right after its ancestors
+    ancestors: List[int] = []
+    for index in sorted(range(len(targets)), key=lambda i: targets[i].parts):
+        parts = targets[index].parts
+        while ancestors and (
+            targets[ancestors[-1]].parts != parts[: len(targets[ancestors[-1]].parts)]
+        ):
+            ancestors.pop()
+        if ancestors:
+            parent[find(index)] = find(ancestors[-1])
+        ancestors.append(index)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(targets)):
+        groups.setdefault(find(index), []).append(index)
+    return list(groups.values())
+
+
+def run_entries_concurrently(
+    targets: List[Path],
+    process: Callable[[int, Callable[[str], None]], str],
+    jobs: int,
+) -> List[str]:
+    """
+    Run process for every entry in a thread pool, printing output in order
+
+    Entries with nested targets share a worker so they stay ordered; each
+    entry's output is buffered and printed in config order as soon as the
+    entry and everything before it have finished.
+    """
+    outputs: List[List[str]] = [[] for _ in targets]
+    results: List[str] = ["failed"] * len(targets)
+
+    def run_group(group: List[int]) -> None:
+        for index in group:
+            results[index] = process(index, outputs[index].append)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for group in get_nested_entry_groups(targets):
+            future = pool.submit(run_group, group)
+            for index in group:
+                futures[index] = future
+
+        for index in range(len(targets)):
+            futures[index].result()
+            for line in outputs[index]:
+                REPORTER.line(line)
+
+    return results
+
+
+def install_dotfiles(
+    config_path: Path,
+    script_dir: Path,
+    home_dir: Path,
+    backup_dir: Path,
+    dry_run: bool = False,
+    use_cache: bool = True,
+    jobs: int = 1,
+) -> int:
+    """
+    install dotfiles
+
+    With jobs > 1, entries whose targets don't overlap are installed
+    concurrently (including their backups) and the output is still
+    printed per entry in config order.
+    """
+    REPORTER.line()
+    if dry_run:
+        REPORTER.line("🔍" + "=" * 71 + "🔍")
+        REPORTER.line("🎯 \033[32mDRY RUN - PREVIEW MODE\033[0m 🎯")
+    else:
+        REPORTER.line("🚀" + "=" * 73 + "🚀")
+        REPORTER.line("⚡ \033[32mINSTALLING DOTFILES\033[0m ⚡")
+    REPORTER.line(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
+    REPORTER.line(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
+    REPORTER.line(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
     if not dry_run:
-        print(f"💾 \033[32mBackup directory: {backup_dir}\033[0m")
+        REPORTER.line(f"💾 \033[32mBackup directory: {backup_dir}\033[0m")
     if dry_run:
-        print("🔍" + "=" * 71 + "🔍")
+        REPORTER.line("🔍" + "=" * 71 + "🔍")
     else:
-        print("🚀" + "=" * 73 + "🚀")
-    print()
+        REPORTER.line("🚀" + "=" * 73 + "🚀")
+    REPORTER.line()
 
     # Load configuration
-    config: Config = load_config(config_path)
+    config: CompiledConfig = load_config(config_path, script_dir, use_cache)
 
     # 🛡️ SAFETY VALIDATION - This is critical!
     if not validate_config_safety(config, script_dir, home_dir, dry_run):
-        print("🚫 Installation cancelled due to safety concerns!")
+        REPORTER.line("🚫 Installation cancelled due to safety concerns!")
         return 1
 
-    print()
+    REPORTER.line()
 
-    # Process each dotfile entry
-    success_count: int = 0
-    skipped_count: int = 0
-    total_count: int = len(config["dotfiles"])
+    state_path: Path = get_state_path(config_path)
+    state: Dict[str, LinkState] = load_state(state_path) if use_cache else {}
+    manifest_path: Path = get_manifest_path(script_dir)
+    manifest: Dict[str, str] = load_manifest(manifest_path) or {}
+    manifest_before: Dict[str, str] = dict(manifest)
 
-    for entry in config["dotfiles"]:
-        source_path: Path = script_dir / entry["source"]
-        target_path: Path = home_dir / entry["target"]
+    # Inspect everything first, then act on the plan
+    actions: List[PlanAction] = plan_install(
+        config, script_dir, home_dir, state, use_cache, jobs
+    )
+    results: List[str] = run_plan(
+        actions,
+        script_dir,
+        home_dir,
+        backup_dir,
+        state,
+        manifest,
+        dry_run=dry_run,
+        use_cache=use_cache,
+        jobs=jobs,
+    )
 
-        if dry_run:
-            print(f"🔍 Would process: {entry['source']} ({entry['type']})")
-        else:
-            print(f"⚡ Processing: {entry['source']} ({entry['type']})")
+    if use_cache and not dry_run:
+        save_state(state_path, state)
+    if manifest != manifest_before:
+        save_manifest(manifest_path, manifest)
 
-        # Check if source exists
-        if not source_path.exists():
-            print(f"  ⚠️  Warning: Source does not exist: {source_path}")
-            continue
+    return print_install_summary(results, dry_run)
 
-        # Validate type matches reality
-        if entry["type"] == "file" and not source_path.is_file():
-            print(f"  ⚠️  Warning: Expected file but found directory: {source_path}")
-            continue
-        elif entry["type"] == "directory" and not source_path.is_dir():
-            print(f"  ⚠️  Warning: Expected directory but found file: {source_path}")
-            continue
 
-        # Check if target already exists and is a valid symlink
-        if target_path.exists() or target_path.is_symlink():
-            if target_path.is_symlink():
-                try:
-                    # Check if symlink points to the correct location
-                    if target_path.resolve() == source_path.resolve():
-                        if dry_run:
-                            print(
-                                f"  ✨ Already correctly linked: {target_path} -> {source_path}"
-                            )
-                        else:
-                            print(
-                                f"  ✨ Already correctly linked: {target_path} -> {source_path}"
-                            )
-                        success_count += 1
-                        skipped_count += 1
-                        print()
-                        continue
-                    else:
-                        if dry_run:
-                            print(
-                                f"  🔄 Would fix symlink pointing to wrong location: {target_path}"
-                            )
-                        else:
-                            print(
-                                f"  🔄 Found symlink pointing to wrong location: {target_path}"
-                            )
-                except OSError:
-                    if dry_run:
-                        print(f"  💀 Would fix broken symlink: {target_path}")
-                    else:
-                        print(f"  💀 Found broken symlink: {target_path}")
-            else:
-                if dry_run:
-                    print(
-                        f"  📁 Would backup and replace existing {'directory' if target_path.is_dir() else 'file'}: {target_path}"
-                    )
-                else:
-                    print(
-                        f"  📁 Found existing {'directory' if target_path.is_dir() else 'file'}: {target_path}"
+def run_plan(
+    actions: List[PlanAction],
+    script_dir: Path,
+    home_dir: Path,
+    backup_dir: Path,
+    state: Dict[str, LinkState],
+    manifest: Dict[str, str],
+    dry_run: bool = False,
+    use_cache: bool = True,
+    jobs: int = 1,
+) -> List[str]:
+    """
+    Apply (or describe) planned actions, concurrently with jobs > 1
+
+    Links are swapped in as one batch: every entry is prepared first
+    (backups and temporary links), then all renames run in one tight
+    loop. Entries with nested targets depend on each other and are linked
+    one at a time instead.
+    """
+    targets: List[Path] = [Path(action["target"]) for action in actions]
+    batched: Set[int] = set()
+    if not dry_run:
+        for group in get_nested_entry_groups(targets):
+            if len(group) == 1:
+                batched.update(group)
+    swaps: Dict[int, PendingSwap] = {}
+    seconds: List[float] = [0.0] * len(actions)
+
+    def process(index: int, log: Callable[[str], None]) -> str:
+        started: float = time.perf_counter()
+        prepared: List[PendingSwap] = []
+        result = apply_action(
+            actions[index],
+            script_dir,
+            home_dir,
+            backup_dir,
+            state,
+            manifest,
+            dry_run=dry_run,
+            use_cache=use_cache,
+            log=log,
+            swaps=prepared if index in batched else None,
+        )
+        if prepared:
+            swaps[index] = prepared[0]
+        seconds[index] = time.perf_counter() - started
+        return result
+
+    if jobs <= 1:
+        results = [process(i, REPORTER.line) for i in range(len(actions))]
+    else:
+        results = run_entries_concurrently(targets, process, jobs)
+
+    if swaps:
+        # The critical section: nothing but renames
+        REPORTER.line(f"🔀 Swapping {len(swaps)} links into place...")
+        committed: Dict[int, bool] = {}
+        outputs: Dict[int, List[str]] = {index: [] for index in swaps}
+        for index in sorted(swaps):
+            committed[index] = commit_symlink(swaps[index], outputs[index].append)
+
+        for index in sorted(swaps):
+            started: float = time.perf_counter()
+            log = outputs[index].append
+            if committed[index] and finish_symlink(
+                swaps[index], backup_dir, manifest, log
+            ):
+                results[index] = "linked"
+                if use_cache:
+                    entry = actions[index]["entry"]
+                    record_link_state(
+                        state, entry, Path(swaps[index]["source"]), targets[index]
                     )
+            else:
+                results[index] = "failed"
+            seconds[index] += time.perf_counter() - started
+            for line in outputs[index]:
+                REPORTER.line(line)
+        REPORTER.line()
+
+    for action, result, elapsed in zip(actions, results, seconds):
+        REPORTER.event(
+            "entry",
+            source=action["entry"]["source"],
+            target=action["target"],
+            type=action["entry"]["type"],
+            action=action["action"],
+            detail=action["detail"],
+            status=result,
+            seconds=round(elapsed, 6),
+        )
+
+    return results
 
-        # Create symlink (this will handle backup if needed)
-        if dry_run:
-            print(f"  🔍 Would create symlink: {target_path} -> {source_path}")
-            success_count += 1
-        else:
-            if create_symlink(source_path, target_path, backup_dir):
-                success_count += 1
 
-        print()
+def print_install_summary(results: List[str], dry_run: bool = False) -> int:
+    """Print the install summary for a list of entry results"""
+    success_count: int = sum(1 for result in results if result != "failed")
+    skipped_count: int = results.count("skipped")
+    total_count: int = len(results)
 
     # Summary
     created_count = success_count - skipped_count
+    REPORTER.event(
+        "summary",
+        total=total_count,
+        linked=created_count,
+        skipped=skipped_count,
+        failed=total_count - success_count,
+        dry_run=dry_run,
+    )
     if dry_run:
-        print(
+        REPORTER.line(
             f"🔍 Dry Run Summary: {success_count}/{total_count} symlinks would be correctly linked"
         )
         if skipped_count > 0:
-            print(
+            REPORTER.line(
                 f"✨ Would skip {skipped_count} already valid symlinks (no backup needed)"
             )
         if created_count > 0:
-            print(f"🔗 Would create {created_count} new symlinks")
-        print("\n💡 Run without --dry-run to actually perform these operations")
+            REPORTER.line(f"🔗 Would create {created_count} new symlinks")
+        REPORTER.line("\n💡 Run without --dry-run to actually perform these operations")
     else:
-        print(
+        REPORTER.line(
             f"📊 Summary: {success_count}/{total_count} symlinks are correctly linked"
         )
         if skipped_count > 0:
-            print(
+            REPORTER.line(
                 f"✨ Skipped {skipped_count} already valid symlinks (no backup needed)"
             )
         if created_count > 0:
-            print(f"🔗 Created {created_count} new symlinks")
+            REPORTER.line(f"🔗 Created {created_count} new symlinks")
 
     if success_count == total_count:
         if dry_run:
-            print(
+            REPORTER.line(
                 "🎉 All dotfiles would be correctly linked! Run without --dry-run to proceed! 🎉"
             )
         else:
-            print(
+            REPORTER.line(
                 "🎉 All dotfiles linked successfully! Your setup is ready to rock! 🎉"
             )
         return 0
     else:
         if dry_run:
-            print("⚠️  Some dotfiles would have issues. Check the messages above.")
+            REPORTER.line(
+                "⚠️  Some dotfiles would have issues. Check the messages above."
+            )
+        else:
+            REPORTER.line("⚠️  Some dotfiles failed to link. Check the errors above.")
+        return 1
+
+
+def write_plan(
+    config_path: Path,
+    script_dir: Path,
+    home_dir: Path,
+    output_path: Path,
+    use_cache: bool = True,
+    jobs: int = 1,
+) -> int:
+    """
+    Inspect the filesystem once and save a machine-readable install plan
+
+    With output_path "-" the JSON plan goes to stdout and everything else
+    to stderr.
+    """
+    to_stdout: bool = str(output_path) == "-"
+    with contextlib.redirect_stdout(sys.stderr if to_stdout else sys.stdout):
+        REPORTER.line()
+        REPORTER.line("🗺️ " + "=" * 72 + "🗺️")
+        REPORTER.line("🎯 \033[32mPLANNING DOTFILES\033[0m 🎯")
+        REPORTER.line(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
+        REPORTER.line(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
+        REPORTER.line(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
+        REPORTER.line("🗺️ " + "=" * 72 + "🗺️")
+        REPORTER.line()
+
+        # Load configuration
+        config: CompiledConfig = load_config(config_path, script_dir, use_cache)
+
+        # 🛡️ SAFETY VALIDATION - confirmations happen when the plan is applied
+        if not validate_config_safety(config, script_dir, home_dir, dry_run=True):
+            REPORTER.line("🚫 Planning cancelled due to safety concerns!")
+            return 1
+
+        REPORTER.line()
+
+        state: Dict[str, LinkState] = (
+            load_state(get_state_path(config_path)) if use_cache else {}
+        )
+        actions: List[PlanAction] = plan_install(
+            config, script_dir, home_dir, state, use_cache, jobs
+        )
+        plan: Plan = {
+            "version": PLAN_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "config": str(config_path),
+            "script_dir": str(script_dir),
+            "home_dir": str(home_dir),
+            "actions": actions,
+        }
+
+        # Describe the plan exactly like a dry run would
+        run_plan(actions, script_dir, home_dir, Path(), state, {}, dry_run=True)
+
+        counts: Dict[str, int] = {}
+        for action in actions:
+            counts[action["action"]] = counts.get(action["action"], 0) + 1
+        REPORTER.line(
+            "🗺️  Plan: "
+            + ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items()))
+        )
+
+        if to_stdout:
+            json.dump(plan, sys.__stdout__, indent=2)
+            sys.__stdout__.write("\n")
+        elif write_json_atomic(output_path, plan):
+            REPORTER.line(f"💾 Plan written to {output_path}")
+            REPORTER.line(f"💡 Run 'linker.py apply {output_path}' to carry it out")
+        else:
+            return 1
+
+    return 1 if counts.get("error") else 0
+
+
+def load_plan(plan_path: Path) -> Plan:
+    """Load a saved install plan"""
+    try:
+        with plan_path.open("r", encoding="utf-8") as f:
+            plan: Plan = json.load(f)
+
+        if plan.get("version") != PLAN_VERSION:
+            raise ValueError(f"unsupported plan version: {plan.get('version')}")
+
+        for key in ["config", "script_dir", "home_dir", "actions"]:
+            if key not in plan:
+                raise KeyError(f"plan missing required key: '{key}'")
+
+        for i, action in enumerate(plan["actions"]):
+            if action["action"] not in PLAN_ACTIONS:
+                raise ValueError(f"actions[{i}] has unknown action: {action['action']}")
+            for key in ["entry", "source", "target", "detail", "fingerprint"]:
+                if key not in action:
+                    raise KeyError(f"actions[{i}] missing required key: '{key}'")
+
+            # An edited or stale plan must not act on paths nobody validated
+            entry = action["entry"]
+            if action["source"] != str(Path(plan["script_dir"]) / entry["source"]):
+                raise ValueError(f"actions[{i}] source does not match its entry")
+            if action["target"] != str(Path(plan["home_dir"]) / entry["target"]):
+                raise ValueError(f"actions[{i}] target does not match its entry")
+
+        return plan
+
+    except FileNotFoundError:
+        REPORTER.line(f"❌ Error: Plan file not found: {plan_path}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        REPORTER.line(f"❌ Error: Invalid JSON in plan file: {e}")
+        sys.exit(1)
+    except (KeyError, TypeError, ValueError) as e:
+        REPORTER.line(f"❌ Error: Invalid plan structure: {e}")
+        sys.exit(1)
+
+
+def apply_plan(plan_path: Path, use_cache: bool = True, jobs: int = 1) -> int:
+    """Carry out a saved install plan"""
+    plan: Plan = load_plan(plan_path)
+    config_path: Path = Path(plan["config"])
+    script_dir: Path = Path(plan["script_dir"])
+    home_dir: Path = Path(plan["home_dir"])
+    backup_dir: Path = script_dir / "backups" / "removed_entity"
+
+    REPORTER.line()
+    REPORTER.line("🚀" + "=" * 73 + "🚀")
+    REPORTER.line("⚡ \033[32mAPPLYING PLAN\033[0m ⚡")
+    REPORTER.line(f"🗺️  \033[32mPlan file: {plan_path} ({plan['created']})\033[0m")
+    REPORTER.line(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
+    REPORTER.line(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
+    REPORTER.line(f"💾 \033[32mBackup directory: {backup_dir}\033[0m")
+    REPORTER.line("🚀" + "=" * 73 + "🚀")
+    REPORTER.line()
+
+    # 🛡️ SAFETY VALIDATION - the plan file could have been edited
+    config: CompiledConfig = compile_config(
+        {"dotfiles": [action["entry"] for action in plan["actions"]]}, script_dir
+    )
+    if not validate_config_safety(config, script_dir, home_dir):
+        REPORTER.line("🚫 Apply cancelled due to safety concerns!")
+        return 1
+
+    REPORTER.line()
+
+    state_path: Path = get_state_path(config_path)
+    state: Dict[str, LinkState] = load_state(state_path) if use_cache else {}
+    manifest_path: Path = get_manifest_path(script_dir)
+    manifest: Dict[str, str] = load_manifest(manifest_path) or {}
+    manifest_before: Dict[str, str] = dict(manifest)
+
+    results: List[str] = run_plan(
+        plan["actions"],
+        script_dir,
+        home_dir,
+        backup_dir,
+        state,
+        manifest,
+        use_cache=use_cache,
+        jobs=jobs,
+    )
+
+    if use_cache:
+        save_state(state_path, state)
+    if manifest != manifest_before:
+        save_manifest(manifest_path, manifest)
+
+    return print_install_summary(results)
+
+
+def find_existing_ancestor(path: Path) -> Path:
+    """path itself if it is a directory, else its nearest existing ancestor"""
+    while not path.is_dir() and path != path.parent:
+        path = path.parent
+    return path
+
+
+def get_watch_directories(
+    config: CompiledConfig, script_dir: Path, home_dir: Path, config_path: Path
+) -> Set[Path]:
+    """
+    Directories whose changes can affect the links
+
+    The parent of every target and source (or, if it doesn't exist yet,
+    its nearest existing ancestor), the directories glob patterns were
+    expanded from, plus the directory of the config file.
+    """
+    directories: Set[Path] = {find_existing_ancestor(config_path.parent)}
+    for entry in config["dotfiles"]:
+        directories.add(find_existing_ancestor((home_dir / entry["target"]).parent))
+        directories.add(find_existing_ancestor((script_dir / entry["source"]).parent))
+    for directory in config["scanned"]:
+        directories.add(find_existing_ancestor(Path(directory)))
+
+    # Every directory on both sides of a tree entry
+    for entry in config["dotfiles"]:
+        if entry["type"] != "tree":
+            continue
+        source_path, target_path = (
+            script_dir / entry["source"],
+            home_dir / entry["target"],
+        )
+        with contextlib.suppress(OSError):
+            for relative in diff_tree(source_path, target_path)["directories"]:
+                directories.add(source_path / relative)
+                directories.add(find_existing_ancestor(target_path / relative))
+    return directories
+
+
+def is_expansion_affected(config: CompiledConfig, changed: Set[Path]) -> bool:
+    """Whether changes may add or remove matches of the config's glob patterns"""
+    for directory in map(Path, config["scanned"]):
+        for path in changed:
+            if directory in (path, path.parent) or path in directory.parents:
+                return True
+    return False
+
+
+def get_affected_entries(
+    config: Config, script_dir: Path, home_dir: Path, changed: Set[Path]
+) -> List[DotfileEntry]:
+    """
+    Entries whose source or target is a changed path or lies below one
+
+    Tree entries are also affected by changes anywhere inside them.
+    """
+    affected: List[DotfileEntry] = []
+    for entry in config["dotfiles"]:
+        for path in [home_dir / entry["target"], script_dir / entry["source"]]:
+            if (
+                path in changed
+                or any(parent in changed for parent in path.parents)
+                or (
+                    entry["type"] == "tree"
+                    and any(path in changed_path.parents for changed_path in changed)
+                )
+            ):
+                affected.append(entry)
+                break
+    return affected
+
+
+def open_inotify() -> Optional[tuple[Any, int]]:
+    """(libc, inotify file descriptor), None where inotify is unavailable"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    return (libc, fd) if fd >= 0 else None
+
+
+def update_inotify_watches(
+    inotify: tuple[Any, int], directories: Set[Path], watches: Dict[int, Path]
+) -> Dict[int, Path]:
+    """Watch exactly the given directories, returning watch descriptor -> directory"""
+    libc, fd = inotify
+    watched: Dict[Path, int] = {directory: wd for wd, directory in watches.items()}
+    updated: Dict[int, Path] = {}
+
+    for directory, wd in watched.items():
+        if directory not in directories:
+            libc.inotify_rm_watch(fd, wd)
+    for directory in directories:
+        wd = watched.get(directory)
+        if wd is None:
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), INOTIFY_WATCH_MASK)
+        if wd >= 0:
+            updated[wd] = directory
+    return updated
+
+
+def read_inotify_events(
+    fd: int, watches: Dict[int, Path], timeout: Optional[float]
+) -> Optional[Set[Path]]:
+    """
+    Wait up to timeout seconds (forever if None) for inotify events
+
+    Returns the changed paths (empty on timeout), or None when events were
+    lost or a watched directory went away and everything must be checked.
+    """
+    readable, _, _ = select.select([fd], [], [], timeout)
+    if not readable:
+        return set()
+
+    data: bytes = os.read(fd, 64 * 1024)
+    changed: Set[Path] = set()
+    offset: int = 0
+    while offset < len(data):
+        wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+        name = data[offset + 16 : offset + 16 + length].rstrip(b"\0")
+        offset += 16 + length
+
+        if mask & (IN_Q_OVERFLOW | IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+            return None
+        if wd in watches:
+            changed.add(watches[wd] / os.fsdecode(name) if name else watches[wd])
+    return changed
+
+
+def get_directory_snapshot(
+    directories: Set[Path], config_path: Path
+) -> Dict[Path, int]:
+    """Modification times of the watched directories and the config file"""
+    snapshot: Dict[Path, int] = {}
+    for path in [*directories, config_path]:
+        try:
+            snapshot[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            snapshot[path] = -1
+    return snapshot
+
+
+def wait_for_changes(
+    inotify: Optional[tuple[Any, int]],
+    watches: Dict[int, Path],
+    directories: Set[Path],
+    config_path: Path,
+    debounce: float,
+    poll_interval: float,
+) -> Optional[Set[Path]]:
+    """
+    Block until something changes, then collect events until quiet
+
+    Bursts are coalesced: changes keep being collected until none arrived
+    for debounce seconds. Returns the changed paths, or None if everything
+    has to be re-checked. Without inotify, directory and config mtimes are
+    polled every poll_interval seconds.
+    """
+    if inotify is None:
+        snapshot = get_directory_snapshot(directories, config_path)
+        while True:
+            time.sleep(poll_interval)
+            current = get_directory_snapshot(directories, config_path)
+            if current != snapshot:
+                break
+        # Wait for the burst to settle, then report what differs
+        while True:
+            time.sleep(debounce)
+            settled = get_directory_snapshot(directories, config_path)
+            if settled == current:
+                break
+            current = settled
+        return {path for path in current if current[path] != snapshot[path]}
+
+    fd = inotify[1]
+    changed = read_inotify_events(fd, watches, None)
+    while changed is not None:
+        more = read_inotify_events(fd, watches, debounce)
+        if more is None:
+            return None
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+def repair_entries(
+    entries: List[DotfileEntry],
+    script_dir: Path,
+    home_dir: Path,
+    backup_dir: Path,
+    state: Dict[str, LinkState],
+    manifest: Dict[str, str],
+    reported: Optional[Dict[str, str]] = None,
+    use_cache: bool = True,
+) -> int:
+    """
+    Re-check entries and fix the ones that are not correctly linked
+
+    Targets that became a real file or directory are only reported: an
+    editor saving by atomic rename replaces the link with a regular file,
+    and replacing that would move the user's edit into the backups.
+    Entries that cannot be linked at all, such as a missing source, are
+    reported too. Both are reported once per target and problem when
+    given the reported dict, which maps each target to its last report.
+    """
+    if reported is None:
+        reported = {}
+    actions: List[PlanAction] = [
+        plan_entry(entry, script_dir, home_dir, state, use_cache) for entry in entries
+    ]
+    for action in actions:
+        target = action["target"]
+        if action["action"] not in ("replace", "error"):
+            reported.pop(target, None)
+            continue
+        problem = f"{action['action']}: {action['detail']}"
+        if reported.get(target) == problem:
+            continue
+        reported[target] = problem
+        now = datetime.now().strftime("%H:%M:%S")
+        if action["action"] == "replace":
+            REPORTER.line(
+                f"🕒 {now} ⚠️  {action['target']} "
+                f"is a {action['detail']} now, not a link - left as is"
+            )
+            REPORTER.line(
+                f"   💡 Copy your changes into {action['source']}, then run "
+                "'linker.py install' to link it again"
+            )
         else:
-            print("⚠️  Some dotfiles failed to link. Check the errors above.")
+            REPORTER.line(f"🕒 {now} ⚠️  Warning: {action['detail']}")
+        REPORTER.event(
+            "entry",
+            source=action["entry"]["source"],
+            target=action["target"],
+            type=action["entry"]["type"],
+            action=action["action"],
+            detail=action["detail"],
+            status="skipped" if action["action"] == "replace" else "failed",
+            seconds=0.0,
+        )
+    broken: List[PlanAction] = [
+        action
+        for action in actions
+        if action["action"] not in ("skip", "replace", "error")
+    ]
+    if not broken:
+        return 0
+
+    REPORTER.line(
+        f"🕒 {datetime.now().strftime('%H:%M:%S')} 🔧 "
+        f"Repairing {len(broken)} of {len(entries)} changed entries"
+    )
+    run_plan(
+        broken, script_dir, home_dir, backup_dir, state, manifest, use_cache=use_cache
+    )
+    return len(broken)
+
+
+def watch_dotfiles(
+    config_path: Path,
+    script_dir: Path,
+    home_dir: Path,
+    backup_dir: Path,
+    debounce: float = WATCH_DEBOUNCE_SECONDS,
+    poll_interval: float = WATCH_POLL_SECONDS,
+    use_cache: bool = True,
+) -> int:
+    """
+    Keep dotfile links healthy as the filesystem changes
+
+    Repairs everything once, then waits for changes (inotify on Linux,
+    mtime polling elsewhere) and re-checks only the entries they affect.
+    Idle, it sleeps in select() (or between polls) and uses no CPU.
+    """
+    REPORTER.line()
+    REPORTER.line("👀" + "=" * 73 + "👀")
+    REPORTER.line("🔭 \033[32mWATCHING DOTFILES\033[0m 🔭")
+    REPORTER.line(f"📂 \033[32mRepository directory: {script_dir}\033[0m")
+    REPORTER.line(f"⚙️  \033[32mConfig file: {config_path}\033[0m")
+    REPORTER.line(f"🏠 \033[32mHome directory: {home_dir}\033[0m")
+    REPORTER.line(f"💾 \033[32mBackup directory: {backup_dir}\033[0m")
+    REPORTER.line("👀" + "=" * 73 + "👀")
+    REPORTER.line()
+
+    config: CompiledConfig = load_config(config_path, script_dir, use_cache)
+    if not validate_config_safety(config, script_dir, home_dir):
+        REPORTER.line("🚫 Watch cancelled due to safety concerns!")
         return 1
 
+    state_path: Path = get_state_path(config_path)
+    state: Dict[str, LinkState] = load_state(state_path) if use_cache else {}
+    manifest_path: Path = get_manifest_path(script_dir)
+    manifest: Dict[str, str] = load_manifest(manifest_path) or {}
+
+    inotify = open_inotify()
+    watches: Dict[int, Path] = {}
+    if inotify is None:
+        REPORTER.line(f"⏱️  inotify unavailable, polling every {poll_interval:g}s")
+
+    entries: List[DotfileEntry] = config["dotfiles"]
+    watched: Set[Path] = set()
+    reported: Dict[str, str] = {}
+    try:
+        while True:
+            if repair_entries(
+                entries,
+                script_dir,
+                home_dir,
+                backup_dir,
+                state,
+                manifest,
+                reported,
+                use_cache,
+            ):
+                if use_cache:
+                    save_state(state_path, state)
+                save_manifest(manifest_path, manifest)
+
+            # Targets and sources may have appeared or vanished: re-aim
+            directories = get_watch_directories(
+                config, script_dir, home_dir, config_path
+            )
+            if inotify is not None:
+                watches = update_inotify_watches(inotify, directories, watches)
+            if directories != watched:
+                REPORTER.line(
+                    f"👀 Watching {len(directories)} directories for "
+                    f"{len(config['dotfiles'])} entries (Ctrl-C to stop)"
+                )
+                watched = directories
+
+            changed = wait_for_changes(
+                inotify, watches, directories, config_path, debounce, poll_interval
+            )
+
+            if (
+                changed is None
+                or config_path in changed
+                or config_path.parent in changed
+                or is_expansion_affected(config, changed)
+            ):
+                try:
+                    new_config: CompiledConfig = load_config(
+                        config_path, script_dir, use_cache
+                    )
+                except SystemExit:
+                    REPORTER.line("⚠️  Warning: Keeping the previous configuration")
+                    new_config = config
+                if new_config["dotfiles"] == config["dotfiles"]:
+                    config = new_config  # Same entries, newer directory scan
+                elif not validate_config_safety(new_config, script_dir, home_dir):
+                    REPORTER.line("⚠️  Warning: Keeping the previous configuration")
+                else:
+                    REPORTER.line("⚙️  Configuration changed, checking every entry")
+                    config = new_config
+                    changed = None
+
+            if changed is None:
+                entries = config["dotfiles"]
+            else:
+                entries = get_affected_entries(config, script_dir, home_dir, changed)
+
+    except KeyboardInterrupt:
+        REPORTER.line("\n👋 Stopped watching")
+        return 0
+    finally:
+        if inotify is not None:
+            os.close(inotify[1])
+
 
 def main() -> int:
     """Main function with command line argument parsing"""
@@ -708,9 +4026,22 @@ def main() -> int:
 ✨ Examples:
   python linker.py install                            # 🚀 Create symlinks for all dotfiles
   python linker.py install --dry-run                  # 🔍 Preview what would happen
+  python linker.py install -j 4                       # ⚡ Install independent entries in parallel
   python linker.py install -c alternate_config.json   # ⚙️  Use alternate config file
   python linker.py status                             # 📊 Check status of all dotfiles
+  python linker.py status --no-cache                  # 🗃️  Verify every entry from scratch
+  python linker.py status --json                      # 🤖 Machine-readable NDJSON events
+  python linker.py status --homes-file homes.txt      # 🏘️  Check many homes at once
+  python linker.py install -q                         # 🤫 Only report problems
   python linker.py clean                              # 🧹 Remove orphaned symlinks
+  python linker.py plan -o plan.json --home /home/bob # 🗺️  Save a plan for another home
+  python linker.py apply plan.json                    # ⚡ Carry out a saved plan
+  python linker.py backups list                       # 💾 List backups
+  python linker.py backups restore ID --to /tmp/x     # ♻️  Restore a backup
+  python linker.py backups prune --keep-last 3        # 🗑️  Keep 3 backups per target
+  python linker.py clean --rescan                     # 📒 Rebuild the link manifest first
+  python linker.py watch                              # 👀 Keep links healthy as files change
+  python linker.py clean --max-depth 3 -j 4           # 🔍 Deeper, parallel orphan search
 
 🛡️ Safety Features:
   • Protected paths validation (prevents symlinking critical directories)
@@ -723,7 +4054,14 @@ def main() -> int:
     )
 
     parser.add_argument(
-        "command", choices=["install", "status", "clean"], help="Command to execute"
+        "command",
+        choices=["install", "status", "clean", "plan", "apply", "backups", "watch"],
+        help="Command to execute",
+    )
+    parser.add_argument(
+        "arguments",
+        nargs="*",
+        help="Command arguments: PLAN_FILE for apply, [list | restore BACKUP_ID | prune] for backups",
     )
     parser.add_argument(
         "--config",
@@ -732,34 +4070,269 @@ def main() -> int:
         help="Path to configuration file",
         default="dot-config.json",
     )
+    parser.add_argument(
+        "--home",
+        type=Path,
+        action="append",
+        default=[],
+        help="Home directory to operate on (default: your home directory); "
+        "status accepts it repeatedly to check many homes",
+    )
+    parser.add_argument(
+        "--homes-file",
+        type=Path,
+        help="status: check every home directory listed in this file (one per line)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("linker-plan.json"),
+        help="Where the plan command writes its JSON plan ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--to",
+        type=Path,
+        help="Where 'backups restore' recreates the backup (default: original path)",
+    )
+    parser.add_argument(
+        "--keep-last",
+        type=int,
+        help="'backups prune': keep the newest N backups of every target",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        metavar="DAYS",
+        help="'backups prune': remove backups older than DAYS",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=parse_size,
+        metavar="SIZE",
+        help="'backups prune': remove the oldest backups until the store fits (e.g. 500M)",
+    )
+    parser.add_argument(
+        "--compress-after",
+        type=float,
+        metavar="DAYS",
+        help=f"'backups prune': pack backups older than DAYS into tar.{ARCHIVE_COMPRESSION} archives",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Preview operations without making changes (install command only)",
+        help="Preview operations without making changes (install and backups prune only)",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="How deep clean searches for orphaned symlinks (default: deepest target)",
+    )
+    parser.add_argument(
+        "--search-root",
+        action="append",
+        type=Path,
+        default=[],
+        help="Extra directory (relative to home) searched by clean, repeatable",
+    )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Rebuild the managed link manifest by walking the home directory (clean command only)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of parallel workers (default: 1)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=WATCH_DEBOUNCE_SECONDS,
+        metavar="SECONDS",
+        help=f"watch: wait for this much quiet before acting on changes (default: {WATCH_DEBOUNCE_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=WATCH_POLL_SECONDS,
+        metavar="SECONDS",
+        help=f"watch: polling interval where inotify is unavailable (default: {WATCH_POLL_SECONDS:g})",
+    )
+    output_mode = parser.add_mutually_exclusive_group()
+    output_mode.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Only report errors, warnings and entries that need attention (on stderr)",
+    )
+    output_mode.add_argument(
+        "--json",
+        action="store_true",
+        help="Stream NDJSON events (one per entry, with timings) instead of text",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the incremental state cache and verify every entry from scratch",
     )
 
     args: argparse.Namespace = parser.parse_args()
 
+    if args.json and args.command == "plan" and str(args.output) == "-":
+        REPORTER.line("❌ --json cannot be combined with writing the plan to stdout")
+        return 1
+
+    retention: Dict[str, Any] = {
+        "keep_last": args.keep_last,
+        "max_age_days": args.max_age,
+        "max_size": args.max_size,
+        "compress_after_days": args.compress_after,
+    }
+    is_prune: bool = args.command == "backups" and args.arguments[:1] == ["prune"]
+
     # Validate dry-run flag usage
-    if args.dry_run and args.command != "install":
-        print("❌ --dry-run flag can only be used with the 'install' command")
+    if args.dry_run and args.command != "install" and not is_prune:
+        REPORTER.line(
+            "❌ --dry-run flag can only be used with the 'install' and 'backups prune' commands"
+        )
+        return 1
+
+    if not is_prune and any(value is not None for value in retention.values()):
+        REPORTER.line(
+            "❌ Retention options can only be used with the 'backups prune' command"
+        )
+        return 1
+
+    if any(value is not None and value < 0 for value in retention.values()):
+        REPORTER.line("❌ Retention options cannot be negative")
+        return 1
+
+    if args.keep_last is not None and args.keep_last < 1:
+        REPORTER.line(
+            "❌ --keep-last must be at least 1 (the newest backup of every "
+            "target is always kept)"
+        )
+        return 1
+
+    if args.command == "apply" and len(args.arguments) != 1:
+        REPORTER.line("❌ The 'apply' command needs exactly one plan file")
+        return 1
+
+    if args.arguments and args.command not in ("apply", "backups"):
+        REPORTER.line(f"❌ The '{args.command}' command takes no extra arguments")
+        return 1
+
+    if args.to and args.command != "backups":
+        REPORTER.line("❌ --to can only be used with the 'backups restore' command")
+        return 1
+
+    if args.rescan and args.command != "clean":
+        REPORTER.line("❌ --rescan flag can only be used with the 'clean' command")
+        return 1
+
+    if args.jobs < 1:
+        REPORTER.line("❌ --jobs must be at least 1")
+        return 1
+
+    if (len(args.home) > 1 or args.homes_file) and args.command != "status":
+        REPORTER.line(
+            "❌ Several home directories can only be checked with the 'status' command"
+        )
+        return 1
+
+    if args.debounce < 0 or args.poll_interval <= 0:
+        REPORTER.line(
+            "❌ --debounce cannot be negative and --poll-interval must be positive"
+        )
+        return 1
+
+    if args.max_depth is not None and args.max_depth < 1:
+        REPORTER.line("❌ --max-depth must be at least 1")
         return 1
 
     # Get paths
     script_dir: Path = Path(__file__).parent.resolve()
     backup_dir: Path = script_dir / "backups" / "removed_entity"
     config_path: Path = script_dir / args.config
-    home_dir: Path = Path.home()
+    homes: List[Path] = [home.expanduser().absolute() for home in args.home]
+    if args.homes_file:
+        homes += load_homes_file(args.homes_file)
+    home_dir: Path = homes[0] if homes else Path.home()
+
+    if args.quiet or args.json:
+        REPORTER.configure("quiet" if args.quiet else "json")
+    REPORTER.event(
+        "start",
+        command=args.command,
+        config=str(config_path),
+        home=str(home_dir),
+        dry_run=args.dry_run,
+    )
 
     # Execute command
     if args.command == "install":
         return install_dotfiles(
-            config_path, script_dir, home_dir, backup_dir, args.dry_run
+            config_path,
+            script_dir,
+            home_dir,
+            backup_dir,
+            args.dry_run,
+            use_cache=not args.no_cache,
+            jobs=args.jobs,
+        )
+    elif args.command == "status" and (len(homes) > 1 or args.homes_file):
+        return check_fleet_status(
+            config_path,
+            script_dir,
+            homes,
+            jobs=args.jobs if args.jobs > 1 else FLEET_DEFAULT_JOBS,
+            use_cache=not args.no_cache,
         )
     elif args.command == "status":
-        return check_status(config_path, script_dir, home_dir)
+        return check_status(
+            config_path, script_dir, home_dir, use_cache=not args.no_cache
+        )
     elif args.command == "clean":
-        return clean_orphaned_symlinks(config_path, script_dir, home_dir)
+        return clean_orphaned_symlinks(
+            config_path,
+            script_dir,
+            home_dir,
+            max_depth=args.max_depth,
+            extra_roots=args.search_root,
+            jobs=args.jobs,
+            rescan=args.rescan,
+            use_cache=not args.no_cache,
+        )
+    elif args.command == "plan":
+        return write_plan(
+            config_path,
+            script_dir,
+            home_dir,
+            args.output,
+            use_cache=not args.no_cache,
+            jobs=args.jobs,
+        )
+    elif args.command == "apply":
+        return apply_plan(
+            Path(args.arguments[0]), use_cache=not args.no_cache, jobs=args.jobs
+        )
+    elif args.command == "watch":
+        return watch_dotfiles(
+            config_path,
+            script_dir,
+            home_dir,
+            backup_dir,
+            debounce=args.debounce,
+            poll_interval=args.poll_interval,
+            use_cache=not args.no_cache,
+        )
+    elif args.command == "backups":
+        return manage_backups(
+            script_dir, args.arguments, args.to, retention, args.dry_run
+        )
     else:
         parser.print_help()
         return 1
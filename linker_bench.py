@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+⏱️ Linker Benchmark - Measures how linker.py scales ⏱️
+
+✨ Generates a synthetic repository and home directory in a temp dir and
+   times install, status and clean end to end by calling linker.py's
+   functions directly with a fake home directory.
+
+🚀 Features:
+   • 🏗️  Configurable entries, target depth, pre-existing data and stray links
+   • ⏱️  Wall time for every step (cold and warm runs)
+   • 🔢 Filesystem call counts (stat, lstat, readlink, scandir, ...) per step
+   • 📄 JSON results for regression comparison with --compare
+
+💡 Usage:
+   /usr/bin/python3 linker_bench.py --entries 500 --existing 50 --stray 200
+   /usr/bin/python3 linker_bench.py -o before.json
+   /usr/bin/python3 linker_bench.py --compare before.json
+
+🔢 Filesystem calls are counted by wrapping the os module functions linker.py
+   (and pathlib/shutil underneath it) go through, a close and portable proxy
+   for the syscalls they make.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, TypedDict
+
+import linker
+
+# os functions wrapped while counting filesystem calls
+COUNTED_FS_CALLS = [
+    "stat",
+    "lstat",
+    "readlink",
+    "scandir",
+    "listdir",
+    "open",
+    "symlink",
+    "link",
+    "unlink",
+    "rename",
+    "replace",
+    "mkdir",
+    "rmdir",
+    "chmod",
+    "utime",
+]
+
+RESULTS_VERSION = 1
+
+
+class StepResult(TypedDict):
+    """Measurements for a single benchmark step"""
+
+    seconds: List[float]  # Wall time of every repetition
+    exit_code: int  # Exit code of the first repetition
+    fs_calls: Dict[str, int]  # Filesystem calls of the first repetition
+    fs_calls_total: int  # Sum of fs_calls
+
+
+@contextlib.contextmanager
+def count_fs_calls() -> Iterator[Dict[str, int]]:
+    """Count calls to COUNTED_FS_CALLS made while the context is active"""
+    counts: Dict[str, int] = dict.fromkeys(COUNTED_FS_CALLS, 0)
+    originals: Dict[str, Callable[..., Any]] = {}
+    capability_sets = [
+        os.supports_dir_fd,
+        os.supports_fd,
+        os.supports_follow_symlinks,
+        os.supports_effective_ids,
+    ]
+    added: List[tuple[set, Callable[..., Any]]] = []
+
+    for name in COUNTED_FS_CALLS:
+        original = getattr(os, name)
+
+        def wrapper(
+            *args: Any, _name: str = name, _original: Any = original, **kwargs: Any
+        ) -> Any:
+            counts[_name] += 1
+            return _original(*args, **kwargs)
+
+        originals[name] = original
+        setattr(os, name, wrapper)
+
+        # Keep shutil's capability checks (fn in os.supports_*) working
+        for capabilities in capability_sets:
+            if original in capabilities:
+                capabilities.add(wrapper)
+                added.append((capabilities, wrapper))
+
+    # pathlib before Python 3.11 bound os functions at import time
+    accessor = getattr(
+        getattr(sys.modules["pathlib"], "_NormalAccessor", None), "__dict__", {}
+    )
+    patched_accessor: Dict[str, Any] = {}
+    for name in COUNTED_FS_CALLS:
+        if accessor.get(name) is originals[name]:
+            patched_accessor[name] = accessor[name]
+            setattr(
+                sys.modules["pathlib"]._NormalAccessor,
+                name,
+                staticmethod(getattr(os, name)),
+            )
+
+    try:
+        yield counts
+    finally:
+        for name, original in originals.items():
+            setattr(os, name, original)
+        for capabilities, wrapper in added:
+            capabilities.discard(wrapper)
+        for name, original in patched_accessor.items():
+            setattr(sys.modules["pathlib"]._NormalAccessor, name, original)
+
+
+def build_target(index: int, depth: int) -> str:
+    """Target path (relative to home) for an entry, depth components deep"""
+    name = f"bench_{index}"
+    if depth <= 1:
+        return f".{name}"
+    levels = [f"level{level}" for level in range(depth - 2)]
+    return "/".join([".config", *levels, name])
+
+
+def generate_tree(root: Path, args: argparse.Namespace) -> Dict[str, Path]:
+    """Create the synthetic repository, config and home directory"""
+    repo_dir = root / "repo"
+    home_dir = root / "home"
+    repo_dir.mkdir()
+    home_dir.mkdir()
+
+    payload = b"x" * args.file_size
+    entries: List[linker.DotfileEntry] = []
+    for index in range(args.entries):
+        target = build_target(index, args.depth)
+        if index % 2 == 0:
+            source = f"pkg_{index}"
+            (repo_dir / source).mkdir()
+            (repo_dir / source / "config").write_bytes(payload)
+            entries.append({"source": source, "target": target, "type": "directory"})
+        else:
+            source = f"file_{index}.conf"
+            (repo_dir / source).write_bytes(payload)
+            entries.append({"source": source, "target": target, "type": "file"})
+
+        # Pre-existing data that install has to back up and replace
+        if index < args.existing:
+            target_path = home_dir / target
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            if entries[-1]["type"] == "directory":
+                target_path.mkdir()
+                for file_index in range(args.backup_files):
+                    (target_path / f"data_{file_index}").write_bytes(payload)
+            else:
+                target_path.write_bytes(payload)
+
+    # Symlinks into the repository that are not in the config
+    for index in range(args.stray):
+        stray_path = home_dir / build_target(args.entries + index, args.depth)
+        stray_path.parent.mkdir(parents=True, exist_ok=True)
+        stray_path.symlink_to(repo_dir / entries[index % len(entries)]["source"])
+
+    config_path = repo_dir / "dot-config.json"
+    with config_path.open("w", encoding="utf-8") as f:
+        json.dump({"dotfiles": entries}, f, indent=2)
+
+    return {"repo": repo_dir, "home": home_dir, "config": config_path}
+
+
+def get_steps(
+    paths: Dict[str, Path], args: argparse.Namespace
+) -> List[tuple[str, Callable[[], int]]]:
+    """The benchmark steps, in the order they run against one tree"""
+    repo_dir, home_dir, config_path = paths["repo"], paths["home"], paths["config"]
+    backup_dir = repo_dir / "backups" / "removed_entity"
+
+    def install(use_cache: bool) -> Callable[[], int]:
+        return lambda: linker.install_dotfiles(
+            config_path,
+            repo_dir,
+            home_dir,
+            backup_dir,
+            use_cache=use_cache,
+            jobs=args.jobs,
+        )
+
+    def status(use_cache: bool) -> Callable[[], int]:
+        return lambda: linker.check_status(
+            config_path, repo_dir, home_dir, use_cache=use_cache
+        )
+
+    def clean(rescan: bool) -> Callable[[], int]:
+        return lambda: linker.clean_orphaned_symlinks(
+            config_path, repo_dir, home_dir, jobs=args.jobs, rescan=rescan
+        )
+
+    return [
+        ("install_cold", install(True)),
+        ("install_warm", install(True)),
+        ("install_no_cache", install(False)),
+        ("status_no_cache", status(False)),
+        ("status_cached", status(True)),
+        ("clean_rescan", clean(True)),
+        ("clean_manifest", clean(False)),
+    ]
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, StepResult]:
+    """Run every step args.repeat times, each time against a fresh tree"""
+    results: Dict[str, StepResult] = {}
+
+    for repetition in range(args.repeat):
+        with tempfile.TemporaryDirectory(prefix="linker_bench_") as tmp:
+            paths = generate_tree(Path(tmp), args)
+            linker.resolve_cached.cache_clear()
+
+            for name, step in get_steps(paths, args):
+                with count_fs_calls() as counts:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        started = time.perf_counter()
+                        exit_code = step()
+                        elapsed = time.perf_counter() - started
+
+                if repetition == 0:
+                    results[name] = {
+                        "seconds": [],
+                        "exit_code": exit_code,
+                        "fs_calls": {k: v for k, v in counts.items() if v},
+                        "fs_calls_total": sum(counts.values()),
+                    }
+                results[name]["seconds"].append(elapsed)
+
+    return results
+
+
+def print_results(
+    results: Dict[str, StepResult], baseline: Dict[str, StepResult]
+) -> None:
+    """Print a results table, with ratios against a baseline if given"""
+    print()
+    header = f"{'⏱️  Step':<22} {'median s':>10} {'min s':>10} {'fs calls':>10}"
+    if baseline:
+        header += f" {'vs base':>9}"
+    print(header)
+    print("─" * len(header))
+
+    for name, result in results.items():
+        median = statistics.median(result["seconds"])
+        line = (
+            f"{name:<22} {median:>10.4f} {min(result['seconds']):>10.4f} "
+            f"{result['fs_calls_total']:>10}"
+        )
+        if name in baseline:
+            base_median = statistics.median(baseline[name]["seconds"])
+            line += f" {median / base_median if base_median else 0:>8.2f}x"
+        print(line)
+    print()
+
+
+def main() -> int:
+    """Main function with command line argument parsing"""
+    parser = argparse.ArgumentParser(
+        description="⏱️ Benchmark linker.py install/status/clean on synthetic trees ⏱️"
+    )
+    parser.add_argument("--entries", type=int, default=200, help="Config entries")
+    parser.add_argument(
+        "--depth", type=int, default=2, help="Path components per target"
+    )
+    parser.add_argument(
+        "--existing",
+        type=int,
+        default=20,
+        help="Entries whose target already exists and must be backed up",
+    )
+    parser.add_argument(
+        "--backup-files",
+        type=int,
+        default=50,
+        help="Files inside every pre-existing directory",
+    )
+    parser.add_argument(
+        "--file-size", type=int, default=4096, help="Bytes per generated file"
+    )
+    parser.add_argument(
+        "--stray", type=int, default=50, help="Orphaned symlinks for clean to find"
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, help="Workers passed to linker.py"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Repetitions (fresh tree each)"
+    )
+    parser.add_argument("--output", "-o", type=Path, help="Write JSON results here")
+    parser.add_argument(
+        "--compare", type=Path, help="Previous JSON results to compare against"
+    )
+    args = parser.parse_args()
+
+    if args.entries < 1 or args.depth < 1 or args.repeat < 1 or args.jobs < 1:
+        print("❌ --entries, --depth, --repeat and --jobs must be at least 1")
+        return 1
+
+    baseline: Dict[str, StepResult] = {}
+    if args.compare:
+        try:
+            with args.compare.open("r", encoding="utf-8") as f:
+                baseline = json.load(f)["results"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Error: Could not read baseline {args.compare}: {e}")
+            return 1
+
+    print(
+        f"⏱️  Benchmarking {args.entries} entries (depth {args.depth}), "
+        f"{args.existing} to back up, {args.stray} stray links, "
+        f"{args.repeat} repetitions..."
+    )
+    results = run_benchmark(args)
+    print_results(results, baseline)
+
+    if args.output:
+        report = {
+            "version": RESULTS_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "compare")
+            },
+            "results": results,
+        }
+        with args.output.open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
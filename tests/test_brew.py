@@ -0,0 +1,128 @@
+"""Tests for brew.py"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import brew  # noqa: E402
+
+
+def make_cask(token, outdated=False, depends_on=None):
+    """An installed cask as 'brew info --json=v2 --installed' reports it"""
+    return {
+        "token": token,
+        "full_token": token,
+        "installed": "1.0",
+        "version": "2.0",
+        "outdated": outdated,
+        "depends_on": depends_on or {},
+    }
+
+
+class PlanReconcileTest(unittest.TestCase):
+    def test_outdated_unmanaged_cask_needed_by_another_cask(self):
+        info = {
+            "formulae": [],
+            "casks": [
+                make_cask("app", depends_on={"cask": ["helper"]}),
+                make_cask("helper", outdated=True),
+            ],
+        }
+
+        plan = brew.plan_reconcile(info, [], ["app"])
+
+        self.assertEqual(plan["extra"]["casks"], [])
+        self.assertEqual(plan["outdated"]["casks"], {})
+        self.assertEqual(plan["missing"]["casks"], [])
+
+
+class CleanupTest(unittest.TestCase):
+    def run_install(self, cache_dir=None, mirror=None):
+        """Run a plain install through provision() and return its brew cleanups"""
+        commands = []
+
+        def run_command(cmd, shell=False, check=True, show_output=False):
+            commands.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        args = argparse.Namespace(
+            command="install",
+            jobs=1,
+            bulk=False,
+            update_ttl=60,
+            cache_dir=cache_dir,
+            mirror=mirror,
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "brew.json").write_text('{"formulae": ["git"], "casks": []}')
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                with mock.patch.multiple(
+                    brew,
+                    run_command=run_command,
+                    is_brew_installed=lambda: True,
+                    update_brew_if_stale=lambda *_: True,
+                    setup_brew_environment=lambda *_: None,
+                    get_user_confirmation=lambda *_: True,
+                    get_installed_index=lambda: {
+                        "formulae": {"git": "1.0"},
+                        "casks": {},
+                    },
+                ):
+                    brew.provision(args)
+            finally:
+                os.chdir(cwd)
+        return [cmd for cmd in commands if cmd[:2] == ["brew", "cleanup"]]
+
+    def test_prunes_the_local_cache(self):
+        self.assertEqual(self.run_install(), [["brew", "cleanup", "--prune=all"]])
+
+    def test_keeps_a_shared_cache_dir(self):
+        cleanups = self.run_install(cache_dir=Path("/shared/cache"))
+        self.assertEqual(cleanups, [["brew", "cleanup"]])
+
+    def test_keeps_a_mirrored_cache(self):
+        cleanups = self.run_install(mirror="https://mirror.example")
+        self.assertEqual(cleanups, [["brew", "cleanup"]])
+
+
+class PackageInstallTest(unittest.TestCase):
+    def install(self, mode):
+        """Install one missing formula in the given output mode"""
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(kwargs)
+            output = None if not kwargs.get("capture_output") else "done"
+            return subprocess.CompletedProcess(cmd, 0, output, output)
+
+        report = brew.RunReport()
+        with (
+            mock.patch.object(brew.subprocess, "run", run),
+            mock.patch.multiple(brew, REPORTER=brew.Reporter(mode), RUN_REPORT=report),
+        ):
+            self.assertTrue(brew.install_formulae(["git"], installed={}))
+        return calls, report.packages
+
+    def test_pretty_mode_keeps_the_terminal(self):
+        calls, packages = self.install("pretty")
+        self.assertNotIn("capture_output", calls[0])
+        self.assertEqual(packages[0]["exit_code"], 0)
+        self.assertIsNone(packages[0]["output_bytes"])
+
+    def test_quiet_mode_captures_output(self):
+        calls, packages = self.install("quiet")
+        self.assertTrue(calls[0]["capture_output"])
+        self.assertEqual(packages[0]["output_bytes"], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()